@@ -18,9 +18,12 @@
 # interfaces to be reloaded in the background instead of waiting for all interfaces to be applied preventing
 # API calls from receiving a 504 gateway timeout waiting for interfaces to be applied.
 # ---------------------------------------------------------------------------------------------------------------
-# Example: php -f apply_interfaces.php
+# Argument 'job': optional : the ID of the API job to record the outcome to, this is set by APIJob::start()
+#
+# Example: php -f apply_interfaces.php job=0123456789abcdef
 
+require_once("api/framework/APIJob.inc");
 require_once("api/models/APIInterfaceApplyCreate.inc");
 
-# Apply pending interface changes.
-APIInterfaceApplyCreate::apply();
+# Apply pending interface changes and record the outcome to the job that started this script, if any.
+APIJob::run($argv, "APIInterfaceApplyCreate::apply");
@@ -18,9 +18,12 @@
 # Unbound to be reloaded in the background instead of waiting thus preventing
 # API calls from receiving a 504 gateway timeout waiting for Unbound to be reloaded.
 # ---------------------------------------------------------------------------------------------------------------
-# Example: php -f apply_unbound.php
+# Argument 'job': optional : the ID of the API job to record the outcome to, this is set by APIJob::start()
+#
+# Example: php -f apply_unbound.php job=0123456789abcdef
 
+require_once("api/framework/APIJob.inc");
 require_once("api/models/APIServicesUnboundApplyCreate.inc");
 
-# Apply pending interface changes.
-APIServicesUnboundApplyCreate::apply();
+# Apply pending Unbound changes and record the outcome to the job that started this script, if any.
+APIJob::run($argv, "APIServicesUnboundApplyCreate::apply");
@@ -22,9 +22,11 @@
 # Argument 'destination: optional : the destination IP/CIDR of states to be killed
 # Argument 'protocol': optional : the protocol of states to be killed
 # Argument 'interface': optional : the interface of states to be killed
+# Argument 'job': optional : the ID of the API job to record the outcome to, this is set by APIJob::start()
 #
 # Example: php -f kill_states.php source=0.0.0.0/0 destination=1.2.3.4 protocol=tcp interface=em0 sleep=5
 
+require_once("api/framework/APIJob.inc");
 require_once("api/framework/APITools.inc");
 
 # Variables
@@ -58,11 +60,13 @@ foreach ($argv as $id=>$arg) {
     }
 }
 
-# Wait for the desired amount of time and then kill the requested states
-sleep(intval($sleep));
-pfSense_kill_states(
-    $source,
-    $destination,
-    $protocol,
-    $interface
-);
+# Wait for the desired amount of time and then kill the requested states, recording the outcome to the job if any
+APIJob::run($argv, function () use ($source, $destination, $protocol, $interface, $sleep) {
+    sleep(intval($sleep));
+    pfSense_kill_states(
+        $source,
+        $destination,
+        $protocol,
+        $interface
+    );
+});
@@ -0,0 +1,164 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script that benchmarks alias deletes when many firewall rules are configured. Host aliases and firewall rules that
+reference the first half of them are seeded into the configuration through /api/v1/system/config. A single delete of an
+unreferenced alias, a bulk delete of the remaining unreferenced aliases and a rejected delete of a referenced alias are
+then timed against /api/v1/firewall/alias. The original configuration is restored once the benchmark finishes. Aliases
+are never applied, but this should still only be run against a development instance.
+"""
+import argparse
+import copy
+import json
+import sys
+import time
+
+from load_test import add_connection_args, start_session
+
+# Constants
+ALIAS_PREFIX = "E2E_REF_BENCHMARK_"
+
+
+def seed_config(config, aliases, rules):
+    """
+    Builds a copy of the configuration containing seeded host aliases and firewall rules. Each rule references one of
+    the first half of the aliases in its source and destination, the second half of the aliases are unreferenced.
+    :param config: (dict) the original configuration
+    :param aliases: (int) the number of aliases to seed
+    :param rules: (int) the number of firewall rules to seed
+    :return: (dict) the seeded configuration
+    """
+    # Local variables
+    config = copy.deepcopy(config)
+    config["aliases"] = config.get("aliases") if isinstance(config.get("aliases"), dict) else {}
+    config["filter"] = config.get("filter") if isinstance(config.get("filter"), dict) else {}
+
+    # Keep any existing aliases and rules, and add the seeded aliases and rules after them
+    config["aliases"]["alias"] = list(config["aliases"].get("alias") or []) + [
+        {
+            "name": f"{ALIAS_PREFIX}{index}",
+            "type": "host",
+            "address": f"198.18.{index // 256}.{index % 256}",
+            "descr": f"Seeded alias {index}",
+            "detail": ""
+        }
+        for index in range(aliases)
+    ]
+    config["filter"]["rule"] = list(config["filter"].get("rule") or []) + [
+        {
+            "type": "pass",
+            "interface": "wan",
+            "ipprotocol": "inet",
+            "source": {"address": f"{ALIAS_PREFIX}{index % (aliases // 2)}"},
+            "destination": {"address": f"{ALIAS_PREFIX}{index % (aliases // 2)}"},
+            "disabled": "",
+            "descr": f"Seeded rule {index}",
+            "tracker": str(1000000000 + index)
+        }
+        for index in range(rules)
+    ]
+    return config
+
+
+def send_request(session, args, method, uri, data=None):
+    """
+    Makes an API request.
+    :param session: (requests.Session) the session to send the request with
+    :param args: (argparse.Namespace) the parsed command line arguments
+    :param method: (string) the HTTP method of the request
+    :param uri: (string) the URI to request
+    :param data: (dict) the request data
+    :return: (tuple) the seconds the request took and the response
+    """
+    start = time.perf_counter()
+    resp = session.request(
+        method,
+        f"{args.scheme}://{args.host}:{args.port}{uri}",
+        data=json.dumps(data or {}),
+        verify=False,
+        timeout=args.timeout
+    )
+    return time.perf_counter() - start, resp
+
+
+def check_status(method, uri, resp, status):
+    """Exits if a request did not return the expected status code."""
+    if resp.status_code != status:
+        print(f"{method} {uri} failed with status {resp.status_code}: {resp.text}")
+        sys.exit(1)
+
+
+def api_request(session, args, method, uri, data=None):
+    """Makes an API request and returns the seconds it took and its JSON response, exiting if it was not successful."""
+    elapsed, resp = send_request(session, args, method, uri, data)
+    check_status(method, uri, resp, 200)
+    return elapsed, resp.json()
+
+
+def main():
+    """Seeds the aliases and rules, times the deletes and restores the original configuration."""
+    parser = argparse.ArgumentParser(description="Benchmark alias deletes when many firewall rules are configured.")
+    add_connection_args(parser)
+    parser.add_argument(
+        '--aliases',
+        dest="aliases",
+        type=int,
+        default=1000,
+        help="The number of host aliases to seed, the first half of them are referenced by the firewall rules"
+    )
+    parser.add_argument(
+        '--rules',
+        dest="rules",
+        type=int,
+        default=5000,
+        help="The number of firewall rules to seed"
+    )
+    args = parser.parse_args()
+    session = start_session(args, 1)
+    config = api_request(session, args, "GET", "/api/v1/system/config")[1]["data"]
+
+    # Exit if the configuration could not be read or there are too few aliases to leave some unreferenced
+    if not isinstance(config, dict):
+        print("Expected /api/v1/system/config to return the configuration")
+        sys.exit(1)
+    if args.aliases < 4:
+        print("Expected at least 4 aliases so some of them are unreferenced")
+        sys.exit(1)
+
+    try:
+        api_request(session, args, "PUT", "/api/v1/system/config", seed_config(config, args.aliases, args.rules))
+        print(f"Seeded {args.aliases} aliases and {args.rules} firewall rules referencing half of them")
+
+        # Time deleting the last unreferenced alias, then bulk deleting the rest of the unreferenced aliases
+        data = {"id": f"{ALIAS_PREFIX}{args.aliases - 1}", "apply": False}
+        elapsed = api_request(session, args, "DELETE", "/api/v1/firewall/alias", data)[0]
+        print(f"{'single delete':<18} {1:>6} aliases {elapsed:>8.3f}s")
+        unreferenced = range(args.aliases // 2, args.aliases - 1)
+        data = {"bulk": [{"id": f"{ALIAS_PREFIX}{index}", "apply": False} for index in unreferenced]}
+        elapsed = api_request(session, args, "DELETE", "/api/v1/firewall/alias", data)[0]
+        print(f"{'bulk delete':<18} {len(unreferenced):>6} aliases {elapsed:>8.3f}s")
+
+        # Time a delete that is rejected because the alias is referenced, which looks up every reference to it
+        data = {"id": f"{ALIAS_PREFIX}0", "apply": False}
+        elapsed, resp = send_request(session, args, "DELETE", "/api/v1/firewall/alias", data)
+        check_status("DELETE", "/api/v1/firewall/alias", resp, 400)
+        print(f"{'referenced delete':<18} {1:>6} aliases {elapsed:>8.3f}s ({len(resp.json()['data'])} references)")
+    except KeyboardInterrupt:
+        sys.exit(1)
+    finally:
+        api_request(session, args, "PUT", "/api/v1/system/config", config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script that benchmarks the throughput of authenticated requests with a cold and a warm authorization cache. Warm
+requests are sent back to back so each request can use the privileges cached by the requests before it. Each cold
+request is sent after an untimed config write, which clears the authorization cache. The config writes update the
+description of an alias created for the benchmark that is never applied and is deleted once the benchmark finishes.
+"""
+import argparse
+import json
+import sys
+import time
+
+from e2e_test_framework.tools import percentile
+from load_test import add_connection_args, start_session
+
+# Constants
+ALIAS_NAME = "E2E_AUTH_BENCHMARK"
+PERCENTILES = [50, 95, 99]
+
+
+def api_request(session, args, method, uri, data=None):
+    """
+    Makes an API request, exiting if the request was not successful.
+    :param session: (requests.Session) the session to send the request with
+    :param args: (argparse.Namespace) the parsed command line arguments
+    :param method: (string) the HTTP method of the request
+    :param uri: (string) the URI to request
+    :param data: (dict) the request data
+    :return: (float) the seconds the request took
+    """
+    start = time.perf_counter()
+    resp = session.request(
+        method,
+        f"{args.scheme}://{args.host}:{args.port}{uri}",
+        data=json.dumps(data or {}),
+        verify=False,
+        timeout=args.timeout
+    )
+    elapsed = time.perf_counter() - start
+
+    if resp.status_code != 200:
+        print(f"{method} {uri} failed with status {resp.status_code}: {resp.text}")
+        sys.exit(1)
+
+    return elapsed
+
+
+def clear_auth_cache(session, args, index):
+    """Writes a change to the config, which clears the authorization cache."""
+    data = {"id": ALIAS_NAME, "descr": f"Authorization benchmark {index}", "apply": False}
+    api_request(session, args, "PUT", "/api/v1/firewall/alias", data)
+
+
+def print_results(name, latencies):
+    """Prints the throughput and latency percentiles of a set of requests."""
+    print(
+        f"{name:<6} {len(latencies) / sum(latencies):>8.1f} req/s  "
+        + "  ".join(f"p{pct} {percentile(latencies, pct):.3f}s" for pct in PERCENTILES)
+    )
+
+
+def main():
+    """Runs the benchmark with a cold and a warm authorization cache."""
+    parser = argparse.ArgumentParser(description="Benchmark authenticated requests with a cold and warm auth cache.")
+    add_connection_args(parser)
+    parser.add_argument(
+        '--uri',
+        dest="uri",
+        type=str,
+        default="/api/v1/system/hostname",
+        help="The URI to send authenticated GET requests to"
+    )
+    parser.add_argument(
+        '--requests',
+        dest="requests",
+        type=int,
+        default=100,
+        help="The number of requests to time for each of the cold and warm caches"
+    )
+    args = parser.parse_args()
+    session = start_session(args, 1)
+    data = {"name": ALIAS_NAME, "type": "port", "address": [10000], "apply": False}
+    api_request(session, args, "POST", "/api/v1/firewall/alias", data)
+
+    try:
+        # Time each request directly after a config write so the authorization cache is always cold
+        cold = []
+        for index in range(args.requests):
+            clear_auth_cache(session, args, index)
+            cold.append(api_request(session, args, "GET", args.uri))
+
+        # Prime the authorization cache, then time requests back to back so the cache is always warm
+        api_request(session, args, "GET", args.uri)
+        warm = [api_request(session, args, "GET", args.uri) for _ in range(args.requests)]
+
+        print(f"Sent {args.requests} GET requests to {args.uri} for each cache state using {args.auth_mode} auth")
+        print_results("cold", cold)
+        print_results("warm", warm)
+        print(f"Warm throughput is {sum(cold) / sum(warm):.2f}x cold throughput")
+    except KeyboardInterrupt:
+        sys.exit(1)
+    finally:
+        api_request(session, args, "DELETE", "/api/v1/firewall/alias", {"id": ALIAS_NAME, "apply": False})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script that benchmarks filtered reads as the number of objects grows. For each size, N port aliases are seeded into the
+configuration through /api/v1/system/config and each query is timed against /api/v1/firewall/alias. The original
+configuration is restored once the benchmark finishes. Aliases are never applied, but this should still only be run
+against a development instance.
+"""
+import argparse
+import copy
+import json
+import sys
+import time
+
+from e2e_test_framework.tools import percentile
+from load_test import add_connection_args, start_session
+
+# Constants
+ALIAS_PREFIX = "E2E_QUERY_"
+PERCENTILES = [50, 95, 99]
+
+
+def get_queries(size):
+    """
+    Builds the queries to benchmark for a number of seeded aliases.
+    :param size: (int) the number of seeded aliases
+    :return: (dict) the name of each query mapped to its query parameters
+    """
+    return {
+        "unfiltered": {},
+        "exact match": {"name": f"{ALIAS_PREFIX}{size // 2}"},
+        "range": {"address__gte": 10000 + size // 4, "address__lt": 10000 + size // 2},
+        "exact match and range": {"type": "port", "address__gte": 10000 + size // 2},
+        "contains": {"descr__contains": f"alias {size // 2}"}
+    }
+
+
+def seed_config(config, size):
+    """
+    Builds a copy of the configuration containing a number of seeded port aliases.
+    :param config: (dict) the original configuration
+    :param size: (int) the number of aliases to seed
+    :return: (dict) the seeded configuration
+    """
+    # Local variables
+    config = copy.deepcopy(config)
+    aliases = config.get("aliases") if isinstance(config.get("aliases"), dict) else {}
+    config["aliases"] = aliases
+
+    # Keep any existing aliases and add the seeded aliases after them
+    aliases["alias"] = list(aliases.get("alias") or []) + [
+        {
+            "name": f"{ALIAS_PREFIX}{index}",
+            "type": "port",
+            "address": str(10000 + index),
+            "descr": f"Seeded alias {index}",
+            "detail": ""
+        }
+        for index in range(size)
+    ]
+    return config
+
+
+def api_request(session, args, method, uri, data=None):
+    """Makes an API request and returns the JSON response, exiting if the request was not successful."""
+    resp = session.request(
+        method,
+        f"{args.scheme}://{args.host}:{args.port}{uri}",
+        data=json.dumps(data or {}),
+        verify=False,
+        timeout=args.timeout
+    )
+    if resp.status_code != 200:
+        print(f"{method} {uri} failed with status {resp.status_code}: {resp.text}")
+        sys.exit(1)
+
+    return resp.json()
+
+
+def time_query(session, args, query):
+    """
+    Times a filtered read of the alias endpoint.
+    :param session: (requests.Session) the session to send the request with
+    :param args: (argparse.Namespace) the parsed command line arguments
+    :param query: (dict) the query parameters
+    :return: (tuple) the seconds the read took and the number of aliases it returned
+    """
+    start = time.perf_counter()
+    resp = api_request(session, args, "GET", "/api/v1/firewall/alias", query)
+    return time.perf_counter() - start, len(resp["data"])
+
+
+def main():
+    """Runs the benchmark for each size and restores the original configuration."""
+    parser = argparse.ArgumentParser(description="Benchmark filtered reads as the number of objects grows.")
+    add_connection_args(parser)
+    parser.add_argument(
+        '--sizes',
+        dest="sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 5000],
+        help="The numbers of aliases to seed and benchmark"
+    )
+    parser.add_argument(
+        '--repeat',
+        dest="repeat",
+        type=int,
+        default=20,
+        help="The number of times to time each query"
+    )
+    args = parser.parse_args()
+    session = start_session(args, 1)
+    config = api_request(session, args, "GET", "/api/v1/system/config")["data"]
+
+    # Exit if the configuration could not be read
+    if not isinstance(config, dict):
+        print("Expected /api/v1/system/config to return the configuration")
+        sys.exit(1)
+
+    print(f"{'SIZE':>6} {'QUERY':<24} {'MATCHES':>8} " + " ".join(f"{f'P{pct}':>9}" for pct in PERCENTILES))
+    try:
+        for size in args.sizes:
+            # Seed the aliases, then time each query against them
+            api_request(session, args, "PUT", "/api/v1/system/config", seed_config(config, size))
+            for name, query in get_queries(size).items():
+                results = [time_query(session, args, query) for _ in range(args.repeat)]
+                times = [elapsed for elapsed, _ in results]
+                print(
+                    f"{size:>6} {name:<24} {results[0][1]:>8} "
+                    + " ".join(f"{percentile(times, pct):>8.3f}s" for pct in PERCENTILES)
+                )
+    except KeyboardInterrupt:
+        sys.exit(1)
+    finally:
+        api_request(session, args, "PUT", "/api/v1/system/config", config)
+
+
+if __name__ == "__main__":
+    main()
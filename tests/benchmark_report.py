@@ -0,0 +1,141 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script that reports the p50/p95/p99 response times of each endpoint from an E2E --results file. Reports can be saved
+as a baseline and later reports compared against it to find latency regressions between package releases.
+"""
+import argparse
+import json
+import sys
+
+from e2e_test_framework.tools import percentile
+
+# Constants
+PERCENTILES = [50, 95, 99]
+
+
+def read_results(results_path):
+    """
+    Reads the response times recorded in a results file, grouped by endpoint.
+    :param results_path: (string) the path to the JSON Lines results file
+    :return: (dict) each endpoint ("METHOD /uri") mapped to a list of its response times in seconds
+    """
+    # Local variables
+    endpoints = {}
+
+    with open(results_path, "r", encoding="utf-8") as results_file:
+        for line in results_file:
+            result = json.loads(line)
+            # Skip requests that timed out, they have no response time
+            if result["elapsed"] is not None:
+                endpoints.setdefault(f"{result['method']} {result['uri']}", []).append(result["elapsed"])
+
+    return endpoints
+
+
+def build_report(endpoints):
+    """
+    Calculates the request count and percentiles of each endpoint.
+    :param endpoints: (dict) each endpoint mapped to a list of its response times
+    :return: (dict) each endpoint mapped to its request count and p50/p95/p99 response times
+    """
+    report = {}
+    for endpoint, times in sorted(endpoints.items()):
+        report[endpoint] = {"count": len(times)}
+        report[endpoint].update({f"p{pct}": percentile(times, pct) for pct in PERCENTILES})
+
+    return report
+
+
+def compare_report(report, baseline, threshold, min_delta):
+    """
+    Finds endpoints whose percentiles are slower than the baseline.
+    :param report: (dict) the current report
+    :param baseline: (dict) the baseline report to compare against
+    :param threshold: (float) the percentage a percentile may grow by before it is considered a regression
+    :param min_delta: (float) the seconds a percentile must grow by before it is considered a regression
+    :return: (list) a message describing each regression
+    """
+    regressions = []
+    for endpoint, stats in report.items():
+        # Endpoints that are not in the baseline cannot regress
+        if endpoint not in baseline:
+            continue
+
+        for pct in PERCENTILES:
+            current = stats[f"p{pct}"]
+            previous = baseline[endpoint][f"p{pct}"]
+            if current - previous > min_delta and current > previous * (1 + threshold / 100):
+                regressions.append(f"{endpoint} p{pct} increased from {previous:.3f}s to {current:.3f}s")
+
+    return regressions
+
+
+def print_report(report, baseline):
+    """Prints the report as a table, including the change from the baseline for each percentile if available."""
+    print(f"{'ENDPOINT':<60} {'COUNT':>6} " + " ".join(f"{f'P{pct}':>18}" for pct in PERCENTILES))
+    for endpoint, stats in report.items():
+        columns = []
+        for pct in PERCENTILES:
+            column = f"{stats[f'p{pct}']:.3f}s"
+            if endpoint in baseline:
+                column += f" ({stats[f'p{pct}'] - baseline[endpoint][f'p{pct}']:+.3f}s)"
+            columns.append(f"{column:>18}")
+        print(f"{endpoint:<60} {stats['count']:>6} " + " ".join(columns))
+
+
+def get_exit_code():
+    """Prints the report. Returns 1 if an endpoint regressed from the baseline, otherwise returns 0."""
+    parser = argparse.ArgumentParser(description="Report the response time percentiles of an E2E results file.")
+    parser.add_argument('results', type=str, help="The JSON Lines file written by the tests' --results argument")
+    parser.add_argument('--baseline', dest="baseline", type=str, help="A report saved by --save to compare against")
+    parser.add_argument('--save', dest="save", type=str, help="Save this report as a baseline to the given file")
+    parser.add_argument(
+        '--threshold',
+        dest="threshold",
+        type=float,
+        default=20.0,
+        help="The percentage a percentile may increase from the baseline before it is reported as a regression"
+    )
+    parser.add_argument(
+        '--min_delta',
+        dest="min_delta",
+        type=float,
+        default=0.05,
+        help="The seconds a percentile must increase from the baseline before it is reported as a regression"
+    )
+    args = parser.parse_args()
+    report = build_report(read_results(args.results))
+    baseline = {}
+
+    # Load the baseline if one was given
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    # Print the report and save it as a baseline if requested
+    print_report(report, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as save_file:
+            json.dump(report, save_file, indent=4)
+
+    # Print each regression and fail if any were found
+    regressions = compare_report(report, baseline, args.threshold, args.min_delta)
+    for regression in regressions:
+        print(f"\33[31mREGRESSION -->\33[0m {regression}")
+
+    return 1 if regressions else 0
+
+
+sys.exit(get_exit_code())
@@ -0,0 +1,61 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script that checks every return code expected by the E2E tests exists in the response library in APIResponse.inc. This
+does not require a pfSense instance, so it can catch tests that expect removed or renumbered return codes before the
+E2E tests are run.
+"""
+import sys
+
+from e2e_test_framework.tools import parse_api_responses
+from load_test import TESTS_DIR, load_test_classes
+
+# Constants
+TEST_ATTRS = ["get_tests", "post_tests", "put_tests", "delete_tests"]
+
+
+def find_return_codes():
+    """
+    Collects the return code expected by each E2E test.
+    :return: (list) a tuple containing the test filename, test name and expected return code of each test
+    """
+    # Local variables
+    return_codes = []
+
+    for test in sorted(test.name for test in TESTS_DIR.glob("test_api_v1_*.py")):
+        for test_class in load_test_classes(test):
+            for attr in TEST_ATTRS:
+                for test_params in getattr(test_class, attr):
+                    if "return" in test_params:
+                        return_codes.append((test, test_params.get("name", ""), test_params["return"]))
+
+    return return_codes
+
+
+def main():
+    """Checks each expected return code and exits on failure if any do not exist."""
+    responses = parse_api_responses()
+    return_codes = find_return_codes()
+    missing = [(test, name, code) for test, name, code in return_codes if code not in responses]
+
+    for test, name, code in missing:
+        print(f"{test}: '{name}' expects return code {code} which does not exist in APIResponse.inc")
+
+    print(f"Checked {len(return_codes)} expected return codes against {len(responses)} API responses")
+    if missing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@
 # limitations under the License.
 """Module for the e2e test framework that is used to test pfSense-API."""
 import argparse
+import base64
+import concurrent.futures
 import json
 import secrets
 import sys
@@ -21,23 +23,46 @@ import uuid
 import requests
 import urllib3
 
+from e2e_test_framework.fixtures import create_fixtures, delete_fixtures, resolve_fixtures
+from e2e_test_framework.tools import IfconfigSnapshot, write_json_atomic
+
 # Disable insecure request warnings as they cause a lot of noise in the tests.
 urllib3.disable_warnings(category=urllib3.exceptions.InsecureRequestWarning)
 
+# JWTs are shared by every test in this process, keyed by host and username. Refresh tokens this many seconds early.
+JWT_CACHE = {}
+JWT_REFRESH_WINDOW = 30
+
+# The longest time the /api/v1/system/job endpoint will wait for a job to finish in a single request
+JOB_MAX_WAIT = 30
+
+# The endpoint used to snapshot and restore the pfSense configuration
+CONFIG_URI = "/api/v1/system/config"
+
+# The first and longest intervals (in seconds) between checks when waiting for a condition with wait_until()
+WAIT_INTERVAL = 0.25
+WAIT_MAX_INTERVAL = 4
+
 
 class APIE2ETest:
     """Base class for the e2e test framework that is used to test pfSense-API."""
-    # Many methods needed for common test cases
-    # pylint: disable=too-many-public-methods
+    # Many methods needed for common test cases, and state shared between them (e.g. the last response and snapshots)
+    # pylint: disable=too-many-public-methods,too-many-instance-attributes
 
     # CLASS PROPERTIES #
     args = {}
     uid = str(uuid.uuid4())
     url = ""
     uri = ""
+    resources = []
+    fixtures = []
+    session = None
     exit_code = 0
     last_request = {}
     last_response = {}
+    last_response_headers = {}
+    ifconfig_snapshot = None
+    config_snapshot = None
     get_privileges = []
     get_tests = []
     post_privileges = []
@@ -54,16 +79,24 @@ class APIE2ETest:
     # CLASS METHODS #
     def __init__(self):
         self.__start_argparse__()
+        self.__start_session__()
         self.url = self.format_url(self.uri)
 
         # Run E2E tests and exit on corresponding status code
         try:
-            self.test_privs()
-            self.post()
-            self.get()
-            self.put()
-            self.delete()
-            self.custom_tests()
+            self.snapshot_config()
+            try:
+                self.setup_fixtures()
+                self.test_privs()
+                self.post()
+                self.get()
+                self.put()
+                self.delete()
+                self.custom_tests()
+                self.teardown_fixtures()
+            finally:
+                # Undo any configuration left behind by the tests, even if a test raised an unexpected error
+                self.restore_config()
             sys.exit(self.exit_code)
         except KeyboardInterrupt:
             sys.exit(1)
@@ -74,51 +107,39 @@ class APIE2ETest:
 
     def get(self):
         """Makes a GET request for every GET test found in the 'get_tests' attribute."""
-        # Loop through each GET req_data and check that it's response is expected
-        for test_params in self.get_tests:
-            self.pre_get()
-            self.get_responses.append(self.make_request("GET", test_params))
-            self.post_get()
-            # For speed, only delay time if test is a non-200 OK test
-            if test_params.get("status", 200) == 200:
-                time.sleep(self.args.delay)
+        self.__run_tests__("GET", self.get_tests, self.get_responses)
 
     def post(self):
         """Makes a POST request for every POST test found in the 'post_tests' attribute."""
-        # Loop through each POST req_data and check that it's response is expected
-        for test_params in self.post_tests:
-            self.pre_post()
-            self.post_responses.append(self.make_request("POST", test_params))
-            self.post_post()
-            # For speed, only delay time if test is a non-200 OK test
-            if test_params.get("status", 200) == 200:
-                time.sleep(self.args.delay)
+        self.__run_tests__("POST", self.post_tests, self.post_responses)
 
     def put(self):
         """Makes a PUT request for every PUT test found in the 'put_tests' attribute."""
-        # Loop through each PUT req_data and check that it's response is expected
-        for test_params in self.put_tests:
-            self.pre_put()
-            self.put_responses.append(self.make_request("PUT", test_params))
-            self.post_put()
-            # For speed, only delay time if test is a non-200 OK test
-            if test_params.get("status", 200) == 200:
-                time.sleep(self.args.delay)
+        self.__run_tests__("PUT", self.put_tests, self.put_responses)
 
     def delete(self):
         """Makes a DELETE request for every DELETE test found in the 'delete_tests' attribute."""
-        # Loop through each DELETE req_data and check that it's response is expected
-        for test_params in self.delete_tests:
-            self.pre_delete()
-            self.delete_responses.append(self.make_request("DELETE", test_params))
-            self.post_delete()
-            # For speed, only delay time if test is a non-200 OK test
-            if test_params.get("status", 200) == 200:
-                time.sleep(self.args.delay)
+        self.__run_tests__("DELETE", self.delete_tests, self.delete_responses)
 
     def custom_tests(self):
         """Allows child classes to specify custom tests. This is inteded to be overwritten by the child class."""
 
+    def setup_fixtures(self):
+        """
+        Creates the fixtures in the 'fixtures' attribute and the fixtures they require. This is skipped when the
+        fixtures are shared by the test runner (--shared_fixtures).
+        """
+        if self.fixtures and not self.args.shared_fixtures:
+            create_fixtures(self, resolve_fixtures(self.fixtures))
+
+    def teardown_fixtures(self):
+        """
+        Deletes the fixtures in the 'fixtures' attribute and the fixtures they require. This is skipped when the
+        fixtures are shared by the test runner (--shared_fixtures).
+        """
+        if self.fixtures and not self.args.shared_fixtures:
+            delete_fixtures(self, resolve_fixtures(self.fixtures))
+
     # PRE/POST REQUEST METHODS. These are intended to be overwritten by a child class.
     def pre_post(self):
         """
@@ -162,114 +183,46 @@ class APIE2ETest:
 
     def make_request(self, method, test_params, req_only=False):
         """Makes an API request based on the test's parameters."""
-        # pylint: disable=broad-except    # We don't want tests to exit and prevent later tests
-        # pylint: disable=too-many-locals  # Many variables needed for test customization
-        # pylint: disable=too-many-branches    # Many branches needed for test customization
-        # pylint: disable=too-many-statements    # Many statements needed for test customization
-
-        # Local variables
-        method = test_params.get("method", method)    # Allow custom method override
-        req_data = test_params.get("req_data", {})
-        req_data_callable = getattr(self, test_params.get("req_data_callable", ""), None)
-        pre_test_callable = getattr(self, test_params.get("pre_test_callable", ""), None)
-        pre_test_exc = None
-        post_test_callable = getattr(self, test_params.get("post_test_callable", ""), None)
-        post_test_exc = None
-        username = test_params.get("username", self.args.username)
-        password = test_params.get("password", self.args.password)
-        auth_mode = test_params.get("auth_mode", self.args.auth_mode)
-        headers = {}
-        auth = None
-        resp = None
-
-        # Delay this test if the 'delay' parameter is set
-        time.sleep(test_params.get("delay", 0))
-
-        # Set authentication headers for local authentication
-        if auth_mode == "local":
-            auth = (username, password)
-        # Set authentication headers for token authentication
-        if auth_mode == "token":
-            headers = {"Authorization": username + " " + password}
-        # Set authentication headers for JWT authentication
-        if auth_mode == "jwt":
-            headers = {"Authorization": "Bearer " + self.get_jwt(username, password)}
+        request = self.__prepare_request__(method, test_params)
+        resp = self.__send_request__(request)
 
-        # When a callable req_data is defined, ensure it is a callable and run the function
-        if test_params.get("req_data_callable", ""):
-            # Ensure the test is callable, otherwise raise an error
-            if callable(req_data_callable):
-                # Try to run the callable, if an exception occurs capture it so it can be checked in __check_resp__
-                req_data.update(req_data_callable())
-            else:
-                raise ValueError("Expected req_data_callable to be a valid callable name")
-
-        # When a pre-test callable is defined, ensure it is a callable and run the function
-        if test_params.get("pre_test_callable", ""):
-            # Ensure the test is callable, otherwise raise an error
-            if callable(pre_test_callable):
-                # Try to run the callable, if an exception occurs capture it so it can be checked in __check_resp__
-                try:
-                    pre_test_callable()
-                except Exception as exc:
-                    pre_test_exc = exc
-            else:
-                raise ValueError("Expected pre_test_callable to be a valid callable name")
-
-        # Attempt to make the API call, if the request times out print timeout error
-        try:
-            resp = requests.request(
-                method,
-                url=self.format_url(test_params.get("uri", self.uri)),
-                data=json.dumps(req_data),
-                verify=False,
-                timeout=self.args.timeout,
-                headers=headers,
-                auth=auth
-            )
-        except (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout):
-            print(self.__format_msg__(method, test_params, f"Exceeded timeout of {self.args.timeout}s"))
+        # Print the timeout error if the request timed out
+        if resp is None:
+            print(self.__format_msg__(request["method"], test_params, f"Exceeded timeout of {self.args.timeout}s"))
 
         # If this is a request only execution, just return the request/response object
         if req_only:
             return resp
 
-        # Capture this test's request as the last request
-        self.last_request = test_params
+        return self.__finish_request__(request, resp)
 
-        # Try to set the last response, set an empty dict if we couldn't.
-        try:
-            self.last_response = resp.json()
-        except requests.exceptions.JSONDecodeError:
-            self.last_response = {}
+    def get_jwt(self, username, password):
+        """
+        Obtains a JWT to use for JWT authentication. Tokens are cached by host and username and are only requested
+        again when they are close to expiring. If --jwt_cache is set, tokens are also shared with other test processes.
+        """
+        # Local variables
+        cache_key = f"{self.args.host}:{self.args.port}/{username}"
 
-        # Pause this test if the 'pause' parameter is set
-        time.sleep(test_params.get("pause", 0))
+        # Load tokens cached by other test processes
+        if self.args.jwt_cache:
+            JWT_CACHE.update(self.read_jwt_cache())
 
-        # Check for a post test callable
-        if test_params.get("post_test_callable", ""):
-            # Ensure the test is callable, otherwise raise an error
-            if callable(post_test_callable):
-                # Try to run the callable, if an exception occurs capture it so it can be checked in __check_resp__
-                try:
-                    post_test_callable()
-                except Exception as exc:
-                    post_test_exc = exc
-            else:
-                raise ValueError("Expected post_test_callable to be a valid callable name")
+        # Use the cached token if it is not close to expiring
+        if self.get_jwt_exp(JWT_CACHE.get(cache_key, "")) - JWT_REFRESH_WINDOW > time.time():
+            return JWT_CACHE[cache_key]
 
-        # Otherwise, check if the response is valid
-        response_valid = self.__check_resp__(resp, test_params, pre_test_exc=pre_test_exc, post_test_exc=post_test_exc)
+        # Otherwise, request a new token and cache it
+        token = self.request_jwt(username, password)
+        if token:
+            JWT_CACHE[cache_key] = token
+            self.write_jwt_cache()
 
-        # Return the JSON response when successful
-        if response_valid:
-            return resp.json()
+        return token
 
-        return None
-
-    def get_jwt(self, username, password):
+    def request_jwt(self, username, password):
         """Requests a new JWT to use for JWT authentication."""
-        resp = requests.request(
+        resp = self.session.request(
             "POST",
             url=self.args.scheme + "://" + self.args.host + ":" + str(self.args.port) + "/api/v1/access_token",
             verify=False,
@@ -292,6 +245,121 @@ class APIE2ETest:
 
         return resp.json()["data"]["token"]
 
+    @staticmethod
+    def get_jwt_exp(token):
+        """
+        Reads the expiration time of a JWT without verifying it.
+        :param token: (string) the JWT to read
+        :return: (int) the token's 'exp' claim as a UNIX timestamp, or 0 if the token could not be read
+        """
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)    # Restore the padding removed by base64url encoding
+            return int(json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0))
+        except (IndexError, ValueError, AttributeError):
+            return 0
+
+    def read_jwt_cache(self):
+        """
+        Reads the JWTs shared by other test processes from the --jwt_cache file.
+        :return: (dict) the cached tokens, or an empty dict if the cache file could not be read
+        """
+        try:
+            with open(self.args.jwt_cache, "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def write_jwt_cache(self):
+        """Shares this process' JWTs with other test processes by writing them to the --jwt_cache file."""
+        # Only write the cache if a cache file was given
+        if not self.args.jwt_cache:
+            return
+
+        # Merge with tokens written by other processes, then replace the file atomically so readers never see a
+        # partial write. Concurrent writers may drop each other's tokens, which only costs an extra token request.
+        write_json_atomic(self.args.jwt_cache, {**self.read_jwt_cache(), **JWT_CACHE})
+
+    def read_config_hash(self):
+        """
+        Reads the hash of the pfSense configuration, which changes whenever the configuration changes.
+        :return: (string) the configuration's hash, or None if the hash could not be read
+        """
+        resp = self.make_request("GET", {"uri": CONFIG_URI, "req_data": {"hash": True}}, req_only=True)
+        try:
+            return resp.json()["data"]["hash"]
+        except (AttributeError, ValueError, KeyError, TypeError):
+            return None
+
+    def snapshot_config(self):
+        """
+        Captures the pfSense configuration so restore_config() can undo the changes made by this test. The snapshot
+        is shared with other test processes through the --config_snapshot file, so the entire configuration is only
+        read when its hash differs from the last snapshot taken.
+        """
+        # Only snapshot the configuration if it will be restored. Read-only tests have no changes to restore and the
+        # configuration cannot be restored while the system reboots or the client is locked out.
+        if not self.args.restore_config or set(self.resources).intersection(["read-only", "reboots", "lockout"]):
+            return
+
+        # Reuse the last snapshot taken if the configuration has not changed since
+        config_hash = self.read_config_hash()
+        snapshot = self.read_config_snapshot()
+        if config_hash and snapshot.get("hash") == config_hash:
+            self.config_snapshot = snapshot
+            return
+
+        # Otherwise, read the entire configuration and share it with later tests
+        resp = self.make_request("GET", {"uri": CONFIG_URI}, req_only=True)
+        try:
+            self.config_snapshot = {"hash": config_hash, "config": resp.json()["data"]}
+        except (AttributeError, ValueError, KeyError):
+            print(self.__format_msg__("GET", {"uri": CONFIG_URI}, "Could not read the configuration to restore"))
+            self.exit_code = 1
+            return
+        self.write_config_snapshot()
+
+    def restore_config(self):
+        """
+        Restores the configuration captured by snapshot_config() if this test changed it. The snapshot is written back
+        with a PUT to /api/v1/system/config, which writes the configuration without applying it. Runtime state such as
+        loaded filter rules, routes, interface addresses and running services is not rolled back.
+        """
+        # Skip restoring the configuration if it was not captured or has not changed
+        if not self.config_snapshot:
+            return
+        if self.config_snapshot["hash"] and self.read_config_hash() == self.config_snapshot["hash"]:
+            return
+
+        # Replace the entire configuration with the snapshot in a single request
+        test_params = {
+            "name": "Restore configuration changed by this test",
+            "uri": CONFIG_URI,
+            "req_data": self.config_snapshot["config"],
+            "resp_time": 10    # Allow time to write large configurations
+        }
+        self.make_request("PUT", test_params)
+
+    def read_config_snapshot(self):
+        """
+        Reads the configuration snapshot shared by other test processes from the --config_snapshot file.
+        :return: (dict) the snapshot's hash and configuration, or an empty dict if the file could not be read
+        """
+        try:
+            with open(self.args.config_snapshot, "r", encoding="utf-8") as snapshot_file:
+                return json.load(snapshot_file)
+        except (OSError, TypeError, ValueError):
+            return {}
+
+    def write_config_snapshot(self):
+        """Shares this process' configuration snapshot with later test processes through the --config_snapshot file."""
+        # Only write the snapshot if a snapshot file was given
+        if not self.args.config_snapshot:
+            return
+
+        # Replace the file atomically so readers never see a partial write
+        write_json_atomic(self.args.config_snapshot, self.config_snapshot)
+
     def create_or_update_user(self, username, passwd, privs):
         """
         Creates or updates a user that can be used for testing.
@@ -322,7 +390,7 @@ class APIE2ETest:
     def delete_user(self, username):
         """
         Deletes a user off pfSense. Intended to delete users used for testing.
-        :param username: (string) the username of the user to delete
+        :param username: (string|list) the username of the user to delete, or a list of usernames to delete at once
         :return: None
         """
         self.make_request(
@@ -357,6 +425,120 @@ class APIE2ETest:
         # Otherwise, raise an error
         raise ConnectionError(f"Failed to run '{cmd}' at '{self.format_url(test_params['uri'])}'")
 
+    def pfsense_shell_batch(self, cmds: list):
+        """
+        Runs several shell commands on the target pfSense in a single request to the
+        /api/v1/diagnostics/command_prompt endpoint. The commands run in order in one shell, and a failing command does
+        not stop the commands after it.
+        :param cmds: (list) the shell commands to run
+        :return: (dict) the stdout from each shell command, keyed by the shell command
+        """
+        # Local variables
+        test_params = {
+            "uri": "/api/v1/diagnostics/command_prompt",
+            "req_data": {"shell_cmds": cmds}
+        }
+
+        # Run the API request
+        resp = self.make_request("POST", test_params, req_only=True)
+
+        # Only return the responses if it was successful
+        if self.has_json_response(resp) and resp.status_code == 200:
+            return {result["shell_cmd"]: result["cmd_output"] for result in resp.json()["data"]["cmd_outputs"]}
+
+        # Otherwise, raise an error
+        raise ConnectionError(f"Failed to run {cmds} at '{self.format_url(test_params['uri'])}'")
+
+    def ifconfig(self):
+        """
+        Reads the ifconfig output of the target pfSense as an IfconfigSnapshot. The snapshot is cached until the next
+        request that may change pfSense (any test request that is not a GET), so checking many interface addresses in
+        a test only reads ifconfig once.
+        :return: (IfconfigSnapshot) the snapshot of the current ifconfig output
+        """
+        if self.ifconfig_snapshot is None:
+            self.ifconfig_snapshot = IfconfigSnapshot(self.pfsense_shell("ifconfig"))
+
+        return self.ifconfig_snapshot
+
+    def wait_for_job(self, job_id, timeout=120):
+        """
+        Waits for a background job on the target pfSense to finish by long-polling the /api/v1/system/job endpoint.
+        :param job_id: (string) the ID of the job to wait for
+        :param timeout: (int) the maximum number of seconds to wait for the job to finish
+        :return: (dict) the finished job
+        """
+        # Local variables
+        deadline = time.monotonic() + timeout
+
+        while True:
+            # Wait as long as we can in each request, but leave enough of the connection timeout to receive a response
+            wait = max(0, min(deadline - time.monotonic(), JOB_MAX_WAIT, self.args.timeout / 2))
+            test_params = {"uri": "/api/v1/system/job", "req_data": {"id": job_id, "wait": wait}}
+            resp = self.make_request("GET", test_params, req_only=True)
+
+            # Raise an error if the job could not be read
+            if not self.has_json_response(resp) or resp.status_code != 200:
+                raise ConnectionError(f"Failed to read job '{job_id}' at '{self.format_url(test_params['uri'])}'")
+
+            # Return the job once it has finished, otherwise keep waiting until we run out of time
+            job = resp.json().get("data")
+            if job.get("status") == "failed":
+                raise AssertionError(f"Expected job '{job_id}' to succeed, received {job}")
+            if job.get("status") == "succeeded":
+                return job
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Job '{job_id}' did not finish within {timeout}s, last status was {job}")
+
+    def wait_for_jobs(self, response):
+        """
+        Waits for each background job started by a request to finish.
+        :param response: (dict) the JSON response containing a 'job_id' or 'job_ids' in its data
+        """
+        data = response.get("data")
+        data = data if isinstance(data, dict) else {}
+        job_ids = data.get("job_ids", [data["job_id"]] if "job_id" in data else [])
+
+        # Raise an error if the response did not start any jobs, otherwise tests could silently skip waiting
+        if not job_ids:
+            raise AssertionError(f"Expected response to include a job ID, received {response}")
+
+        for job_id in job_ids:
+            self.wait_for_job(job_id)
+
+    def wait_until(self, predicate, timeout, interval=WAIT_INTERVAL, max_interval=WAIT_MAX_INTERVAL):
+        """
+        Checks a condition until it passes or the timeout is reached. The time between checks starts at the interval
+        and doubles after each failed check up to the max interval, so fast conditions are noticed quickly without
+        flooding the target with checks while waiting on slow conditions.
+        :param predicate: (callable) the condition to check. The condition fails if it returns False or raises an
+        exception, so existing test callables can be used as conditions.
+        :param timeout: (float) the maximum number of seconds to wait for the condition to pass
+        :param interval: (float) the number of seconds to wait after the first failed check
+        :param max_interval: (float) the maximum number of seconds to wait between checks
+        :return: (bool) True if the condition passed, False if the timeout was reached first
+        """
+        # pylint: disable=broad-except    # Any exception from the predicate means the condition has not passed yet
+
+        # Local variables
+        deadline = time.monotonic() + timeout
+
+        while True:
+            # Conditions must see the current state of pfSense, so never check them against a cached snapshot
+            self.ifconfig_snapshot = None
+            try:
+                if predicate() is not False:
+                    return True
+            except Exception:
+                pass
+
+            # Wait before checking again, but never past the deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
+
     def is_priv_allowed(self, method, username, password, priv):
         """
         Makes a test API call to check if a specified privilege authorizes the API call
@@ -400,6 +582,11 @@ class APIE2ETest:
         username = str(uuid.uuid4())[:8]    # Username of user to create and use for this test
         password = secrets.token_urlsafe(12)    # Password of the user to create and use for this test
 
+        # Use the batched privilege checks if requested
+        if self.args.batch_privs:
+            self.test_privs_batched(username, password)
+            return
+
         # Test privs for each request type
         for method in ["get", "post", "put", "delete"]:
             # Get the method privileges attribute for this method. (e.g. self.get_privileges, etc)
@@ -420,9 +607,339 @@ class APIE2ETest:
                         print(self.__format_msg__(method.upper(), test_params, msg))
                         self.exit_code = 1
 
+    def __run_tests__(self, method, tests, responses):
+        """
+        Makes a request for every test in a test list and checks that each response is expected. Consecutive tests
+        marked as concurrent are sent at the same time when the --concurrency argument allows it. The method's pre/post
+        callables (e.g. pre_get() and post_get()) and test output always run in the order the tests are listed. Every
+        delay, req_data callable and pre-test callable of a batch runs before any of the batch's requests are sent, and
+        every post-test callable runs after all of the batch's responses were received.
+        :param method: (string) the default request method for the tests
+        :param tests: (list) the test parameters of each test to run
+        :param responses: (list) the list to add the JSON response of each test to, or None for tests that failed. Each
+        response is added before the post callable runs so the callable can read it.
+        """
+        # Local variables
+        pre_callable = getattr(self, "pre_" + method.lower())
+        post_callable = getattr(self, "post_" + method.lower())
+
+        for batch in self.__batch_tests__(tests):
+            # Prepare each request in order, this runs any delays, req_data callables and pre-test callables
+            prepared = []
+            for test_params in batch:
+                pre_callable()
+                prepared.append(self.__prepare_request__(method, test_params))
+
+            # Send the batch's requests at the same time if more than one request is allowed at once
+            if len(prepared) > 1 and self.args.concurrency > 1:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=self.args.concurrency) as executor:
+                    resps = list(executor.map(self.__send_request__, prepared))
+            else:
+                resps = [self.__send_request__(request) for request in prepared]
+
+            # Check each response in order so the output matches the order of the tests
+            for request, resp in zip(prepared, resps):
+                if resp is None:
+                    msg = f"Exceeded timeout of {self.args.timeout}s"
+                    print(self.__format_msg__(request["method"], request["test_params"], msg))
+                responses.append(self.__finish_request__(request, resp))
+                post_callable()
+
+            # For speed, only delay time if the batch contained a non-200 OK test
+            if any(test_params.get("status", 200) == 200 for test_params in batch):
+                time.sleep(self.args.delay)
+
+    @staticmethod
+    def __batch_tests__(tests):
+        """
+        Groups tests into batches of tests that may be sent at the same time. Consecutive tests that set 'concurrent'
+        to true (or set a 'group') and share the same 'group' are batched together, all other tests run on their own.
+        :param tests: (list) the test parameters of each test
+        :return: (list) a list of test parameter lists
+        """
+        # Local variables
+        batches = []
+        last_group = None
+
+        for test_params in tests:
+            is_concurrent = test_params.get("concurrent", False) or "group" in test_params
+            group = test_params.get("group")
+
+            # Add this test to the previous batch if both are concurrent and in the same group
+            if is_concurrent and batches and last_group == (True, group):
+                batches[-1].append(test_params)
+            else:
+                batches.append([test_params])
+
+            last_group = (is_concurrent, group)
+
+        return batches
+
+    def __prepare_request__(self, method, test_params):
+        """
+        Prepares an API request based on the test's parameters. This runs the test's delay, req_data callable and
+        pre-test callable.
+        :param method: (string) the default request method for the test
+        :param test_params: (dict) the parameters of the test
+        :return: (dict) the prepared request
+        """
+        # pylint: disable=broad-except    # We don't want tests to exit and prevent later tests
+
+        # Local variables
+        method = test_params.get("method", method)    # Allow custom method override
+        req_data = test_params.get("req_data", {})
+        req_data_callable = getattr(self, test_params.get("req_data_callable", ""), None)
+        pre_test_callable = getattr(self, test_params.get("pre_test_callable", ""), None)
+        pre_test_exc = None
+        username = test_params.get("username", self.args.username)
+        password = test_params.get("password", self.args.password)
+        auth_mode = test_params.get("auth_mode", self.args.auth_mode)
+        headers = {}
+        auth = None
+
+        # Delay this test if the 'delay' parameter is set, this is the most time to wait if 'delay_until' is also set
+        self.__wait__(test_params, "delay", "delay_until")
+
+        # Set authentication headers for local authentication
+        if auth_mode == "local":
+            auth = (username, password)
+        # Set authentication headers for token authentication
+        if auth_mode == "token":
+            headers = {"Authorization": username + " " + password}
+        # Set authentication headers for JWT authentication
+        if auth_mode == "jwt":
+            headers = {"Authorization": "Bearer " + self.get_jwt(username, password)}
+
+        # When a callable req_data is defined, ensure it is a callable and run the function
+        if test_params.get("req_data_callable", ""):
+            # Ensure the test is callable, otherwise raise an error
+            if callable(req_data_callable):
+                # Try to run the callable, if an exception occurs capture it so it can be checked in __check_resp__
+                req_data.update(req_data_callable())
+            else:
+                raise ValueError("Expected req_data_callable to be a valid callable name")
+
+        # When a pre-test callable is defined, ensure it is a callable and run the function
+        if test_params.get("pre_test_callable", ""):
+            # Ensure the test is callable, otherwise raise an error
+            if callable(pre_test_callable):
+                # Try to run the callable, if an exception occurs capture it so it can be checked in __check_resp__
+                try:
+                    pre_test_callable()
+                except Exception as exc:
+                    pre_test_exc = exc
+            else:
+                raise ValueError("Expected pre_test_callable to be a valid callable name")
+
+        return {
+            "method": method,
+            "test_params": test_params,
+            "uri": test_params.get("uri", self.uri),
+            "url": self.format_url(test_params.get("uri", self.uri)),
+            "data": json.dumps(req_data),
+            "headers": headers,
+            "auth": auth,
+            "pre_test_exc": pre_test_exc
+        }
+
+    def __wait__(self, test_params, wait_param, until_param):
+        """
+        Waits for the number of seconds in a test's wait parameter (e.g. 'delay'). If the test also names a condition
+        callable in its until parameter (e.g. 'delay_until'), this only waits until that condition passes.
+        :param test_params: (dict) the parameters of the test
+        :param wait_param: (string) the name of the parameter containing the number of seconds to wait
+        :param until_param: (string) the name of the parameter containing the condition callable's name
+        """
+        # Local variables
+        timeout = test_params.get(wait_param, 0)
+        predicate = getattr(self, test_params.get(until_param, ""), None)
+
+        # Wait the full time if there is no condition to wait for
+        if not test_params.get(until_param, ""):
+            time.sleep(timeout)
+        # Ensure the condition is callable, otherwise raise an error
+        elif callable(predicate):
+            self.wait_until(predicate, timeout)
+        else:
+            raise ValueError(f"Expected {until_param} to be a valid callable name")
+
+    def __send_request__(self, request):
+        """
+        Sends a request prepared by __prepare_request__. This is safe to call from multiple threads.
+        :param request: (dict) the prepared request
+        :return: (requests.Response) the response, or None if the request timed out
+        """
+        # Attempt to make the API call, return None if the request times out
+        try:
+            return self.session.request(
+                request["method"],
+                url=request["url"],
+                data=request["data"],
+                verify=False,
+                timeout=self.args.timeout,
+                headers=request["headers"],
+                auth=request["auth"]
+            )
+        except (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout):
+            return None
+
+    def __finish_request__(self, request, resp):
+        """
+        Runs the test's pause, job wait and post-test callable, then checks that the response is expected.
+        :param request: (dict) the request prepared by __prepare_request__
+        :param resp: (requests.Response) the response received for the request
+        :return: (dict) the JSON response when the response was valid, None otherwise
+        """
+        # pylint: disable=broad-except    # We don't want tests to exit and prevent later tests
+
+        # Local variables
+        test_params = request["test_params"]
+        post_test_callable = getattr(self, test_params.get("post_test_callable", ""), None)
+        post_test_exc = None
+
+        # Capture this test's request as the last request
+        self.last_request = test_params
+
+        # Discard the cached ifconfig snapshot if this request may have changed pfSense
+        if request["method"] != "GET":
+            self.ifconfig_snapshot = None
+
+        # Try to set the last response, set an empty dict if we couldn't.
+        self.last_response_headers = resp.headers if resp is not None else {}
+        try:
+            self.last_response = resp.json() if resp is not None else {}
+        except requests.exceptions.JSONDecodeError:
+            self.last_response = {}
+
+        # Pause this test if the 'pause' parameter is set, this is the most time to wait if 'pause_until' is also set
+        self.__wait__(test_params, "pause", "pause_until")
+
+        # Wait for any background jobs started by this request if the 'wait_for_job' parameter is set
+        if test_params.get("wait_for_job", False):
+            try:
+                self.wait_for_jobs(self.last_response)
+            except Exception as exc:
+                post_test_exc = exc
+
+        # Check for a post test callable, this is skipped if this request's background jobs did not finish
+        if test_params.get("post_test_callable", "") and not post_test_exc:
+            # Ensure the test is callable, otherwise raise an error
+            if callable(post_test_callable):
+                # Try to run the callable, if an exception occurs capture it so it can be checked in __check_resp__
+                try:
+                    post_test_callable()
+                except Exception as exc:
+                    post_test_exc = exc
+            else:
+                raise ValueError("Expected post_test_callable to be a valid callable name")
+
+        # Otherwise, check if the response is valid. A request that timed out already printed its error.
+        pre_test_exc = request["pre_test_exc"]
+        if resp is None:
+            response_valid = False
+            self.exit_code = 1
+        else:
+            response_valid = self.__check_resp__(
+                resp, test_params, pre_test_exc=pre_test_exc, post_test_exc=post_test_exc
+            )
+
+        # Record the response time if a results file was given
+        if self.args.results:
+            self.record_result(request, resp, response_valid)
+
+        # Return the JSON response when successful
+        if response_valid:
+            return resp.json()
+
+        return None
+
+    def record_result(self, request, resp, passed):
+        """
+        Appends a request's response time to the results file as a JSON line. Each line is written with a single
+        write so test processes running in parallel can share the same results file.
+        :param request: (dict) the request prepared by __prepare_request__
+        :param resp: (requests.Response) the response received for the request, or None if the request timed out
+        :param passed: (bool) whether the response passed the test
+        """
+        result = {
+            "time": time.time(),
+            "test": type(self).__name__,
+            "name": request["test_params"].get("name", ""),
+            "method": request["method"],
+            "uri": request["uri"],
+            "status": resp.status_code if resp is not None else None,
+            "elapsed": resp.elapsed.total_seconds() if resp is not None else None,
+            "resp_time": request["test_params"].get("resp_time", 1),
+            "passed": bool(passed)
+        }
+        with open(self.args.results, "a", encoding="utf-8") as results_file:
+            results_file.write(json.dumps(result) + "\n")
+
+    def test_privs_batched(self, username, password):
+        """
+        Batched version of test_privs(). Creates one user without privileges and one user per privilege up front,
+        probes every method for each user at the same time, then deletes all the users with a single request.
+        :param username: (string) the username of the unprivileged user, privileged users use this as a prefix
+        :param password: (string) the password to assign each user
+        """
+        # pylint: disable=too-many-locals  # Many variables needed to track each user and probe
+
+        # Local variables
+        methods = [method for method in ["get", "post", "put", "delete"] if getattr(self, f"{method}_privileges", [])]
+        privileges = list(dict.fromkeys(priv for method in methods for priv in getattr(self, f"{method}_privileges")))
+        priv_usernames = {priv: f"{username}_{index}" for index, priv in enumerate(privileges)}
+        probes = [(method.upper(), username, {}) for method in methods]
+        probes += [
+            (method.upper(), priv_usernames[priv], {"_action_bypass": True})
+            for method in methods for priv in getattr(self, f"{method}_privileges")
+        ]
+
+        # Only test privileges if we have them
+        if not privileges:
+            return
+
+        # Create the unprivileged user and one user for each privilege
+        self.create_or_update_user(username, password, [])
+        for priv, priv_username in priv_usernames.items():
+            self.create_or_update_user(priv_username, password, [priv])
+
+        # Make each probe request at the same time and capture the status code each user received for each method
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.args.pool_size) as executor:
+            resps = executor.map(
+                lambda probe: self.make_request(
+                    probe[0],
+                    test_params={"username": probe[1], "password": password, "req_data": probe[2]},
+                    req_only=True
+                ),
+                probes
+            )
+            statuses = {probe[:2]: getattr(resp, "status_code", None) for probe, resp in zip(probes, resps)}
+
+        # Delete all test users at once
+        self.delete_user([username] + list(priv_usernames.values()))
+
+        # Ensure unprivileged requests returned a 403 and the privileged requests didn't
+        for method in methods:
+            for privilege in getattr(self, f"{method}_privileges"):
+                # Set test_pararms so the test name shows correctly
+                test_params = {"name": f"Checking privilege '{privilege}' acceptance"}
+                no_priv_status = statuses[(method.upper(), username)]
+                priv_status = statuses[(method.upper(), priv_usernames[privilege])]
+
+                # Check if the privilege was allowed
+                if no_priv_status == 403 and priv_status not in [403, None]:
+                    print(self.__format_msg__(method.upper(), test_params, "Response is valid", mode="ok"))
+                else:
+                    msg = f"Expected API to authorize call with privilege '{privilege}'"
+                    print(self.__format_msg__(method.upper(), test_params, msg))
+                    self.exit_code = 1
+
     @staticmethod
     def has_json_response(resp):
         """Checks that our request's response is valid a JSON string."""
+        if resp is None:
+            return False
+
         try:
             resp.json()
             return True
@@ -615,6 +1132,69 @@ class APIE2ETest:
             default=0,
             help="Delay between tests in seconds"
         )
+        parser.add_argument(
+            '--concurrency',
+            dest="concurrency",
+            type=int,
+            default=1,
+            help="The maximum number of requests to send at once for tests marked as concurrent"
+        )
+        parser.add_argument(
+            '--pool_size',
+            dest="pool_size",
+            type=int,
+            default=10,
+            help="The maximum number of connections to keep open to the host"
+        )
+        parser.add_argument(
+            '--no_keep_alive',
+            dest="keep_alive",
+            action="store_false",
+            required=False,
+            help="Close the connection after each request instead of reusing it"
+        )
+        parser.add_argument(
+            '--jwt_cache',
+            dest="jwt_cache",
+            type=str,
+            default=None,
+            help="A file used to share JWTs between test processes"
+        )
+        parser.add_argument(
+            '--batch_privs',
+            dest="batch_privs",
+            action="store_true",
+            required=False,
+            help="Create all privilege test users up front and check each privilege at the same time"
+        )
+        parser.add_argument(
+            '--restore_config',
+            dest="restore_config",
+            action="store_true",
+            required=False,
+            help="Restore the configuration read before the tests if the tests changed it"
+        )
+        parser.add_argument(
+            '--config_snapshot',
+            dest="config_snapshot",
+            type=str,
+            default=None,
+            help="A file used to share configuration snapshots between test processes when using --restore_config"
+        )
+        parser.add_argument(
+            '--shared_fixtures',
+            dest="shared_fixtures",
+            action="store_true",
+            required=False,
+            help="Use fixtures created by the test runner instead of creating and deleting them in this test"
+        )
+        parser.add_argument(
+            '--results',
+            dest="results",
+            type=str,
+            default=None,
+            help="A JSON Lines file to append each request's response time to"
+        )
         parser.add_argument(
             '--verbose',
             dest="verbose",
@@ -624,6 +1204,17 @@ class APIE2ETest:
         )
         self.args = parser.parse_args()
 
+    def __start_session__(self):
+        """Starts the HTTP session shared by all requests this test makes so connections can be reused."""
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.args.pool_size)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Ask the host to close the connection after each request if keep-alive is disabled
+        if not self.args.keep_alive:
+            self.session.headers["Connection"] = "close"
+
     def __format_msg__(self, method, test_params, result, mode="failed"):
         # Set ASCII color text for the method used
         methods = {
@@ -649,3 +1240,142 @@ class APIE2ETest:
         # Piece the message together
         msg = msg + f" [ {methods[method]} {url} ][{test_params.get('name', 'Unnamed test')}]: {result}"
         return msg
+
+
+class APIE2EBulkTest(APIE2ETest):
+    """
+    Base class for E2E tests of endpoints that accept bulk requests. The bulk tests are built from the class properties
+    below when the test class is defined. They create three objects in bulk, then update and delete them in bulk. Any
+    POST tests the test class defines run after the invalid payload tests and before the objects are created, any
+    other tests run after the bulk tests for their method.
+    """
+    # CLASS PROPERTIES #
+    bulk_name = "objects"    # The name of the objects in test names, e.g. "firewall aliases"
+    bulk_payloads = []    # The payloads of the three objects to create
+    bulk_fields = {}    # Fields every payload and read must include to find the objects, e.g. their interface
+    bulk_descr = "E2E Bulk Test"    # The description given to the objects, reads find the objects by it
+    bulk_invalid_payload = {}    # A payload that is rejected with the bulk_invalid_return return code
+    bulk_invalid_return = 0
+    bulk_id_field = None    # The field that identifies objects in updates and deletes, None uses the object's ID
+    bulk_apply = False    # Whether the bulk creates and deletes apply their changes
+    bulk_resp_time = 1    # The response time allowed for the bulk creates and deletes
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        updated_descr = f"Updated {cls.bulk_descr}"
+        payloads = [{**cls.bulk_fields, "descr": cls.bulk_descr, **payload} for payload in cls.bulk_payloads]
+
+        cls.post_tests = [
+            {
+                "name": "Check bulk payloads array type constraint",
+                "status": 400,
+                "return": 16,
+                "req_data": {"bulk": "INVALID"}
+            },
+            {
+                "name": "Check bulk payloads array minimum items constraint",
+                "status": 400,
+                "return": 16,
+                "req_data": {"bulk": []}
+            },
+            {
+                "name": "Check bulk request is rejected when a payload is invalid",
+                "status": 400,
+                "return": 17,
+                "req_data": {"bulk": [payloads[0], {**cls.bulk_fields, **cls.bulk_invalid_payload}]},
+                "post_test_callable": "is_invalid_payload_reported"
+            },
+            *cls.post_tests,
+            {
+                "name": f"Ensure rejected bulk requests did not create any {cls.bulk_name}",
+                "method": "GET",
+                "req_data": {**cls.bulk_fields, "descr": cls.bulk_descr},
+                "resp_data_empty": True
+            },
+            {
+                "name": f"Create {cls.bulk_name} in bulk",
+                "req_data": {"apply": cls.bulk_apply, "bulk": payloads},
+                "post_test_callable": "is_each_payload_successful",
+                "resp_time": cls.bulk_resp_time
+            },
+            {
+                "name": f"Read the {cls.bulk_name} created by the bulk request",
+                "method": "GET",
+                "req_data": {**cls.bulk_fields, "descr": cls.bulk_descr},
+                "post_test_callable": "is_each_object_read"
+            }
+        ]
+        cls.put_tests = [
+            {
+                "name": f"Update {cls.bulk_name} in bulk",
+                "req_data_callable": "get_bulk_update_req_data",
+                "post_test_callable": "is_each_payload_successful"
+            },
+            {
+                "name": f"Read the {cls.bulk_name} updated by the bulk request",
+                "method": "GET",
+                "req_data": {**cls.bulk_fields, "descr": updated_descr},
+                "post_test_callable": "is_each_object_read"
+            },
+            *cls.put_tests
+        ]
+        cls.delete_tests = [
+            {
+                "name": f"Delete {cls.bulk_name} in bulk",
+                "req_data_callable": "get_bulk_delete_req_data",
+                "post_test_callable": "is_each_payload_successful",
+                "resp_time": cls.bulk_resp_time
+            },
+            {
+                "name": f"Ensure the {cls.bulk_name} were deleted by the bulk request",
+                "method": "GET",
+                "req_data": {**cls.bulk_fields, "descr": updated_descr},
+                "resp_data_empty": True
+            },
+            *cls.delete_tests
+        ]
+
+    def get_bulk_ids(self):
+        """
+        Obtains the identifiers of the objects returned by the last read. Object IDs are sorted in descending order so
+        deleting the objects in order does not change the IDs of the objects after them.
+        :return: (list) the bulk_id_field value or the ID of each object
+        """
+        # Filtered reads return an object keyed by ID when the matching objects are not the first objects
+        objects = self.last_response.get("data", [])
+        objects = objects if isinstance(objects, dict) else dict(enumerate(objects))
+        if self.bulk_id_field:
+            return [obj[self.bulk_id_field] for obj in objects.values()]
+        return sorted((int(object_id) for object_id in objects), reverse=True)
+
+    def get_bulk_update_req_data(self):
+        """Builds a bulk request that updates the description of each object returned by the last read"""
+        updated_descr = f"Updated {self.bulk_descr}"
+        return {
+            "apply": False,
+            "bulk": [{**self.bulk_fields, "id": obj_id, "descr": updated_descr} for obj_id in self.get_bulk_ids()]
+        }
+
+    def get_bulk_delete_req_data(self):
+        """Builds a bulk request that deletes each object returned by the last read"""
+        return {
+            "apply": self.bulk_apply,
+            "bulk": [{**self.bulk_fields, "id": obj_id} for obj_id in self.get_bulk_ids()]
+        }
+
+    def is_each_payload_successful(self):
+        """Checks that the last bulk response contains a successful response for each of the three payloads"""
+        results = self.last_response.get("data", [])
+        if [result.get("return") for result in results] != [0, 0, 0]:
+            raise AssertionError(f"Expected a successful response for each payload, received {results}")
+
+    def is_invalid_payload_reported(self):
+        """Checks that the last bulk response reports the error of the invalid second payload"""
+        results = self.last_response.get("data", [])
+        if [result.get("return") for result in results] != [0, self.bulk_invalid_return]:
+            raise AssertionError(f"Expected the second payload to be reported as invalid, received {results}")
+
+    def is_each_object_read(self):
+        """Checks that the last read returned each of the three objects of the bulk request"""
+        if len(self.get_bulk_ids()) != 3:
+            raise AssertionError(f"Expected three objects, received {self.last_response.get('data')}")
@@ -0,0 +1,225 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Module containing the fixtures E2E tests may depend on. A fixture is configuration a test needs to exist but does not
+test itself (e.g. a traffic shaper queue used by a firewall rule). Tests declare the fixtures they need in their
+`fixtures` attribute. When a test is run on its own, the test creates its fixtures before its first test and deletes
+them after its last test. When tests are run by run_all_tests.py, each fixture is created once and shared by every
+test that needs it.
+"""
+
+# Each fixture contains the URI to create and delete it with, the request data used to create and delete it, the
+# fixtures it requires and the resource tags (see `resources` in docs/CONTRIBUTING.md) of the configuration it adds.
+FIXTURES = {
+    "wan PRIQ shaper": {
+        "uri": "/api/v1/firewall/traffic_shaper",
+        "requires": [],
+        "resources": ["traffic-shaper"],
+        "create": {
+            "interface": "wan",
+            "scheduler": "PRIQ",
+            "bandwidthtype": "Gb",
+            "bandwidth": 1,
+            "enabled": True,
+            "qlimit": 1000,
+            "tbrconfig": 1000,
+            "apply": True
+        },
+        "delete": {"interface": "wan"}
+    },
+    "lan PRIQ shaper": {
+        "uri": "/api/v1/firewall/traffic_shaper",
+        "requires": [],
+        "resources": ["traffic-shaper"],
+        "create": {
+            "interface": "lan",
+            "scheduler": "PRIQ",
+            "bandwidthtype": "Gb",
+            "bandwidth": 1,
+            "enabled": True,
+            "qlimit": 1000,
+            "tbrconfig": 1000,
+            "apply": True
+        },
+        "delete": {"interface": "lan", "apply": True}
+    },
+    "Test_Altq": {
+        "uri": "/api/v1/firewall/traffic_shaper/queue",
+        "requires": ["wan PRIQ shaper"],
+        "resources": ["traffic-shaper"],
+        "create": {
+            "interface": "wan",
+            "name": "Test_Altq",
+            "priority": 14,
+            "description": "Traffic Shaper Queue E2E test",
+            "default": True
+        },
+        "delete": {"interface": "wan", "name": "Test_Altq"}
+    },
+    "Test_Altq2": {
+        "uri": "/api/v1/firewall/traffic_shaper/queue",
+        "requires": ["wan PRIQ shaper"],
+        "resources": ["traffic-shaper"],
+        "create": {
+            "interface": "wan",
+            "name": "Test_Altq2",
+            "priority": 15,
+            "description": "Traffic Shaper Queue E2E test",
+            "default": False
+        },
+        "delete": {"interface": "wan", "name": "Test_Altq2"}
+    },
+    "Test_Limiter": {
+        "uri": "/api/v1/firewall/traffic_shaper/limiter",
+        "requires": [],
+        "resources": ["traffic-shaper"],
+        "create": {
+            "name": "Test_Limiter",
+            "bandwidth": [{"bw": 100, "bwscale": "Mb"}],
+            "mask": "srcaddress",
+            "maskbits": 31,
+            "description": "E2E test",
+            "aqm": "codel",
+            "sched": "fq_pie",
+            "qlimit": 7000,
+            "delay": 1,
+            "plr": 0.01,
+            "buckets": 16,
+            "ecn": True,
+            "apply": True
+        },
+        "delete": {"name": "Test_Limiter"}
+    },
+    "Test_DNQueue": {
+        "uri": "/api/v1/firewall/traffic_shaper/limiter/queue",
+        "requires": ["Test_Limiter"],
+        "resources": ["traffic-shaper"],
+        "create": {
+            "limiter": "Test_Limiter",
+            "name": "Test_DNQueue",
+            "mask": "srcaddress",
+            "maskbits": 31,
+            "description": "E2E test",
+            "aqm": "codel",
+            "qlimit": 7000,
+            "weight": 1,
+            "plr": 0.01,
+            "buckets": 16,
+            "ecn": True,
+            "apply": True
+        },
+        "delete": {"limiter": "Test_Limiter", "name": "Test_DNQueue"}
+    },
+    "Test_DNQueue2": {
+        "uri": "/api/v1/firewall/traffic_shaper/limiter/queue",
+        "requires": ["Test_Limiter"],
+        "resources": ["traffic-shaper"],
+        "create": {
+            "limiter": "Test_Limiter",
+            "name": "Test_DNQueue2",
+            "mask": "srcaddress",
+            "maskbits": 31,
+            "description": "E2E test",
+            "aqm": "codel",
+            "qlimit": 7000,
+            "weight": 1,
+            "plr": 0.01,
+            "buckets": 16,
+            "ecn": True,
+            "apply": True
+        },
+        "delete": {"limiter": "Test_Limiter", "name": "Test_DNQueue2"}
+    }
+}
+
+
+def resolve_fixtures(names):
+    """
+    Finds every fixture needed by a list of fixtures, including the fixtures they require.
+    :param names: (list) the names of the fixtures needed
+    :return: (list) the names of each needed fixture, ordered so each fixture comes after the fixtures it requires
+    """
+    # Local variables
+    resolved = []
+
+    def resolve(name, path):
+        # Ensure the fixture exists and does not (indirectly) require itself
+        if name not in FIXTURES:
+            raise ValueError(f"Unknown fixture '{name}'")
+        if name in path:
+            raise ValueError(f"Fixture '{name}' requires itself through {' -> '.join(path + [name])}")
+
+        # Add the fixtures this fixture requires before the fixture itself
+        if name not in resolved:
+            for required in FIXTURES[name]["requires"]:
+                resolve(required, path + [name])
+            resolved.append(name)
+
+    for fixture in names:
+        resolve(fixture, [])
+
+    return resolved
+
+
+def get_fixture_resources(names):
+    """
+    Collects the resource tags of a list of fixtures and the fixtures they require.
+    :param names: (list) the names of the fixtures
+    :return: (list) the resource tags of the fixtures
+    """
+    return sorted({resource for name in resolve_fixtures(names) for resource in FIXTURES[name]["resources"]})
+
+
+def create_fixtures(test, names):
+    """
+    Creates fixtures in the order they must be created in. The fixtures they require are not created, use
+    resolve_fixtures() to include them.
+    :param test: (APIE2ETest) the test to make the requests with
+    :param names: (list) the names of the fixtures to create
+    :return: (bool) true if every fixture was created, false otherwise
+    """
+    # Local variables
+    created = True
+
+    for name in [fixture for fixture in resolve_fixtures(names) if fixture in names]:
+        test_params = {
+            "name": f"Create fixture '{name}'",
+            "uri": FIXTURES[name]["uri"],
+            "req_data": dict(FIXTURES[name]["create"])
+        }
+        created = test.make_request("POST", test_params) is not None and created
+
+    return created
+
+
+def delete_fixtures(test, names):
+    """
+    Deletes fixtures in the reverse order they must be created in. The fixtures they require are not deleted, use
+    resolve_fixtures() to include them.
+    :param test: (APIE2ETest) the test to make the requests with
+    :param names: (list) the names of the fixtures to delete
+    :return: (bool) true if every fixture was deleted, false otherwise
+    """
+    # Local variables
+    deleted = True
+
+    for name in reversed([fixture for fixture in resolve_fixtures(names) if fixture in names]):
+        test_params = {
+            "name": f"Delete fixture '{name}'",
+            "uri": FIXTURES[name]["uri"],
+            "req_data": dict(FIXTURES[name]["delete"])
+        }
+        deleted = test.make_request("DELETE", test_params) is not None and deleted
+
+    return deleted
@@ -14,7 +14,21 @@
 """Tool functions for E2E testing."""
 import datetime
 import ipaddress
+import json
+import math
+import os
+import pathlib
 import random
+import re
+import tempfile
+
+# Constants
+PKG_FILES_DIR = pathlib.Path(__file__).absolute().parents[2].joinpath("pfSense-pkg-API", "files")
+API_RESPONSE_PATH = PKG_FILES_DIR.joinpath("etc", "inc", "api", "framework", "APIResponse.inc")
+API_RESPONSE_REGEX = re.compile(
+    r'(\d+) => \[\s*"status" => "(?P<status>[^"]*)",\s*"code" => (?P<code>\d+),\s*"return" => \1,'
+    r'\s*"message" => "(?P<message>(?:[^"\\]|\\.)*)"'
+)
 
 
 def generate_random_future_date():
@@ -78,38 +92,178 @@ def parse_ifconfig(ifconfig_out: str):
     return ifconfig_dict
 
 
-def is_if_in_ifconfig(ifconfig_out: str, iface: str, ipaddr: str, bitmask: int, vhid=None):
+class IfconfigSnapshot:
+    """
+    Structured snapshot of the ifconfig output of each interface. The output is parsed once when the snapshot is
+    created so the addresses, flags and CARP settings of each interface can be checked without parsing it again.
+    """
+    # Regular expressions used to parse ifconfig lines
+    FLAGS_REGEX = re.compile(r"flags=\w+<(?P<flags>[^>]*)>")
+    ADDRESS_REGEX = re.compile(r"^(?P<family>inet6?) (?P<address>[^\s%]+)\S* (?:netmask|prefixlen) (?P<prefix>\S+)")
+    VHID_REGEX = re.compile(r" vhid (?P<vhid>\d+)")
+    CARP_REGEX = re.compile(r"^carp: \S+ vhid (?P<vhid>\d+) advbase (?P<advbase>\d+) advskew (?P<advskew>\d+)")
+
+    def __init__(self, ifconfig_out: str):
+        """
+        Parses the ifconfig output into a snapshot.
+        :param ifconfig_out: the ifconfig output to parse
+        """
+        self.ifconfig_out = ifconfig_out
+        self.addresses = {}
+        self.flags = {}
+        self.carp = {}
+        self.__networks = {}
+        self.__ips = set()
+        self.__vhids = set()
+
+        # Loop through each line of the ifconfig, lines that do not start with a tab start a new interface
+        iface = ""
+        for line in ifconfig_out.split("\n"):
+            if not line.startswith("\t"):
+                iface = line.split(":", maxsplit=1)[0]
+                match = self.FLAGS_REGEX.search(line)
+                self.flags[iface] = set(match.group("flags").split(",")) if match else set()
+                self.addresses[iface] = set()
+                self.carp[iface] = set()
+                self.__networks[iface] = set()
+            else:
+                self.__parse_line(iface, line.replace("\t", ""))
+
+    def __parse_line(self, iface: str, line: str):
+        """
+        Parses an address or CARP line of an interface into the snapshot.
+        :param iface: the interface the line belongs to
+        :param line: the ifconfig line to parse
+        """
+        address_match = self.ADDRESS_REGEX.match(line)
+        carp_match = self.CARP_REGEX.match(line)
+        vhid_match = self.VHID_REGEX.search(line)
+        vhid = int(vhid_match.group("vhid")) if vhid_match else None
+
+        # Capture addresses as (family, address, prefix, vhid) with the prefix converted to a bit count
+        if address_match:
+            address = ipaddress.ip_address(address_match.group("address"))
+            prefix = address_match.group("prefix")
+            prefix = bin(int(prefix, 16)).count("1") if prefix.startswith("0x") else int(prefix)
+            self.addresses[iface].add((address_match.group("family"), address.compressed, prefix, vhid))
+            self.__networks[iface].add((address_match.group("family"), address.compressed, prefix))
+            self.__ips.add(address.compressed)
+        # Capture CARP settings as (vhid, advbase, advskew)
+        elif carp_match:
+            self.carp[iface].add(tuple(int(value) for value in carp_match.groups()))
+
+        if vhid:
+            self.__vhids.add(vhid)
+
+    def has_address(self, iface: str, ipaddr: str, bitmask: int, vhid=None):
+        """
+        Checks if an interface has an address.
+        :param iface: the interface expected to have the address
+        :param ipaddr: the IPv4 or IPv6 address
+        :param bitmask: the bitmask of the address's network
+        :param vhid: optionally check if the address has this vhid, ignores otherwise
+        :return: True if the interface has the address, False otherwise
+        """
+        address = ipaddress.ip_address(f"{ipaddr}")
+        family = "inet" if address.version == 4 else "inet6"
+
+        if vhid:
+            return (family, address.compressed, int(bitmask), int(vhid)) in self.addresses.get(iface, set())
+
+        return (family, address.compressed, int(bitmask)) in self.__networks.get(iface, set())
+
+    def has_ip(self, ipaddr: str):
+        """
+        Checks if any interface has an IP address, regardless of its bitmask or vhid.
+        :param ipaddr: the IPv4 or IPv6 address
+        :return: True if any interface has the IP address, False otherwise
+        """
+        return ipaddress.ip_address(f"{ipaddr}").compressed in self.__ips
+
+    def has_vhid(self, vhid: int):
+        """
+        Checks if any interface has an address with a vhid.
+        :param vhid: the vhid to check for
+        :return: True if any address has the vhid, False otherwise
+        """
+        return int(vhid) in self.__vhids
+
+    def diff(self, other):
+        """
+        Compares this snapshot to a later snapshot to find the addresses that changed between them.
+        :param other: (IfconfigSnapshot) the later snapshot
+        :return: a tuple containing sets of the added and removed addresses as (iface, family, address, prefix, vhid)
+        """
+        before = {(iface,) + address for iface, addresses in self.addresses.items() for address in addresses}
+        after = {(iface,) + address for iface, addresses in other.addresses.items() for address in addresses}
+        return after - before, before - after
+
+
+def is_if_in_ifconfig(ifconfig_out, iface: str, ipaddr: str, bitmask: int, vhid=None):
     """
     Checks if a specific interface configuration is present in ifconfig
     :param iface: the interface expected to host this configuration
-    :param ifconfig_out: the ifconfig output to check against
+    :param ifconfig_out: the ifconfig output or IfconfigSnapshot to check against. Pass a snapshot when checking
+    many configurations so the ifconfig output is only parsed once.
     :param ipaddr: the IPv4 or IPv6 (depending on the inet_type) of the network
     :param bitmask: the bitmask of the network
     :param vhid: optionally check if the interface has a vhid, ignores otherwise
-    :return: a string containing the ifconfig line expected from the network details
+    :return: True if the interface has this configuration, False otherwise
     """
-    # Local variables
-    ifconfig = parse_ifconfig(ifconfig_out)
-    ipaddr = ipaddress.ip_address(f"{ipaddr}")
-    subnet = ipaddress.ip_network(f"{ipaddr}/{bitmask}", strict=False)
-
-    # Set the expected string for a IPv4 network
-    if ipaddr.version == 4:
-        ifconfig_line = f"inet {ipaddr} netmask {bits_to_hex(bitmask)} broadcast {subnet.broadcast_address}"
-    # Set the expected string for a IPv6 network
-    elif ipaddr.version == 6:
-        ifconfig_line = f"inet6 {ipaddr.compressed} prefixlen {bitmask}"
-    # Otherwise, our network details are invalid raise an error
-    else:
-        raise ValueError("Invalid IP address specified")
-
-    # Check for the VHID if requested
-    if vhid:
-        ifconfig_line = f"{ifconfig_line} vhid {vhid}"
-
-    # Check if this line is in ifconfig
-    if ifconfig_line in ifconfig.get(iface, []):
-        return True
-
-    # Return false if not match was found
-    return False
+    # Parse the ifconfig output if a snapshot was not given
+    if not isinstance(ifconfig_out, IfconfigSnapshot):
+        ifconfig_out = IfconfigSnapshot(ifconfig_out)
+
+    return ifconfig_out.has_address(iface, ipaddr, bitmask, vhid)
+
+
+def parse_api_responses(api_response_path=API_RESPONSE_PATH):
+    """
+    Parses the response library in APIResponse.inc into a dictionary so API return codes can be checked and replicated
+    without a pfSense instance.
+    :param api_response_path: the path to APIResponse.inc, defaults to the APIResponse.inc in this repository
+    :return: a dictionary of API return codes mapped to dictionaries containing the response's status, code and message
+    """
+    # Read the response library and capture each response definition
+    api_response = pathlib.Path(api_response_path).read_text(encoding="utf-8")
+    return {
+        int(match.group(1)): {
+            "status": match.group("status"),
+            "code": int(match.group("code")),
+            "message": match.group("message")
+        }
+        for match in API_RESPONSE_REGEX.finditer(api_response)
+    }
+
+
+def percentile(values: list, pct: float):
+    """
+    Calculates a percentile of a list of values using the nearest-rank method.
+    :param values: a list of numbers
+    :param pct: the percentile to calculate (e.g. 95 for the 95th percentile)
+    :return: the value at the given percentile, or None if there are no values
+    """
+    # Return None if there are no values to calculate a percentile for
+    if not values:
+        return None
+
+    values = sorted(values)
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def write_json_atomic(path: str, data):
+    """
+    Writes JSON to a file by replacing it, so other processes never read a partial write. Each call writes to its own
+    temporary file, so threads and processes writing the same file at once do not collide.
+    :param path: the path of the file to write
+    :param data: the data to write as JSON
+    """
+    # Create the temporary file next to the file so it can be renamed over it, mkstemp() only allows this user access
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with open(tmp_fd, "w", encoding="utf-8") as tmp:
+            json.dump(data, tmp)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
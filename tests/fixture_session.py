@@ -0,0 +1,41 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script used by run_all_tests.py to create or delete the fixtures shared by the tests in a run. This accepts the same
+arguments as the E2E tests, preceded by the action to take and the fixtures to take it on. For example:
+python3 tests/fixture_session.py create --fixture Test_Limiter --host 192.168.1.1
+"""
+import argparse
+import sys
+
+import e2e_test_framework
+from e2e_test_framework.fixtures import FIXTURES, create_fixtures, delete_fixtures
+
+# Read this script's arguments and leave the remaining arguments for the E2E test framework
+parser = argparse.ArgumentParser(add_help=False)
+parser.add_argument("action", choices=["create", "delete"])
+parser.add_argument("--fixture", dest="fixtures", action="append", choices=list(FIXTURES), required=True)
+SESSION_ARGS, sys.argv[1:] = parser.parse_known_args()
+
+
+class APIE2ETestFixtureSession(e2e_test_framework.APIE2ETest):
+    """Class used to create or delete the fixtures shared by the tests in a run of run_all_tests.py."""
+    def custom_tests(self):
+        if SESSION_ARGS.action == "create":
+            create_fixtures(self, SESSION_ARGS.fixtures)
+        else:
+            delete_fixtures(self, SESSION_ARGS.fixtures)
+
+
+APIE2ETestFixtureSession()
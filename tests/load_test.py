@@ -0,0 +1,328 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script that load tests pfSense-API by replaying the GET tests of the E2E tests at a target request rate. Each target
+rate is run for a set duration and its throughput, error rate and latency histogram are reported so the rate at which
+endpoints start to degrade can be found.
+"""
+import argparse
+import ast
+import concurrent.futures
+import itertools
+import json
+import pathlib
+import re
+import sys
+import time
+import types
+
+import requests
+import urllib3
+
+from e2e_test_framework import APIE2ETest
+from e2e_test_framework.tools import percentile
+
+# Disable insecure request warnings as they cause a lot of noise in the output.
+urllib3.disable_warnings(category=urllib3.exceptions.InsecureRequestWarning)
+
+# Constants
+TESTS_DIR = pathlib.Path(__file__).parent.absolute()
+HISTOGRAM_BUCKETS = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+PERCENTILES = [50, 95, 99]
+
+
+def load_test_classes(test):
+    """
+    Imports the APIE2ETest classes of a test without running the test. Test modules create an instance of their test
+    class when imported, so module level expressions are removed before the module is run.
+    :param test: (string) the filename of the test within the tests directory
+    :return: (list) the APIE2ETest subclasses defined by the test
+    """
+    # Parse the test and remove module level expressions such as `APIE2ETestFirewallRule()`
+    tree = ast.parse(TESTS_DIR.joinpath(test).read_text(encoding="utf-8"))
+    tree.body = [node for node in tree.body if not isinstance(node, ast.Expr) or isinstance(node.value, ast.Constant)]
+
+    # Run the remaining module code and capture the test classes it defines
+    module = types.ModuleType(test[:-3])
+    exec(compile(tree, str(TESTS_DIR.joinpath(test)), "exec"), module.__dict__)    # pylint: disable=exec-used
+    return [
+        obj for obj in module.__dict__.values()
+        if isinstance(obj, type) and issubclass(obj, APIE2ETest) and obj is not APIE2ETest
+    ]
+
+
+def load_requests(uri_filter):
+    """
+    Collects the GET tests of every E2E test that can be replayed without a test instance.
+    :param uri_filter: (string) a regular expression the URI of each test must match
+    :return: (list) a tuple containing the URI, request data and expected status of each request to replay
+    """
+    # Local variables
+    tests = sorted(test.name for test in TESTS_DIR.glob("test*.py"))
+    replay = []
+
+    for test_class in itertools.chain.from_iterable(load_test_classes(test) for test in tests):
+        for test_params in test_class.get_tests:
+            # Skip tests that change the method or depend on callables run by a test instance
+            if test_params.get("method", "GET") != "GET" or "req_data_callable" in test_params:
+                continue
+
+            uri = test_params.get("uri", test_class.uri)
+            if re.search(uri_filter, uri):
+                replay.append((uri, test_params.get("req_data", {}), test_params.get("status", 200)))
+
+    return replay
+
+
+def send_request(session, args, request, scheduled):
+    """
+    Sends a single request to replay.
+    :param session: (requests.Session) the session to send the request with
+    :param args: (argparse.Namespace) the parsed command line arguments
+    :param request: (tuple) the URI, request data and expected status of the request
+    :param scheduled: (float) the time.perf_counter() time the request was due to be sent at
+    :return: (tuple) the URI, the request's latency and service time in seconds and whether the request failed. The
+    latency is measured from the scheduled time, so it includes the time the request waited for a free worker.
+    """
+    # Local variables
+    uri, req_data, status = request
+    sent = time.perf_counter()
+
+    try:
+        resp = session.get(
+            f"{args.scheme}://{args.host}:{args.port}{uri}",
+            data=json.dumps(req_data),
+            verify=False,
+            timeout=args.timeout
+        )
+        failed = resp.status_code != status
+    except requests.exceptions.RequestException:
+        failed = True
+
+    end = time.perf_counter()
+    return uri, end - scheduled, end - sent, failed
+
+
+def run_step(session, args, replay, rate):
+    """
+    Replays requests at a target rate for the duration given by --duration. Requests are scheduled at the target rate
+    whether or not earlier requests have responded, so slow responses queue up requests instead of lowering the rate.
+    The step is stopped early if more than --max_backlog requests are waiting to be sent or to respond.
+    :param session: (requests.Session) the session to send requests with
+    :param args: (argparse.Namespace) the parsed command line arguments
+    :param replay: (list) the requests to replay, these are sent in a loop
+    :param rate: (float) the target number of requests per second, or 0 to send requests as fast as possible
+    :return: (tuple) the results of each request, the seconds it took to send and receive every request, the largest
+    number of outstanding requests and whether the step was stopped early because of its backlog
+    """
+    # Local variables
+    futures = []
+    pending = set()
+    max_backlog = 0
+    stopped = False
+    requests_iter = itertools.cycle(replay)
+    start = time.perf_counter()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        while time.perf_counter() - start < args.duration:
+            # Wait for the next request to be due at the target rate, its latency is measured from when it was due
+            if rate:
+                scheduled = start + len(futures) / rate
+                time.sleep(max(0.0, scheduled - time.perf_counter()))
+            # Otherwise, only queue one request per worker so requests are sent as fast as the workers allow
+            else:
+                if len(pending) >= args.concurrency:
+                    _, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                scheduled = time.perf_counter()
+
+            # Stop the step if the target rate outpaces the responses for too long, the backlog would grow without end
+            pending = {future for future in pending if not future.done()}
+            max_backlog = max(max_backlog, len(pending))
+            if len(pending) >= args.max_backlog:
+                stopped = True
+                break
+
+            futures.append(executor.submit(send_request, session, args, next(requests_iter), scheduled))
+            pending.add(futures[-1])
+
+    return [future.result() for future in futures], time.perf_counter() - start, max_backlog, stopped
+
+
+def print_step(rate, results, elapsed, max_backlog, stopped):
+    """Prints the throughput, error rate, backlog, latency percentiles and latency histogram of a step."""
+    # Local variables
+    latencies = [latency for _, latency, _, _ in results]
+    service_times = [service_time for _, _, service_time, _ in results]
+    errors = sum(failed for _, _, _, failed in results)
+    target = f"{rate:g} req/s" if rate else "unlimited"
+
+    print("------------------------------------------------------------------------")
+
+    # There is nothing to report if no requests were sent, e.g. when the duration is shorter than the first interval
+    if not results:
+        print(f"Target rate: {target}, no requests were sent")
+        return
+
+    print(
+        f"Target rate: {target}, achieved: {len(results) / elapsed:.1f} req/s over {len(results)} requests\n"
+        f"Error rate: {errors / len(results):.1%} ({errors} errors)\n"
+        f"Backlog: up to {max_backlog} outstanding requests{', stopped early at --max_backlog' if stopped else ''}"
+    )
+    print("Latency: " + ", ".join(f"p{pct} {percentile(latencies, pct):.3f}s" for pct in PERCENTILES))
+    print("Service time: " + ", ".join(f"p{pct} {percentile(service_times, pct):.3f}s" for pct in PERCENTILES))
+
+    # Print the latency histogram
+    lower = 0
+    for upper in HISTOGRAM_BUCKETS + [float("inf")]:
+        count = sum(lower <= latency < upper for latency in latencies)
+        print(f"  {f'{lower:g}-{upper:g}s':>12} {count:>7} {'#' * round(50 * count / len(latencies))}")
+        lower = upper
+
+    # Print the latency percentiles of each endpoint
+    for uri in sorted({uri for uri, _, _, _ in results}):
+        uri_latencies = [latency for result_uri, latency, _, _ in results if result_uri == uri]
+        print(f"  {uri:<60} " + " ".join(f"p{pct} {percentile(uri_latencies, pct):.3f}s" for pct in PERCENTILES))
+
+
+def add_connection_args(parser):
+    """
+    Adds the arguments used to connect and authenticate to pfSense-API to an argument parser.
+    :param parser: (argparse.ArgumentParser) the parser to add the arguments to
+    """
+    parser.add_argument('--host', dest="host", type=str, required=True, help="The host to connect to")
+    parser.add_argument('--port', dest="port", type=int, default=443, help="The port to use when connecting")
+    parser.add_argument(
+        '--scheme',
+        dest="scheme",
+        type=str,
+        choices=["http", "https"],
+        default="https",
+        help="The URL scheme to use when connecting"
+    )
+    parser.add_argument(
+        '--auth_mode',
+        dest="auth_mode",
+        type=str,
+        choices=["local", "token", "jwt"],
+        default="local",
+        help="The API authentication mode to use."
+    )
+    parser.add_argument('--username', dest="username", type=str, default="admin", help="Username to authenticate as.")
+    parser.add_argument(
+        '--password',
+        dest="password",
+        type=str,
+        default="pfsense",
+        help="Password to authenticate with"
+    )
+    parser.add_argument('--timeout', dest="timeout", type=int, default=30, help="Connection timeout limit in seconds")
+
+
+def start_session(args, pool_size):
+    """
+    Starts the HTTP session used to send every request and authenticates it.
+    :param args: (argparse.Namespace) the parsed command line arguments
+    :param pool_size: (int) the maximum number of connections to keep open to the host
+    :return: (requests.Session) the authenticated session
+    """
+    # Local variables
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Authenticate using local database authentication
+    if args.auth_mode == "local":
+        session.auth = (args.username, args.password)
+    # Authenticate using a single JWT that is shared by every request
+    elif args.auth_mode == "jwt":
+        resp = session.post(
+            f"{args.scheme}://{args.host}:{args.port}/api/v1/access_token",
+            auth=(args.username, args.password),
+            verify=False,
+            timeout=args.timeout
+        )
+
+        # Exit if a JWT could not be obtained, every request would fail authentication
+        if resp.json().get("return") != 0:
+            print(f"Failed to obtain JWT: {resp.json().get('message')}")
+            sys.exit(1)
+        session.headers["Authorization"] = "Bearer " + resp.json()["data"]["token"]
+    # Authenticate using API token authentication
+    else:
+        session.headers["Authorization"] = args.username + " " + args.password
+
+    return session
+
+
+def main():
+    """Runs the load test at each target rate."""
+    parser = argparse.ArgumentParser(description="Replay the GET tests of the E2E tests at a target request rate.")
+    add_connection_args(parser)
+    parser.add_argument(
+        '--uri',
+        dest="uri",
+        type=str,
+        default="",
+        help="A regular expression that the URI of each replayed test must match (e.g. '^/api/v1/status/')"
+    )
+    parser.add_argument(
+        '--rate',
+        dest="rate",
+        type=float,
+        nargs="+",
+        default=[0],
+        help="The target requests per second to run at, give multiple rates to step through them. 0 is unlimited."
+    )
+    parser.add_argument(
+        '--concurrency',
+        dest="concurrency",
+        type=int,
+        default=10,
+        help="The maximum number of requests to send at once"
+    )
+    parser.add_argument(
+        '--duration',
+        dest="duration",
+        type=float,
+        default=30,
+        help="The number of seconds to run each target rate for"
+    )
+    parser.add_argument(
+        '--max_backlog',
+        dest="max_backlog",
+        type=int,
+        default=1000,
+        help="The number of outstanding requests at which a target rate is stopped early"
+    )
+    args = parser.parse_args()
+    replay = load_requests(args.uri)
+
+    # Exit if there are no tests to replay
+    if not replay:
+        print(f"No GET tests matched URI filter '{args.uri}'")
+        sys.exit(1)
+
+    # Run and report each target rate
+    print(f"Replaying {len(replay)} GET tests at a concurrency of {args.concurrency}")
+    session = start_session(args, args.concurrency)
+    try:
+        for rate in args.rate:
+            print_step(rate, *run_step(session, args, replay, rate))
+    except KeyboardInterrupt:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,557 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script that runs a local stand-in for pfSense-API. Endpoints, methods and privileges are generated from the OpenAPI
+documentation and responses from APIResponse.inc. Objects are stored in memory and are not validated, so this is
+intended for developing and benchmarking the E2E test framework, not for testing the API itself.
+"""
+import argparse
+import base64
+import binascii
+import concurrent.futures
+import copy
+import hashlib
+import hmac
+import http.server
+import ipaddress
+import json
+import random
+import re
+import secrets
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import yaml
+
+from e2e_test_framework.tools import PKG_FILES_DIR, parse_api_responses
+
+# Constants
+OPENAPI_PATH = PKG_FILES_DIR.joinpath("usr", "local", "www", "api", "documentation", "openapi.yml")
+PRIVILEGES_REGEX = re.compile(r"privileges:_ \[(.*?)\]")
+AUTH_MODES = ["local", "token", "jwt"]
+SYNC_TIMEOUT = 10
+
+
+def parse_endpoints(openapi_path=OPENAPI_PATH):
+    """
+    Parses the OpenAPI documentation into the endpoints the mock API will answer.
+    :param openapi_path: the path to the OpenAPI documentation, defaults to the openapi.yml in this repository
+    :return: a dictionary of (uri, method) tuples mapped to the privileges and auth modes allowed for the endpoint
+    """
+    # Local variables
+    with open(openapi_path, "r", encoding="utf-8") as openapi_file:
+        openapi = yaml.safe_load(openapi_file)
+    endpoints = {}
+
+    # Loop through each path and method and capture the privileges and auth modes it allows
+    for uri, methods in openapi["paths"].items():
+        for method, operation in methods.items():
+            privileges = PRIVILEGES_REGEX.search(operation.get("description", ""))
+            security = operation.get("security", openapi.get("security", []))
+            endpoints[(uri, method.upper())] = {
+                "privileges": re.findall(r"`([^`]+)`", privileges.group(1)) if privileges else [],
+                "auth_modes": [mode for scheme in security for mode in scheme]
+            }
+
+    return endpoints
+
+
+def form_decode(query):
+    """
+    Decodes boolean query string values the same way APITools\\form_decode() does.
+    :param query: the parsed query string
+    :return: the query string with `true` and `false` values decoded to booleans
+    """
+    return {key: {"true": True, "false": False}.get(value, value) for key, value in query.items()}
+
+
+class MockAPI:    # pylint: disable=too-many-instance-attributes  # Mirrors each part of the API's state
+    """In-memory stand-in for pfSense-API's framework, authentication, authorization and config storage."""
+    def __init__(self, latency=0.0, jitter=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.scheme = "http"
+        self.endpoints = parse_endpoints()
+        self.responses = parse_api_responses()
+        self.lock = threading.Lock()
+        self.server_key = secrets.token_bytes(32)
+        self.api_config = {"authmode": "local", "jwt_exp": 3600, "readonly": False, "access_list": []}
+        self.users = {"admin": {"password": "pfsense", "priv": ["page-all"], "scope": "system"}}
+        self.tokens = {}
+        self.config = {}
+
+    def get_response(self, return_code, data=None):
+        """
+        Formats an API response the same way APIResponse\\get() does.
+        :param return_code: the API return code of the response
+        :param data: the response data
+        :return: a dictionary containing the API response
+        """
+        response = self.responses.get(return_code, self.responses[1])
+        return {
+            "status": response["status"],
+            "code": response["code"],
+            "return": return_code if return_code in self.responses else 1,
+            "message": response["message"],
+            "data": [] if data is None else data
+        }
+
+    def handle(self, method, uri, headers, client_ip, req_data):    # pylint: disable=too-many-arguments
+        """
+        Answers an API request.
+        :param method: the HTTP method of the request
+        :param uri: the URI of the request, without the query string
+        :param headers: the HTTP request headers
+        :param client_ip: the IP address of the client
+        :param req_data: the request data
+        :return: the API response, or None if the URI is not an API endpoint
+        """
+        # Inject latency to simulate the time pfSense takes to answer requests
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        # Only answer requests for documented endpoints and methods
+        if not any(endpoint_uri == uri for endpoint_uri, _ in self.endpoints):
+            return None
+        if (uri, method) not in self.endpoints:
+            return self.get_response(2)
+
+        # Authenticate and authorize the client if the endpoint requires it, the users and settings are shared state
+        endpoint = self.endpoints[(uri, method)]
+        username = None
+        if endpoint["auth_modes"]:
+            with self.lock:
+                auth_mode = self.api_config["authmode"] if len(endpoint["auth_modes"]) > 1 else "local"
+                username = self.authenticate(auth_mode, headers.get("Authorization", ""))
+                privileges = endpoint["privileges"]
+                authorized = username is not None and self.authorize(method, username, client_ip, privileges)
+            if username is None:
+                return self.get_response(3)
+            if not authorized:
+                return self.get_response(4)
+
+        # Bypass the action if requested
+        if req_data.get("_action_bypass") is True:
+            return self.get_response(15)
+
+        return self.action(method, uri, username, req_data)
+
+    def authenticate(self, auth_mode, authorization):
+        """
+        Authenticates the client the same way APIAuth::authenticate() does.
+        :param auth_mode: the auth mode to authenticate with
+        :param authorization: the Authorization header of the request
+        :return: the authenticated username, or None if authentication failed
+        """
+        # Local variables
+        auth_type, _, credentials = authorization.partition(" ")
+        username = None
+
+        # Authenticate using local database authentication
+        if auth_mode == "local" and auth_type == "Basic":
+            # Fail authentication if the credentials are not valid base64 encoded text
+            try:
+                username, _, password = base64.b64decode(credentials).decode().partition(":")
+            except (binascii.Error, UnicodeDecodeError):
+                return None
+            username = username if self.users.get(username, {}).get("password") == password else None
+        # Authenticate using JWT authentication
+        elif auth_mode == "jwt" and auth_type == "Bearer":
+            username = self.decode_jwt(credentials)
+        # Authenticate using API token authentication
+        elif auth_mode == "token":
+            username = bytes.fromhex(auth_type).decode() if credentials in self.tokens.get(auth_type, []) else None
+
+        return username if username in self.users else None
+
+    def authorize(self, method, username, client_ip, privileges):
+        """
+        Authorizes the client the same way APIAuth::authorize() does.
+        :param method: the HTTP method of the request
+        :param username: the authenticated username
+        :param client_ip: the IP address of the client
+        :param privileges: the privileges that authorize the endpoint
+        :return: true if the client is authorized, false otherwise
+        """
+        # If no require privileges were given, assume call is always authorized
+        if not privileges:
+            return True
+
+        # Check that client's IP is authorized
+        access_list = self.api_config["access_list"]
+        if access_list and not any(ipaddress.ip_address(client_ip) in ipaddress.ip_network(net) for net in access_list):
+            return False
+
+        # If API is in readonly mode, only allow GET requests
+        if self.api_config["readonly"] and method != "GET":
+            return False
+
+        return bool(set(privileges).intersection(self.users[username]["priv"]))
+
+    def create_jwt(self, username):
+        """Creates a HS256 JWT for a user with the same claims as APITools\\create_jwt()."""
+        # Local variables
+        now = int(time.time())
+        header = {"typ": "JWT", "alg": "HS256"}
+        payload = {"iss": "pfSense", "aud": "pfSense", "exp": now + self.api_config["jwt_exp"], "nbf": now}
+        payload["data"] = username
+        segments = [
+            base64.urlsafe_b64encode(json.dumps(segment).encode()).decode().rstrip("=") for segment in [header, payload]
+        ]
+
+        # Sign the token with the mock server's key
+        signature = hmac.new(self.server_key, ".".join(segments).encode(), hashlib.sha256).digest()
+        return ".".join(segments + [base64.urlsafe_b64encode(signature).decode().rstrip("=")])
+
+    def decode_jwt(self, token):
+        """
+        Verifies a JWT created by create_jwt().
+        :param token: the JWT to verify
+        :return: the username the JWT belongs to, or None if the JWT is invalid or expired
+        """
+        try:
+            header, payload, signature = token.split(".")
+            expected = hmac.new(self.server_key, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+            payload = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except ValueError:
+            return None
+
+        # Ensure the signature is valid and the token has not expired
+        if hmac.compare_digest(base64.urlsafe_b64encode(expected).decode().rstrip("="), signature):
+            if payload["nbf"] <= time.time() < payload["exp"]:
+                return payload["data"]
+
+        return None
+
+    def action(self, method, uri, username, req_data):
+        """
+        Runs the action for a valid API request. Endpoints that the E2E framework depends on behave like the real
+        API, every other endpoint simply stores its objects in memory.
+        :param method: the HTTP method of the request
+        :param uri: the URI of the request
+        :param username: the authenticated username
+        :param req_data: the request data
+        :return: the API response
+        """
+        # Run shell commands as no-ops
+        if uri == "/api/v1/diagnostics/command_prompt" and "shell_cmds" in req_data:
+            cmd_outputs = [{"shell_cmd": cmd, "cmd_output": "", "exit_code": 0} for cmd in req_data["shell_cmds"]]
+            return self.get_response(0, {"cmd_outputs": cmd_outputs})
+        if uri == "/api/v1/diagnostics/command_prompt":
+            return self.get_response(0, {"cmd_output": ""})
+
+        # Sync the API configuration to the HA sync hosts, this waits on the network so it must not hold the lock
+        if uri == "/api/v1/system/api/sync" and method == "POST":
+            return self.get_response(0, self.sync())
+
+        # Every other action reads or changes shared state. Copy the response so another request cannot change it
+        # while it is being encoded.
+        with self.lock:
+            return copy.deepcopy(self.state_action(method, uri, username, req_data))
+
+    def state_action(self, method, uri, username, req_data):    # pylint: disable=too-many-return-statements
+        """
+        Runs the action for a valid API request that reads or changes the shared state. This must hold the lock.
+        :param method: the HTTP method of the request
+        :param uri: the URI of the request
+        :param username: the authenticated username
+        :param req_data: the request data
+        :return: the API response
+        """
+        # Provide the access tokens used for JWT and API token authentication
+        if uri == "/api/v1/access_token":
+            if self.api_config["authmode"] == "jwt":
+                return self.get_response(0, {"token": self.create_jwt(username)})
+            if self.api_config["authmode"] == "token":
+                client_id = username.encode().hex()
+                client_token = secrets.token_hex(16)
+                self.tokens.setdefault(client_id, []).append(client_token)
+                return self.get_response(0, {"client-id": client_id, "client-token": client_token})
+            return self.get_response(9)
+
+        # Manage the users the E2E framework uses to test privileges
+        if uri == "/api/v1/user" and method in ["POST", "PUT", "DELETE"]:
+            return self.user_action(method, req_data)
+
+        # Apply changes to the API configuration, including the auth mode
+        if uri == "/api/v1/system/api" and method == "PUT":
+            if req_data.get("authmode", self.api_config["authmode"]) not in AUTH_MODES:
+                return self.get_response(1025)
+            self.api_config.update({key: req_data[key] for key in self.api_config if key in req_data})
+
+        # Read, hash or replace every object stored by the mock API as the entire configuration
+        if uri == "/api/v1/system/config":
+            return self.system_config_action(method, req_data)
+
+        return self.config_action(method, uri, req_data)
+
+    def system_config_action(self, method, req_data):
+        """Reads, hashes or replaces the entire configuration the same way the /api/v1/system/config endpoint does."""
+        if method == "PUT":
+            self.config = json.loads(json.dumps(req_data))
+        elif not isinstance(req_data.get("hash", False), bool):
+            return self.get_response(1106)
+        elif req_data.get("hash", False):
+            return self.get_response(0, {"hash": hashlib.sha256(json.dumps(self.config).encode()).hexdigest()})
+
+        return self.get_response(0, self.config)
+
+    def sync(self):
+        """
+        Syncs the stored API settings to every HA sync host at once the same way APITools\\sync() does.
+        :return: the sync report
+        """
+        # Local variables
+        with self.lock:
+            settings = copy.deepcopy((self.config.get("/api/v1/system/api") or [{}])[0])
+        hosts = settings.get("hasync_hosts") or []
+        report = {"enabled": settings.get("hasync") is True, "elapsed": 0, "nodes": []}
+
+        # Only perform sync when HA Sync is enabled
+        if report["enabled"] and hosts:
+            start = time.perf_counter()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+                report["nodes"] = list(executor.map(lambda node: self.sync_node(node, settings), hosts))
+            report["elapsed"] = round(time.perf_counter() - start, 3)
+
+        return report
+
+    def sync_node(self, node, settings):
+        """
+        Syncs the API settings to an HA sync host and reports its outcome the same way APITools\\sync() does.
+        :param node: the HA sync host, optionally followed by a port
+        :param settings: the API settings to sync
+        :return: the node's outcome for the sync report
+        """
+        # Local variables
+        credentials = f"{settings.get('hasync_username')}:{settings.get('hasync_password')}"
+        request = urllib.request.Request(
+            f"{self.scheme}://{node}/api/v1/system/api/sync",
+            data=json.dumps(settings).encode(),
+            headers={"Authorization": "Basic " + base64.b64encode(credentials.encode()).decode()},
+            method="PUT"
+        )
+        context = ssl._create_unverified_context()    # pylint: disable=protected-access  # Nodes use self-signed certs
+        start = time.perf_counter()
+        return_code = None
+
+        # Make the API request to sync configuration, error responses still contain the node's return code
+        try:
+            with urllib.request.urlopen(request, timeout=SYNC_TIMEOUT, context=context) as resp:
+                body = resp.read()
+        except urllib.error.HTTPError as exc:
+            body = exc.read()
+        except OSError as exc:
+            body = None
+            message = f"No response received from node ({exc})"
+
+        # Check the outcome of the sync the same way APITools\\sync() does
+        if body is not None:
+            try:
+                return_code = json.loads(body).get("return")
+            except (ValueError, AttributeError):
+                return_code = None
+            message = {
+                None: "Received unexpected response",
+                0: "Synced API configuration",
+                3: "Authentication failure",
+                4: "Authorization failure"
+            }.get(return_code, f"Received return code {return_code}")
+
+        return {
+            "node": node,
+            "synced": return_code == 0,
+            "return": return_code,
+            "message": message,
+            "latency": round(time.perf_counter() - start, 3)
+        }
+
+    def user_action(self, method, req_data):
+        """Creates, updates or deletes a local user the same way the /api/v1/user endpoint does."""
+        # Local variables
+        username = req_data.get("username")
+        usernames = username if isinstance(username, list) else [username]
+
+        # Check for our required `username` payload value, only deletes accept a list of usernames
+        if username is None or (method != "DELETE" and not isinstance(username, str)):
+            return self.get_response(5000)
+
+        # Create a new user
+        if method == "POST":
+            if username in self.users:
+                return self.get_response(5002)
+            self.users[username] = {"password": req_data.get("password"), "priv": req_data.get("priv", [])}
+            self.users[username]["scope"] = "user"
+        # Update an existing user
+        elif method == "PUT":
+            if username not in self.users:
+                return self.get_response(5001)
+            self.users[username].update({key: req_data[key] for key in ["password", "priv"] if key in req_data})
+        # Delete one or many existing users, each user is only deleted once even if it is named more than once
+        else:
+            if not all(isinstance(name, str) and name in self.users for name in usernames):
+                return self.get_response(5001)
+            usernames = list(dict.fromkeys(usernames))
+            if any(self.users[name]["scope"] == "system" for name in usernames):
+                return self.get_response(5005)
+            for name in usernames:
+                self.users.pop(name)
+
+        # Deleting many users returns each deleted user once
+        data = [{"name": name} for name in usernames] if isinstance(username, list) else {"name": username}
+        return self.get_response(0, data)
+
+    def config_action(self, method, uri, req_data):
+        """
+        Reads or changes the objects stored for an endpoint. Objects are stored in a list and are referenced by their
+        list index, matching the `id` field used by most endpoints.
+        :param method: the HTTP method of the request
+        :param uri: the URI of the request
+        :param req_data: the request data
+        :return: the API response
+        """
+        # Local variables
+        objects = self.config.setdefault(uri, [])
+        obj = {key: value for key, value in req_data.items() if not key.startswith("_")}
+        obj_id = req_data.get("id")
+        has_id = isinstance(obj_id, int) and 0 <= obj_id < len(objects)
+
+        # Create a new object
+        if method == "POST":
+            objects.append(obj)
+        # Update an existing object, or the endpoint's settings if no object ID was given
+        elif method == "PUT":
+            if has_id:
+                objects[obj_id].update(obj)
+                obj = objects[obj_id]
+            elif not objects:
+                objects.append(obj)
+            else:
+                objects[0].update(obj)
+                obj = objects[0]
+        # Delete an existing object
+        elif method == "DELETE" and has_id:
+            obj = objects.pop(obj_id)
+        # Otherwise, read all objects
+        elif method == "GET":
+            obj = objects
+
+        return self.get_response(0, obj)
+
+
+class MockAPIRequestHandler(http.server.BaseHTTPRequestHandler):
+    """HTTP request handler that passes requests to a MockAPI object."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True    # Headers and body are written separately, don't delay the body
+    mock_api = None
+
+    def handle_request(self):
+        """Parses the request, passes it to the MockAPI and writes its JSON response."""
+        # Local variables
+        url = urllib.parse.urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        # Parse the request data from the body, or from the query string if there is no body
+        try:
+            req_data = json.loads(body) if body else {}
+            req_data.update(form_decode(dict(urllib.parse.parse_qsl(url.query))))
+        except (ValueError, AttributeError):
+            req_data = None
+
+        # Check if our content-type is supported and parsed data correctly
+        if req_data is None:
+            resp = self.mock_api.get_response(11)
+        else:
+            resp = self.mock_api.handle(self.command, url.path, self.headers, self.client_address[0], req_data)
+
+        # Respond like the webConfigurator would if the URI is not an API endpoint
+        if resp is None:
+            content = b"Not Found"
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain")
+        else:
+            content = (json.dumps(resp) + "\n").encode()
+            self.send_response(resp["code"])
+            self.send_header("Content-Type", "application/json")
+
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    def log_message(self, format, *args):    # pylint: disable=redefined-builtin
+        """Silences request logging, it adds noise to benchmarks and the E2E test output."""
+
+
+def create_server(mock_api, host, port, cert=None, key=None):
+    """
+    Creates an HTTP server that answers requests with a MockAPI object.
+    :param mock_api: (MockAPI) the mock API to answer requests with
+    :param host: (string) the address to listen on
+    :param port: (int) the port to listen on, 0 listens on any free port
+    :param cert: (string) the path to a PEM certificate to serve HTTPS with, HTTP is served if not given
+    :param key: (string) the path to the PEM private key of the HTTPS certificate
+    :return: (http.server.ThreadingHTTPServer) the server, call serve_forever() to start answering requests
+    """
+    # Give each server its own handler class so servers in the same process can use different mock APIs
+    handler = type("MockAPIRequestHandler", (MockAPIRequestHandler,), {"mock_api": mock_api})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    if cert:
+        mock_api.scheme = "https"
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+
+    return server
+
+
+def main():
+    """Starts the mock API server."""
+    parser = argparse.ArgumentParser(description="Run a local stand-in for pfSense-API.")
+    parser.add_argument('--host', dest="host", type=str, default="127.0.0.1", help="The address to listen on")
+    parser.add_argument('--port', dest="port", type=int, default=8443, help="The port to listen on")
+    parser.add_argument(
+        '--latency',
+        dest="latency",
+        type=float,
+        default=0.0,
+        help="Seconds to wait before answering each request"
+    )
+    parser.add_argument(
+        '--jitter',
+        dest="jitter",
+        type=float,
+        default=0.0,
+        help="Maximum random seconds to add to the latency of each request"
+    )
+    parser.add_argument('--cert', dest="cert", type=str, help="A PEM certificate to serve HTTPS with")
+    parser.add_argument('--key', dest="key", type=str, help="The PEM private key of the HTTPS certificate")
+    args = parser.parse_args()
+
+    # Start the server, wrapping it in TLS if a certificate was given
+    server = create_server(MockAPI(latency=args.latency, jitter=args.jitter), args.host, args.port, args.cert, args.key)
+    print(f"Mock pfSense-API listening on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,33 +12,314 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Script that runs every test*.py test in the 'tests' directory."""
+import argparse
+import ast
+import concurrent.futures
 import pathlib
 import subprocess
 import os
 import sys
+import tempfile
+
+from e2e_test_framework.fixtures import get_fixture_resources, resolve_fixtures
+
+# Constants
+TESTS_DIR = pathlib.Path(__file__).parent.absolute()
+READ_ONLY_TAG = "read-only"
+DEFAULT_RESOURCES = ["config"]
+SERIAL_TAGS = ["reboots", "lockout"]
+PRIVILEGE_ATTRS = ["get_privileges", "post_privileges", "put_privileges", "delete_privileges"]
+FIXTURE_SESSION = "fixture_session.py"
+
+
+def get_test_attr(test, attr):
+    """
+    Reads a list attribute of a test's APIE2ETest class without importing (and therefore running) the test.
+    :param test: (string) the filename of the test within the tests directory
+    :param attr: (string) the name of the class attribute to read (e.g. `resources`)
+    :return: (list) the value of the attribute, or an empty list if the test does not set the attribute
+    """
+    # Parse the test file and look for a class level assignment of the attribute
+    tree = ast.parse(TESTS_DIR.joinpath(test).read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            for stmt in node.body:
+                if isinstance(stmt, ast.Assign) and any(getattr(t, "id", "") == attr for t in stmt.targets):
+                    return list(ast.literal_eval(stmt.value))
+
+    return []
+
+
+def get_test_resources(test):
+    """
+    Reads the `resources` tags of a test's APIE2ETest class, along with the resource tags of the test's fixtures. Tests
+    that create fixtures or check privileges also hold the `config` tag since both change the config.
+    :param test: (string) the filename of the test within the tests directory
+    :return: (list) the resource tags declared by the test, or DEFAULT_RESOURCES if no tags are declared
+    """
+    # Assume the test may change anything in the config if it did not declare its resources
+    resources = get_test_attr(test, "resources") or DEFAULT_RESOURCES
+    fixtures = get_test_attr(test, "fixtures")
+    fixture_resources = set(get_fixture_resources(fixtures))
+
+    # Creating and deleting fixtures changes the config, even for tests that are otherwise read-only
+    if fixtures:
+        fixture_resources.add("config")
+
+    # Privilege checks create and delete a user for each privilege, even for tests that are otherwise read-only. A
+    # config restore by another test could delete the user mid-check or bring a deleted user back.
+    if any(get_test_attr(test, attr) for attr in PRIVILEGE_ATTRS):
+        fixture_resources.add("config")
+
+    return resources + sorted(fixture_resources - set(resources))
+
+
+def is_conflicting(resources_a, resources_b):
+    """
+    Checks if two tests cannot safely run at the same time. Tests conflict when they share a resource and at least one
+    of them is not read-only.
+    :param resources_a: (list) the resource tags of the first test
+    :param resources_b: (list) the resource tags of the second test
+    :return: (bool) true if the tests conflict, false otherwise
+    """
+    # Read-only tests never conflict with each other
+    if READ_ONLY_TAG in resources_a and READ_ONLY_TAG in resources_b:
+        return False
+
+    return bool(set(resources_a).intersection(resources_b) - {READ_ONLY_TAG})
+
+
+def run_test(test, test_args, capture=False):
+    """
+    Runs a single test in its own process.
+    :param test: (string) the filename of the test within the tests directory
+    :param test_args: (list) the command line arguments to pass to the test
+    :param capture: (bool) capture the test's output instead of printing it so parallel output does not interleave
+    :return: (tuple) the test's exit code and captured output
+    """
+    results = subprocess.run(
+        ["python3", TESTS_DIR.joinpath(test)] + test_args,
+        stdout=subprocess.PIPE if capture else None,
+        stderr=subprocess.STDOUT if capture else None,
+        text=True,
+        check=False
+    )
+    return results.returncode, results.stdout or ""
+
+
+class SharedFixtures:
+    """
+    Creates the fixtures declared by the tests in a run once and shares them between those tests. Each fixture is
+    created before the first test that needs it starts and is deleted once every test that needs it has finished.
+    Other tests never run while a fixture they conflict with exists, so tests that create the same configuration
+    themselves (e.g. the traffic shaper tests) can still run at any point in the run.
+    """
+    def __init__(self, tests, test_args, capture=False):
+        """
+        :param tests: (list) the filenames of the tests in the run
+        :param test_args: (list) the command line arguments used to create and delete the fixtures
+        :param capture: (bool) capture the output of fixture requests instead of printing it
+        """
+        self.needed = {test: resolve_fixtures(get_test_attr(test, "fixtures")) for test in tests}
+        self.test_args = test_args
+        self.capture = capture
+        self.live = []
+        self.exit_code = 0
+
+    def is_blocking(self, test, resources):
+        """
+        Checks if an existing fixture that a test does not use conflicts with the test.
+        :param test: (string) the filename of the test
+        :param resources: (list) the resource tags of the test
+        :return: (bool) true if the test must not start while the existing fixtures exist, false otherwise
+        """
+        unused = [fixture for fixture in self.live if fixture not in self.needed.get(test, [])]
+        return is_conflicting(resources, get_fixture_resources(unused))
+
+    def prepare(self, test, resources):
+        """
+        Deletes any existing fixtures that conflict with a test, then creates the test's fixtures that do not exist.
+        :param test: (string) the filename of the test
+        :param resources: (list) the resource tags of the test
+        :return: (string) the output of the fixture requests when capturing output
+        """
+        # Local variables
+        output = ""
+
+        # Remove fixtures the test would conflict with, they are created again when a later test needs them
+        if self.is_blocking(test, resources):
+            output += self.__run__("delete", [fixture for fixture in self.live if fixture not in self.needed[test]])
+
+        return output + self.__run__("create", [fixture for fixture in self.needed[test] if fixture not in self.live])
+
+    def release(self, test):
+        """
+        Marks a test as finished and deletes the fixtures no remaining test needs.
+        :param test: (string) the filename of the finished test
+        :return: (string) the output of the fixture requests when capturing output
+        """
+        self.needed.pop(test, None)
+        return self.__run__(
+            "delete", [fixture for fixture in self.live if not any(fixture in f for f in self.needed.values())]
+        )
+
+    def release_all(self):
+        """
+        Deletes every existing fixture.
+        :return: (string) the output of the fixture requests when capturing output
+        """
+        return self.__run__("delete", list(self.live))
+
+    def __run__(self, action, fixtures):
+        """
+        Creates or deletes fixtures in their own process and tracks which fixtures exist.
+        :param action: (string) the action to take on the fixtures, either `create` or `delete`
+        :param fixtures: (list) the names of the fixtures to take the action on
+        :return: (string) the output of the fixture requests when capturing output
+        """
+        if not fixtures:
+            return ""
+
+        # Track the fixtures before running the requests so failed fixtures are still deleted at the end of the run
+        if action == "create":
+            self.live += fixtures
+        else:
+            self.live = [fixture for fixture in self.live if fixture not in fixtures]
+
+        args = [action] + [arg for fixture in fixtures for arg in ["--fixture", fixture]] + self.test_args
+        exit_code, output = run_test(FIXTURE_SESSION, args, self.capture)
+        self.exit_code = exit_code or self.exit_code
+        return output
+
+
+def run_parallel(tests, test_args, jobs, fixtures):
+    """
+    Runs tests concurrently, only starting a test when it does not conflict with any test that is already running or
+    with any fixture that it does not use.
+    :param tests: (dict) the tests to run mapped to their resource tags
+    :param test_args: (list) the command line arguments to pass to each test
+    :param jobs: (int) the maximum number of tests to run at once
+    :param fixtures: (SharedFixtures) the fixtures shared by the tests
+    :return: (list) the exit code of each test that was run
+    """
+    # Local variables
+    pending = list(tests)
+    running = {}
+    exit_codes = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            # Start any pending test that does not conflict with the running tests, keeping the original test order
+            for test in list(pending):
+                if len(running) >= jobs:
+                    break
+                if any(is_conflicting(tests[test], tests[other]) for other in running.values()):
+                    continue
+                # Conflicting fixtures are only removed when nothing is running, which prevents tests waiting forever
+                if not running or not fixtures.is_blocking(test, tests[test]):
+                    print(fixtures.prepare(test, tests[test]), end="", flush=True)
+                    running[executor.submit(run_test, test, test_args, True)] = test
+                    pending.remove(test)
+
+            # Wait for a running test to finish and print its output
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                test = running.pop(future)
+                exit_code, output = future.result()
+                print(output, end="", flush=True)
+                print(fixtures.release(test), end="", flush=True)
+                exit_codes.append(exit_code)
+
+    return exit_codes
+
+
+def run_serial(tests, test_args, fixtures):
+    """
+    Runs tests one at a time in order.
+    :param tests: (dict) the tests to run mapped to their resource tags
+    :param test_args: (list) the command line arguments to pass to each test
+    :param fixtures: (SharedFixtures) the fixtures shared by the tests
+    :return: (list) the exit code of each test that was run
+    """
+    # Local variables
+    exit_codes = []
+
+    for test, resources in tests.items():
+        print(fixtures.prepare(test, resources), end="", flush=True)
+        exit_codes.append(run_test(test, test_args)[0])
+        print(fixtures.release(test), end="", flush=True)
+
+    return exit_codes
+
+
+def make_temp_file(prefix):
+    """
+    Creates an empty temporary file used to share state between the tests in a run.
+    :param prefix: (string) the prefix of the temporary file's name
+    :return: (string) the path to the temporary file
+    """
+    temp_fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=".json")
+    os.close(temp_fd)
+    return temp_path
 
 
 def get_exit_code():
     """Runs all tests. Returns 0 if all tests pass, or returns 1 if at least 1 test failed."""
-    tests_dir = pathlib.Path(__file__).parent.absolute()
-    tests = sorted([f for f in os.listdir(tests_dir) if f.startswith("test") and f.endswith(".py")])
-    success_count = 0
-    fail_count = 0
-    exit_code = 0
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        '--jobs',
+        dest="jobs",
+        type=int,
+        default=1,
+        help="The maximum number of non-conflicting tests to run at the same time"
+    )
+    parser.add_argument(
+        '--no_restore_config',
+        dest="restore_config",
+        action="store_false",
+        help="Leave configuration changed by a test in place instead of restoring the configuration after each test"
+    )
+    args, test_args = parser.parse_known_args()
+    jwt_cache = make_temp_file("pfsense-api-e2e-jwt-")
+    config_snapshot = make_temp_file("pfsense-api-e2e-config-")
+    tests = sorted([f for f in os.listdir(TESTS_DIR) if f.startswith("test") and f.endswith(".py")])
+    tests = {test: get_test_resources(test) for test in tests}
+    serial_tests = [test for test, resources in tests.items() if set(resources).intersection(SERIAL_TAGS)]
+    parallel_tests = {test: resources for test, resources in tests.items() if test not in serial_tests}
+    exit_codes = []
+
+    # Share JWTs between all tests in this run unless a cache file was given
+    if "--jwt_cache" not in test_args:
+        test_args += ["--jwt_cache", jwt_cache]
+
+    # Create each fixture once and share it between the tests that declare it
+    fixtures = SharedFixtures(tests, test_args, capture=args.jobs > 1)
+    shared_args = test_args + ["--shared_fixtures"]
+
+    # Restore the configuration after each test that changed it, sharing the snapshot so it is only read when changed
+    if args.restore_config:
+        shared_args += ["--restore_config", "--config_snapshot", config_snapshot]
 
     # Run each test within the tests directory. Tests must start with 'test' and end with '.py' to be included.
-    for test in tests:
-        try:
-            results = subprocess.call(["python3", tests_dir.joinpath(test)] + sys.argv[1:])
-        except KeyboardInterrupt:
-            sys.exit(1)
-
-        # If a test fails, set exit code to 1
-        if results != 0:
-            fail_count += 1
-            exit_code = 1
+    try:
+        if args.jobs > 1:
+            exit_codes += run_parallel(parallel_tests, shared_args, args.jobs, fixtures)
         else:
-            success_count += 1
+            exit_codes += run_serial(parallel_tests, shared_args, fixtures)
+
+        # Tests that reboot the system or lock out the client must always run alone once everything else has finished
+        exit_codes += run_serial({test: tests[test] for test in serial_tests}, shared_args, fixtures)
+    except KeyboardInterrupt:
+        sys.exit(1)
+    finally:
+        print(fixtures.release_all(), end="", flush=True)
+        os.remove(jwt_cache)
+        os.remove(config_snapshot)
+
+    # If a test fails, set exit code to 1
+    success_count = exit_codes.count(0)
+    fail_count = len(exit_codes) - success_count
+    exit_code = 1 if fail_count or fixtures.exit_code else 0
 
     # Print the number successful/failed tests
     print(
@@ -0,0 +1,137 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Script that stress tests concurrent configuration writes. N aliases are created at once through /api/v1/firewall/alias
+and the total time, the number of configuration history entries written and whether every alias was kept are reported.
+The aliases are never applied and are deleted once the test finishes, but this should still only be run against a
+development instance.
+"""
+import argparse
+import concurrent.futures
+import json
+import sys
+import time
+
+from e2e_test_framework.tools import percentile
+from load_test import add_connection_args, start_session
+
+# Constants
+ALIAS_PREFIX = "E2E_STRESS_"
+PERCENTILES = [50, 95, 99]
+
+
+def api_request(session, args, method, uri, data=None):
+    """Makes an API request and returns the status code, JSON response and seconds the request took."""
+    start = time.perf_counter()
+    resp = session.request(
+        method,
+        f"{args.scheme}://{args.host}:{args.port}{uri}",
+        data=json.dumps(data or {}),
+        verify=False,
+        timeout=args.timeout
+    )
+    return resp.status_code, resp.json(), time.perf_counter() - start
+
+
+def get_history_cursor(session, args):
+    """
+    Obtains the cursor of the newest configuration history entry.
+    :param session: (requests.Session) the session to send the request with
+    :param args: (argparse.Namespace) the parsed command line arguments
+    :return: (int) the cursor to read newer configuration history entries from
+    """
+    status, resp, _ = api_request(session, args, "GET", "/api/v1/status/log/config_history", {"tail": 1})
+    if status != 200:
+        print(f"Failed to read configuration history: {resp.get('message')}")
+        sys.exit(1)
+
+    return resp.get("cursor", 0)
+
+
+def create_alias(session, args, index):
+    """
+    Creates a single port alias without applying it.
+    :param session: (requests.Session) the session to send the request with
+    :param args: (argparse.Namespace) the parsed command line arguments
+    :param index: (int) the index of the alias, used to give each alias a unique name and port
+    :return: (tuple) the status code of the request and the seconds the request took
+    """
+    data = {
+        "name": f"{ALIAS_PREFIX}{index}",
+        "type": "port",
+        "descr": "E2E Test",
+        "address": [str(10000 + index)],
+        "apply": False
+    }
+    status, _, elapsed = api_request(session, args, "POST", "/api/v1/firewall/alias", data)
+    return status, elapsed
+
+
+def main():
+    """Runs the stress test and deletes the aliases it created."""
+    parser = argparse.ArgumentParser(description="Stress test concurrent configuration writes.")
+    add_connection_args(parser)
+    parser.add_argument(
+        '--requests',
+        dest="requests",
+        type=int,
+        default=50,
+        help="The number of aliases to create"
+    )
+    parser.add_argument(
+        '--concurrency',
+        dest="concurrency",
+        type=int,
+        default=10,
+        help="The maximum number of requests to send at once"
+    )
+    args = parser.parse_args()
+    session = start_session(args, args.concurrency)
+    cursor = get_history_cursor(session, args)
+
+    try:
+        # Create every alias at once
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(lambda index: create_alias(session, args, index), range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+        # Check which aliases were kept and how many configuration history entries were written
+        _, resp, _ = api_request(session, args, "GET", "/api/v1/firewall/alias")
+        names = {alias.get("name") for alias in resp["data"]}
+        missing = [index for index in range(args.requests) if f"{ALIAS_PREFIX}{index}" not in names]
+        _, resp, _ = api_request(session, args, "GET", "/api/v1/status/log/config_history", {"cursor": cursor})
+        latencies = [latency for _, latency in results]
+
+        print(
+            f"Created {sum(status == 200 for status, _ in results)}/{args.requests} aliases in {elapsed:.2f}s "
+            f"({args.requests / elapsed:.1f} req/s) at a concurrency of {args.concurrency}\n"
+            f"Latency: " + ", ".join(f"p{pct} {percentile(latencies, pct):.3f}s" for pct in PERCENTILES) + "\n"
+            f"Configuration history entries written: {len(resp['data'])}\n"
+            f"Aliases missing from the configuration: {len(missing)}"
+        )
+    except KeyboardInterrupt:
+        sys.exit(1)
+    finally:
+        for index in range(args.requests):
+            data = {"id": f"{ALIAS_PREFIX}{index}", "apply": False}
+            api_request(session, args, "DELETE", "/api/v1/firewall/alias", data)
+
+    # Exit on failure if any created alias was lost to a concurrent write
+    if missing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
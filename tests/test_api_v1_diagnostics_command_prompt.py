@@ -27,10 +27,41 @@ class APIE2ETestDiagnosticsCommandPrompt(e2e_test_framework.APIE2ETest):
                 "shell_cmd": "whoami"
             }
         },
+        {
+            "name": "Execute a batch of shell commands",
+            "post_test_callable": "check_shell_cmds_response",
+            "req_data": {
+                "shell_cmds": ["whoami", "echo E2E; exit 3", "printf E2E"]
+            }
+        },
         {
             "name": "Test shell command requirement",
             "status": 400,
             "return": 7000
+        },
+        {
+            "name": "Test shell commands array type constraint",
+            "status": 400,
+            "return": 7001,
+            "req_data": {
+                "shell_cmds": "whoami"
+            }
+        },
+        {
+            "name": "Test shell commands minimum items constraint",
+            "status": 400,
+            "return": 7001,
+            "req_data": {
+                "shell_cmds": []
+            }
+        },
+        {
+            "name": "Test shell commands empty command constraint",
+            "status": 400,
+            "return": 7001,
+            "req_data": {
+                "shell_cmds": ["whoami", ""]
+            }
         }
     ]
 
@@ -41,4 +72,14 @@ class APIE2ETestDiagnosticsCommandPrompt(e2e_test_framework.APIE2ETest):
             raise AssertionError("expected shell_cmd 'whoami' to respond with 'root'")
 
 
+    def check_shell_cmds_response(self):
+        """Checks that each shell command in the batch responds with its own output and exit code."""
+        results = [
+            (result.get("cmd_output"), result.get("exit_code"))
+            for result in self.last_response.get("data", {}).get("cmd_outputs", [])
+        ]
+        if results != [("root", 0), ("E2E", 3), ("E2E", 0)]:
+            raise AssertionError(f"expected each shell command's output and exit code, got {results}")
+
+
 APIE2ETestDiagnosticsCommandPrompt()
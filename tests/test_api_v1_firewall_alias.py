@@ -12,12 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Script used to test the /api/v1/firewall/alias endpoint."""
+import copy
+
 import e2e_test_framework
 
+# Constants
+REFERENCE_PREFIX = "E2E_REF_"
+REFERENCE_ALIASES = 6
+REFERENCE_RULES = 10
+
 
 class APIE2ETestFirewallAlias(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/alias endpoint."""
     uri = "/api/v1/firewall/alias"
+    reference_config = None
 
     get_privileges = ["page-all", "page-firewall-aliases"]
     post_privileges = ["page-all", "page-firewall-alias-edit"]
@@ -74,7 +82,8 @@ class APIE2ETestFirewallAlias(e2e_test_framework.APIE2ETest):
         {
             "name": "Check that GOOGLE_DNS actually populates a table with resolved hostnames",
             "method": "GET",
-            "delay": 10,
+            "delay": 30,    # Wait up to 30 seconds for the hostnames to be resolved
+            "delay_until": "is_google_dns_resolved",
             "uri": "/api/v1/system/table",
             "post_test_callable": "check_google_dns_table",
             "req_data": {"name": "GOOGLE_DNS"}
@@ -312,9 +321,54 @@ class APIE2ETestFirewallAlias(e2e_test_framework.APIE2ETest):
             "req_data": {
                 "id": "INVALID"
             }
+        },
+        {
+            "name": "Read the configuration to seed the alias reference tests with",
+            "method": "GET",
+            "uri": "/api/v1/system/config",
+            "post_test_callable": "save_reference_config"
+        },
+        {
+            "name": f"Seed {REFERENCE_ALIASES} aliases and {REFERENCE_RULES} firewall rules referencing half of them",
+            "method": "PUT",
+            "uri": "/api/v1/system/config",
+            "req_data_callable": "get_seeded_config",
+            "resp_time": 10    # Allow time to write the seeded configuration
+        },
+        {
+            "name": "Delete an unreferenced alias with firewall rules referencing other aliases",
+            "req_data": {
+                "id": f"{REFERENCE_PREFIX}{REFERENCE_ALIASES - 1}",
+                "apply": False
+            }
+        },
+        {
+            "name": "Bulk delete the remaining unreferenced aliases",
+            "req_data_callable": "get_unreferenced_aliases"
+        },
+        {
+            "name": "Check that deleting a referenced alias returns every reference to it",
+            "status": 400,
+            "return": 4108,
+            "req_data": {
+                "id": f"{REFERENCE_PREFIX}0"
+            },
+            "post_test_callable": "check_alias_references"
+        },
+        {
+            "name": "Restore the configuration read before seeding the alias reference tests",
+            "method": "PUT",
+            "uri": "/api/v1/system/config",
+            "req_data_callable": "get_reference_config",
+            "resp_time": 10    # Allow time to write the restored configuration
         }
     ]
 
+    def is_google_dns_resolved(self):
+        """Checks if the hostnames in the GOOGLE_DNS alias have been resolved into its table"""
+        entries = self.pfsense_shell("pfctl -t GOOGLE_DNS -T show")
+        return "8.8.8.8" in entries and "8.8.4.4" in entries
+
     def check_google_dns_table(self):
         """Checks the the GOOGLE_DNS table is created with our dns.google hostname alias"""
         # If the return data is a dict, convert it to a list
@@ -334,5 +388,74 @@ class APIE2ETestFirewallAlias(e2e_test_framework.APIE2ETest):
             if "8.8.4.4" not in table["entries"]:
                 raise AssertionError("expected '8.8.4.4' to be in GOOGLE_DNS table")
 
+    def save_reference_config(self):
+        """Saves the configuration read before seeding the alias reference tests so it can be restored"""
+        self.reference_config = self.last_response["data"]
+        if not isinstance(self.reference_config, dict):
+            raise AssertionError(f"Expected the configuration to be an object, received {self.reference_config}")
+
+    def get_reference_config(self):
+        """Provides the configuration read before seeding the alias reference tests"""
+        return self.reference_config
+
+    def get_seeded_config(self):
+        """
+        Seeds the configuration read before the reference tests with host aliases and firewall rules. Each rule
+        references one of the first half of the aliases in its source and destination, the second half of the aliases
+        are unreferenced.
+        """
+        # Local variables
+        config = copy.deepcopy(self.reference_config)
+        config["aliases"] = config.get("aliases") if isinstance(config.get("aliases"), dict) else {}
+        config["filter"] = config.get("filter") if isinstance(config.get("filter"), dict) else {}
+
+        # Keep any existing aliases and rules, and add the seeded aliases and rules after them
+        config["aliases"]["alias"] = list(config["aliases"].get("alias") or []) + [
+            {
+                "name": f"{REFERENCE_PREFIX}{index}",
+                "type": "host",
+                "address": f"198.18.{index // 256}.{index % 256}",
+                "descr": f"Seeded alias {index}",
+                "detail": ""
+            }
+            for index in range(REFERENCE_ALIASES)
+        ]
+        config["filter"]["rule"] = list(config["filter"].get("rule") or []) + [
+            {
+                "type": "pass",
+                "interface": "wan",
+                "ipprotocol": "inet",
+                "source": {"address": f"{REFERENCE_PREFIX}{index % (REFERENCE_ALIASES // 2)}"},
+                "destination": {"address": f"{REFERENCE_PREFIX}{index % (REFERENCE_ALIASES // 2)}"},
+                "disabled": "",
+                "descr": f"Seeded rule {index}",
+                "tracker": str(1000000000 + index)
+            }
+            for index in range(REFERENCE_RULES)
+        ]
+        return config
+
+    @staticmethod
+    def get_unreferenced_aliases():
+        """Provides a bulk request deleting the unreferenced aliases not deleted by the single delete test"""
+        return {
+            "bulk": [
+                {"id": f"{REFERENCE_PREFIX}{index}", "apply": False}
+                for index in range(REFERENCE_ALIASES // 2, REFERENCE_ALIASES - 1)
+            ]
+        }
+
+    def check_alias_references(self):
+        """Checks that every firewall rule referencing the alias is returned, not just the first one found"""
+        # Each rule referencing the alias references it in both its source and destination
+        expected = 2 * len(range(0, REFERENCE_RULES, REFERENCE_ALIASES // 2))
+        references = self.last_response["data"]
+        if len(references) != expected:
+            raise AssertionError(f"Expected {expected} references to {REFERENCE_PREFIX}0, received {len(references)}")
+        for reference in references:
+            fields = ["source/address", "destination/address"]
+            if reference["section"] != "filter/rule" or reference["field"] not in fields:
+                raise AssertionError(f"Expected only firewall rule address references, received {reference}")
+
 
 APIE2ETestFirewallAlias()
@@ -0,0 +1,57 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Script used to test bulk requests to the /api/v1/firewall/alias endpoint."""
+import e2e_test_framework
+
+
+class APIE2ETestFirewallAliasBulk(e2e_test_framework.APIE2EBulkTest):
+    """Class used to test bulk requests to the /api/v1/firewall/alias endpoint."""
+    uri = "/api/v1/firewall/alias"
+    post_privileges = ["page-all", "page-firewall-alias-edit"]
+    put_privileges = ["page-all", "page-firewall-alias-edit"]
+    delete_privileges = ["page-all", "page-firewall-alias-edit"]
+    bulk_name = "firewall aliases"
+    bulk_payloads = [
+        {"name": "E2E_BULK_0", "type": "port", "address": [8080]},
+        {"name": "E2E_BULK_1", "type": "host", "address": ["192.168.1.10"]},
+        {"name": "E2E_BULK_2", "type": "network", "address": ["10.10.0.0/16"]}
+    ]
+    bulk_invalid_payload = {"name": "!INVALID!", "type": "port", "address": [8081]}
+    bulk_invalid_return = 4053
+    bulk_id_field = "name"
+    bulk_apply = True
+    bulk_resp_time = 3    # Allow a few seconds for the firewall filter to reload
+    post_tests = [
+        {
+            "name": "Check bulk payloads are validated against the payloads before them",
+            "status": 400,
+            "return": 17,
+            "req_data": {
+                "bulk": [
+                    {"name": "E2E_BULK_0", "type": "port", "address": [8080]},
+                    {"name": "E2E_BULK_0", "type": "port", "address": [8081]}
+                ]
+            },
+            "post_test_callable": "is_duplicate_payload_reported"
+        }
+    ]
+
+    def is_duplicate_payload_reported(self):
+        """Checks that the last bulk response reports the second payload as a duplicate of the first payload"""
+        results = self.last_response.get("data", [])
+        if [result.get("return") for result in results] != [0, 4056]:
+            raise AssertionError(f"Expected the second payload to be reported as a duplicate, received {results}")
+
+
+APIE2ETestFirewallAliasBulk()
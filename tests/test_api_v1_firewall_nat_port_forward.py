@@ -18,6 +18,7 @@ import e2e_test_framework
 class APIE2ETestFirewallNATPortForward(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/nat/port_forward endpoint."""
     uri = "/api/v1/firewall/nat/port_forward"
+    resources = ["config", "firewall-rules"]
 
     get_privileges = ["page-all", "page-firewall-nat-portforward"]
     post_privileges = ["page-all", "page-firewall-nat-portforward-edit"]
@@ -13,7 +13,6 @@
 # limitations under the License.
 """Script used to test the /api/v1/firewall/rule endpoint."""
 import os
-import time
 
 import e2e_test_framework
 
@@ -21,6 +20,8 @@ import e2e_test_framework
 class APIE2ETestFirewallRule(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/rule endpoint."""
     uri = "/api/v1/firewall/rule"
+    resources = ["config", "firewall-rules"]
+    fixtures = ["Test_Altq", "Test_Altq2", "Test_DNQueue", "Test_DNQueue2"]
 
     get_privileges = ["page-all", "page-firewall-rules"]
     post_privileges = ["page-all", "page-firewall-rules-edit"]
@@ -31,97 +32,6 @@ class APIE2ETestFirewallRule(e2e_test_framework.APIE2ETest):
         {"name": "Read all firewall rules"}
     ]
     post_tests = [
-        {
-            "name": "Create a parent traffic shaper (altq) to use in rule",
-            "uri": "/api/v1/firewall/traffic_shaper",
-            "req_data": {
-                "interface": "wan",
-                "scheduler": "PRIQ",
-                "bandwidthtype": "Gb",
-                "bandwidth": 1,
-                "enabled": True,
-                "qlimit": 1000,
-                "tbrconfig": 1000,
-                "apply": True
-            }
-        },
-        {
-            "name": "Create another traffic shaper queue (altq) to use in the rule",
-            "uri": "/api/v1/firewall/traffic_shaper/queue",
-            "req_data": {
-                "interface": "wan",
-                "name": "Test_Altq",
-                "priority": 14,
-                "description": "Traffic Shaper Queue E2E test",
-                "default": True
-            }
-        },
-        {
-            "name": "Create traffic shaper queue (altq) to use in the rule",
-            "uri": "/api/v1/firewall/traffic_shaper/queue",
-            "req_data": {
-                "interface": "wan",
-                "name": "Test_Altq2",
-                "priority": 15,
-                "description": "Traffic Shaper Queue E2E test",
-                "default": False
-            }
-        },
-        {
-            "name": "Create parent firewall traffic shaper limiter (dummynet) to use in rule",
-            "uri": "/api/v1/firewall/traffic_shaper/limiter",
-            "req_data": {
-                "name": "Test_Limiter",
-                "bandwidth": [{"bw": 100, "bwscale": "Mb"}],
-                "mask": "srcaddress",
-                "maskbits": 31,
-                "description": "E2E test",
-                "aqm": "codel",
-                "sched": "fq_pie",
-                "qlimit": 7000,
-                "delay": 1,
-                "plr": 0.01,
-                "buckets": 16,
-                "ecn": True,
-                "apply": True
-            }
-        },
-        {
-            "name": "Create firewall traffic shaper limiter queue (dummynet) to use in rule",
-            "uri": "/api/v1/firewall/traffic_shaper/limiter/queue",
-            "req_data": {
-                "limiter": "Test_Limiter",
-                "name": "Test_DNQueue",
-                "mask": "srcaddress",
-                "maskbits": 31,
-                "description": "E2E test",
-                "aqm": "codel",
-                "qlimit": 7000,
-                "weight": 1,
-                "plr": 0.01,
-                "buckets": 16,
-                "ecn": True,
-                "apply": True
-            }
-        },
-        {
-            "name": "Create another firewall traffic shaper limiter queue (dummynet) to use in rule",
-            "uri": "/api/v1/firewall/traffic_shaper/limiter/queue",
-            "req_data": {
-                "limiter": "Test_Limiter",
-                "name": "Test_DNQueue2",
-                "mask": "srcaddress",
-                "maskbits": 31,
-                "description": "E2E test",
-                "aqm": "codel",
-                "qlimit": 7000,
-                "weight": 1,
-                "plr": 0.01,
-                "buckets": 16,
-                "ecn": True,
-                "apply": True
-            }
-        },
         {
             "name": "Create firewall rule",
             "req_data": {
@@ -1044,26 +954,6 @@ class APIE2ETestFirewallRule(e2e_test_framework.APIE2ETest):
             "delay": 1    # Wait one second before running this request, otherwise conflicts occur with filter reload
         },
         {"name": "Delete floating firewall rule", "req_data": {}},    # Tracker ID gets populated by post_post() method
-        {
-            "name": "Delete traffic shaper queue used to test",
-            "uri": "/api/v1/firewall/traffic_shaper/queue",
-            "req_data": {"interface": "wan", "name": "Test_Altq"}
-        },
-        {
-            "name": "Delete traffic shaper used to test",
-            "uri": "/api/v1/firewall/traffic_shaper",
-            "req_data": {"interface": "wan"}
-        },
-        {
-            "name": "Delete limiter queue used to test",
-            "uri": "/api/v1/firewall/traffic_shaper/limiter/queue",
-            "req_data": {"limiter": "Test_Limiter", "name": "Test_DNQueue"}
-        },
-        {
-            "name": "Delete limiter used to test",
-            "uri": "/api/v1/firewall/traffic_shaper/limiter",
-            "req_data": {"name": "Test_Limiter"}
-        },
         {
             "name": "Test tracker requirement",
             "status": 400,
@@ -1079,36 +969,34 @@ class APIE2ETestFirewallRule(e2e_test_framework.APIE2ETest):
 
     def is_ping_unsuccessful(self):
         """Checks that we can't ping our target after a block rule is put in place"""
-        # Wait a bit for the filter to finish reloading
-        time.sleep(3)
-
-        # Send a single ping and ensure the target host does not respond
-        if os.system(f"ping -c 1 -t 1 {self.args.host} > /dev/null") == 0:
+        # Send pings until the target host stops responding, allowing time for the filter to finish reloading
+        if not self.wait_until(lambda: not self.is_ping_replied(), 10):
             raise AssertionError("Expected ping to be unsuccessful after block rule is applied")
 
     def is_ping_successful(self):
         """Checks that we can ping our target after a block rule is removed"""
-        # Wait a bit for the filter to finish reloading
-        time.sleep(3)
-
-        # Send a single ping and ensure the target host does not respond
-        if os.system(f"ping -c 1 -t 1 {self.args.host} > /dev/null") != 0:
+        # Send pings until the target host responds, allowing time for the filter to finish reloading
+        if not self.wait_until(self.is_ping_replied, 10):
             raise AssertionError("Expected ping to be successful after block rule is removed")
 
+    def is_ping_replied(self):
+        """Sends a single ping and checks if the target host responded"""
+        return os.system(f"ping -c 1 -t 1 {self.args.host} > /dev/null") == 0
+
     # Override our PRE/POST methods
     def post_post(self):
         # After we've created rules in our tests, ensure the tracker is added to PUT and DELETE tests
-        if len(self.post_responses) == 9:
+        if len(self.post_responses) == 3:
             # Assign the required tracker ID created in the POST request to the PUT and DELETE req_datas
-            self.delete_tests[0]["req_data"]["tracker"] = self.post_responses[6]["data"]["tracker"]
-            self.delete_tests[1]["req_data"]["tracker"] = self.post_responses[7]["data"]["tracker"]
-            self.delete_tests[2]["req_data"]["tracker"] = self.post_responses[8]["data"]["tracker"]
+            self.delete_tests[0]["req_data"]["tracker"] = self.post_responses[0]["data"]["tracker"]
+            self.delete_tests[1]["req_data"]["tracker"] = self.post_responses[1]["data"]["tracker"]
+            self.delete_tests[2]["req_data"]["tracker"] = self.post_responses[2]["data"]["tracker"]
 
             key = 0
             for _ in self.put_tests:
                 if "req_data" in self.put_tests[key]:
-                    self.put_tests[key]["req_data"]["tracker"] = self.post_responses[6]["data"]["tracker"]
-                    self.put_tests[key]["req_data"]["tracker"] = self.post_responses[8]["data"]["tracker"]
+                    self.put_tests[key]["req_data"]["tracker"] = self.post_responses[0]["data"]["tracker"]
+                    self.put_tests[key]["req_data"]["tracker"] = self.post_responses[2]["data"]["tracker"]
                 key += 1
 
 
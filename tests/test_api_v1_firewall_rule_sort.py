@@ -18,6 +18,7 @@ import e2e_test_framework
 class APIE2ETestFirewallRuleSort(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/rule/sort endpoint."""
     uri = "/api/v1/firewall/rule/sort"
+    resources = ["config", "firewall-rules"]
     put_privileges = ["page-all", "page-firewall-rules"]
     put_tests = [
         {
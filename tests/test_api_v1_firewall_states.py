@@ -12,8 +12,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Script used to test the /api/v1/firewall/states endpoint."""
+import ipaddress
+import re
+
 import e2e_test_framework
 
+# Constants
+PROTOCOLS = {"tcp": "tcp", "udp": "udp", "icmp": "icmp", "icmpv6": "icmpv6", "ipv6-icmp": "icmpv6"}
+
+
+def get_state_address(host):
+    """
+    Obtains the address of a state's source or destination, without its port or the NAT address that follows it.
+    :param host: (str) the state's source or destination (e.g. '192.168.1.1:443 (1.2.3.4:443)')
+    :return: (ipaddress.IPv4Address|ipaddress.IPv6Address) the address, or None if it is not an IP address
+    """
+    # Remove the NAT address that follows the state's own address
+    host = host.split()[0] if host.split() else ""
+
+    # IPv6 addresses are followed by their port in brackets, IPv4 addresses are followed by their port after a colon
+    if re.search(r"\[[0-9]+]$", host):
+        host = re.sub(r"\[[0-9]+]$", "", host)
+    elif host.count(":") == 1:
+        host = host.split(":")[0]
+
+    try:
+        return ipaddress.ip_address(host)
+    except ValueError:
+        return None
+
 
 class APIE2ETestFirewallStates(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/states endpoint."""
@@ -22,43 +49,189 @@ class APIE2ETestFirewallStates(e2e_test_framework.APIE2ETest):
     get_privileges = ["page-all", "page-diagnostics-showstates"]
     delete_privileges = ["page-all", "page-diagnostics-showstates"]
 
-    get_tests = [{"name": "Read all firewalls states"}]
+    get_tests = [
+        {"name": "Read all firewalls states"},
+        {
+            "name": "Read the first page of firewall states",
+            "req_data": {"limit": 1},
+            "post_test_callable": "is_first_page_valid"
+        },
+        {
+            "name": "Read the second page of firewall states using the previous cursor",
+            "req_data_callable": "get_cursor_req_data",
+            "post_test_callable": "is_next_page_valid"
+        },
+        {
+            "name": "Read the firewall states of an existing state's interface, protocol and source IP",
+            "req_data_callable": "get_filter_req_data",
+            "post_test_callable": "is_filter_matched"
+        },
+        {
+            "name": "Count the firewall states",
+            "req_data": {"count": True},
+            "post_test_callable": "is_count_valid"
+        },
+        {
+            "name": "Check interface exists constraint",
+            "status": 400,
+            "return": 4235,
+            "req_data": {"interface": "INVALID"}
+        },
+        {
+            "name": "Check protocol options constraint",
+            "status": 400,
+            "return": 4234,
+            "req_data": {"protocol": "INVALID!"}
+        },
+        {
+            "name": "Check source IP/CIDR constraint",
+            "status": 400,
+            "return": 4232,
+            "req_data": {"source": "INVALID"}
+        },
+        {
+            "name": "Check destination IP/CIDR constraint",
+            "status": 400,
+            "return": 4233,
+            "req_data": {"destination": "INVALID"}
+        },
+        {
+            "name": "Check limit minimum constraint",
+            "status": 400,
+            "return": 4249,
+            "req_data": {"limit": 0}
+        },
+        {
+            "name": "Check cursor minimum constraint",
+            "status": 400,
+            "return": 4250,
+            "req_data": {"cursor": -1}
+        },
+        {
+            "name": "Check count boolean constraint",
+            "status": 400,
+            "return": 4251,
+            "req_data": {"count": "INVALID"}
+        }
+    ]
     delete_tests = [
         {
             "name": "Check firewall state deletion",
             "req_data": {"source": "1.2.3.4"},
-            "resp_data_empty": True
+            "wait_for_job": True
         },
         {
             "name": "Check source requirement",
+            "concurrent": True,
             "status": 400,
             "return": 4231
         },
         {
             "name": "Check source IP/CIDR constraint",
+            "concurrent": True,
             "status": 400,
             "return": 4232,
             "req_data": {"source": "INVALID"}
         },
         {
             "name": "Check destination IP/CIDR constraint",
+            "concurrent": True,
             "status": 400,
             "return": 4233,
             "req_data": {"source": "1.2.3.4", "destination": "INVALID"}
         },
         {
             "name": "Check sleep minimum constraint",
+            "concurrent": True,
             "status": 400,
             "return": 4236,
             "req_data": {"source": "1.2.3.4", "sleep": -1}
         },
         {
             "name": "Check sleep maximum constraint",
+            "concurrent": True,
             "status": 400,
             "return": 4236,
             "req_data": {"source": "1.2.3.4", "sleep": 301}
         }
     ]
 
+    first_page = []
+    page_cursor = None
+    filter_state = None
+
+    def check_page(self, limit):
+        """
+        Checks that a paginated read returned a list of no more than a number of states and a valid cursor, if any.
+        :param limit: (int) the maximum number of states the read may return
+        """
+        # Ensure no more than the requested number of states were returned
+        if not isinstance(self.last_response.get("data"), list) or len(self.last_response["data"]) > limit:
+            raise AssertionError(f"expected a list of no more than {limit} states, received {self.last_response}")
+        # Ensure the cursor is an integer if one was returned, it is omitted once the end of the table is reached
+        if not self.last_response_headers.get("X-API-Cursor", "0").isdigit():
+            raise AssertionError("expected the X-API-Cursor header to be an integer")
+
+    def is_first_page_valid(self):
+        """Checks that the first page contains a single state and the cursor of the second page."""
+        self.check_page(1)
+        self.first_page = self.last_response["data"]
+        if not self.last_response_headers.get("X-API-Cursor"):
+            raise AssertionError("expected the first of several pages to include the X-API-Cursor header")
+
+    def get_cursor_req_data(self):
+        """Builds request data that reads the page after the previous response using its X-API-Cursor header."""
+        self.page_cursor = int(self.last_response_headers.get("X-API-Cursor", 0))
+        return {"cursor": self.page_cursor, "limit": 1}
+
+    def is_next_page_valid(self):
+        """Checks that the second page was read from a cursor past the first page and is a different page."""
+        self.check_page(1)
+        if not self.page_cursor:
+            raise AssertionError("expected the second page to be read from the first page's cursor")
+        if self.last_response["data"] and self.last_response["data"] == self.first_page:
+            raise AssertionError(f"expected the second page to differ from the first page {self.first_page}")
+
+    def get_filter_req_data(self):
+        """Builds request data that filters by the interface, protocol and source IP of a state read earlier."""
+        # Use the first state with a supported protocol and an IP source from the test that read all states
+        states = (self.get_responses[0] or {}).get("data", []) if self.get_responses else []
+        self.filter_state = next(
+            (state for state in states if state["protocol"] in PROTOCOLS and get_state_address(state["source"])), None
+        )
+        if not self.filter_state:
+            return {}
+
+        return {
+            "interface": self.filter_state["interface"],
+            "protocol": PROTOCOLS[self.filter_state["protocol"]],
+            "source": str(get_state_address(self.filter_state["source"])),
+            "limit": 10
+        }
+
+    def is_filter_matched(self):
+        """Checks that a filtered read only returned states matching its interface, protocol and source filters."""
+        # Ensure a state was available to filter by and at least that state's match was returned
+        if not self.filter_state:
+            raise AssertionError("expected an existing state with an IP source to filter by")
+        self.check_page(10)
+        if not self.last_response["data"]:
+            raise AssertionError(f"expected states matching {self.filter_state} to be returned")
+
+        # Ensure every state returned matches every filter
+        for state in self.last_response["data"]:
+            if state.get("interface") != self.filter_state["interface"]:
+                raise AssertionError(f"expected only states on {self.filter_state['interface']}, received {state}")
+            if PROTOCOLS.get(state.get("protocol")) != PROTOCOLS[self.filter_state["protocol"]]:
+                raise AssertionError(f"expected only {self.filter_state['protocol']} states, received {state}")
+            if get_state_address(state.get("source", "")) != get_state_address(self.filter_state["source"]):
+                raise AssertionError(f"expected only states from {self.filter_state['source']}, received {state}")
+
+    def is_count_valid(self):
+        """Checks that a count read returned the number of states instead of the states themselves."""
+        data = self.last_response.get("data")
+        if not isinstance(data, dict) or not isinstance(data.get("count"), int) or data["count"] < 0:
+            raise AssertionError(f"expected a count of states, received {data}")
+
 
 APIE2ETestFirewallStates()
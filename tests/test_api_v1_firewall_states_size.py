@@ -22,7 +22,21 @@ class APIE2ETestFirewallStatesSize(e2e_test_framework.APIE2ETest):
     get_privileges = ["page-all", "page-system-advanced-firewall"]
     put_privileges = ["page-all", "page-system-advanced-firewall"]
 
-    get_tests = [{"name": "Read firewall states size"}]
+    get_tests = [
+        {"name": "Read firewall states size"},
+        {
+            "name": "Check a page of firewall states stays bounded",
+            "uri": "/api/v1/firewall/states",
+            "req_data": {"limit": 100},
+            "post_test_callable": "is_states_bounded"
+        },
+        {
+            "name": "Check the firewall states count is within the states size",
+            "uri": "/api/v1/firewall/states",
+            "req_data": {"count": True},
+            "post_test_callable": "is_count_bounded"
+        }
+    ]
     put_tests = [
         {
             "name": "Update firewall states size to 20000",
@@ -34,5 +48,20 @@ class APIE2ETestFirewallStatesSize(e2e_test_framework.APIE2ETest):
         }
     ]
 
+    def is_states_bounded(self):
+        """Checks that a limited firewall states read does not return more states than requested."""
+        if len(self.last_response.get("data", [])) > 100:
+            raise AssertionError(f"expected no more than 100 states, received {len(self.last_response['data'])}")
+
+    def is_count_bounded(self):
+        """Checks that the number of firewall states does not exceed the states size read by the first test."""
+        # Local variables
+        size = self.get_responses[0].get("data", {})
+        count = self.last_response.get("data", {}).get("count")
+
+        # Ensure the count is within the maximum number of states the state table can hold
+        if not isinstance(count, int) or count > int(size.get("maximumstates", count)):
+            raise AssertionError(f"expected a states count within {size.get('maximumstates')}, received {count}")
+
 
 APIE2ETestFirewallStatesSize()
@@ -18,6 +18,7 @@ import e2e_test_framework
 class APIE2ETestFirewallTrafficShaper(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/traffic_shaper endpoint."""
     uri = "/api/v1/firewall/traffic_shaper"
+    resources = ["config", "traffic-shaper"]
 
     get_privileges = ["page-all", "page-firewall-trafficshaper"]
     post_privileges = ["page-all", "page-firewall-trafficshaper"]
@@ -18,30 +18,13 @@ import e2e_test_framework
 class APIE2ETestFirewallTrafficShaperLimiterQueue(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/traffic_shaper/limiter/queue endpoint."""
     uri = "/api/v1/firewall/traffic_shaper/limiter/queue"
+    resources = ["config", "traffic-shaper"]
+    fixtures = ["Test_Limiter"]
 
     post_privileges = ["page-all", "page-firewall-trafficshaper-limiter"]
     delete_privileges = ["page-all", "page-firewall-trafficshaper-limiter"]
 
     post_tests = [
-        {
-            "name": "Create parent firewall traffic shaper limiter",
-            "uri": "/api/v1/firewall/traffic_shaper/limiter",
-            "req_data": {
-                "name": "Test_Limiter",
-                "bandwidth": [{"bw": 100, "bwscale": "Mb"}],
-                "mask": "srcaddress",
-                "maskbits": 31,
-                "description": "E2E test",
-                "aqm": "codel",
-                "sched": "fq_pie",
-                "qlimit": 7000,
-                "delay": 1,
-                "plr": 0.01,
-                "buckets": 16,
-                "ecn": True,
-                "apply": True
-            }
-        },
         {
             "name": "Create firewall traffic shaper limiter queue",
             "req_data": {
@@ -759,13 +742,6 @@ class APIE2ETestFirewallTrafficShaperLimiterQueue(e2e_test_framework.APIE2ETest)
                 "limiter": "Test_Limiter",
                 "name": "INVALID"
             }
-        },
-        {
-            "name": "Delete parent limiter",
-            "uri": "/api/v1/firewall/traffic_shaper/limiter",
-            "req_data": {
-                "name": "Test_Limiter",
-            }
         }
     ]
 
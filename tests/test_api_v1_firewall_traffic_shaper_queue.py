@@ -18,25 +18,13 @@ import e2e_test_framework
 class APIE2ETestFirewallTrafficShaperQueue(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/traffic_shaper/queue endpoint."""
     uri = "/api/v1/firewall/traffic_shaper/queue"
+    resources = ["config", "traffic-shaper"]
+    fixtures = ["lan PRIQ shaper"]    # The scheduler of this parent shaper is changed by the POST tests
 
     post_privileges = ["page-all", "page-firewall-trafficshaper-queues"]
     delete_privileges = ["page-all", "page-firewall-trafficshaper-queues"]
 
     post_tests = [
-        {
-            "name": "Create PRIQ parent traffic shaper",
-            "uri": "/api/v1/firewall/traffic_shaper",
-            "req_data": {
-                "interface": "lan",
-                "scheduler": "PRIQ",
-                "bandwidthtype": "Gb",
-                "bandwidth": 1,
-                "enabled": True,
-                "qlimit": 1000,
-                "tbrconfig": 1000,
-                "apply": True
-            }
-        },
         {
             "name": "Create traffic shaper queue",
             "req_data": {
@@ -467,15 +455,7 @@ class APIE2ETestFirewallTrafficShaperQueue(e2e_test_framework.APIE2ETest):
                 "interface": "lan",
                 "name": "INVALID"
             }
-        },
-        {
-            "name": "Delete parent traffic shaper",
-            "uri": "/api/v1/firewall/traffic_shaper",
-            "req_data": {
-                "interface": "lan",
-                "apply": True
-            }
-        },
+        }
     ]
 
 
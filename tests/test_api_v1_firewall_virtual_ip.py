@@ -43,6 +43,8 @@ PROXYARP_SUBNET_UPDATE = "172.16.10.100/32"
 class APIE2ETestFirewallVirtualIP(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/firewall/virtual_ip endpoint."""
     uri = "/api/v1/firewall/virtual_ip"
+    resources = ["config", "interfaces"]
+    saved_ifconfig = None
 
     get_privileges = ["page-all", "page-firewall-virtualipaddresses"]
     post_privileges = ["page-all", "page-firewall-virtualipaddress-edit"]
@@ -91,6 +93,7 @@ class APIE2ETestFirewallVirtualIP(e2e_test_framework.APIE2ETest):
         },
         {
             "name": "Create IP Alias virtual IP",
+            "pre_test_callable": "save_ifconfig",
             "post_test_callable": "is_ipalias_created",
             "req_data": {
                 "mode": "ipalias",
@@ -415,6 +418,10 @@ class APIE2ETestFirewallVirtualIP(e2e_test_framework.APIE2ETest):
         }
     ]
 
+    def save_ifconfig(self):
+        """Saves the ifconfig snapshot before a test so the addresses it changes can be checked afterwards"""
+        self.saved_ifconfig = self.ifconfig()
+
     def is_carp_created(self):
         """Checks if our CARP is present after creating a CARP VIP"""
         # Local variables
@@ -425,19 +432,19 @@ class APIE2ETestFirewallVirtualIP(e2e_test_framework.APIE2ETest):
         carp_vhid = CARP_VHID_CREATE
         carp_advbase = CARP_ADVBASE_CREATE
         carp_advskew = CARP_ADVSKEW_CREATE
-        ifconfig_carp_line = f"vhid {carp_vhid} advbase {carp_advbase} advskew {carp_advskew}"
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
         # Check that the CARP VIP created in the test is correctly represented in ifconfig
-        if not is_if_in_ifconfig(ifconfig_out, carp_interface, carp_ip, carp_bitmask, carp_vhid):
+        if not is_if_in_ifconfig(ifconfig, carp_interface, carp_ip, carp_bitmask, carp_vhid):
             raise AssertionError(
-                f"Expected CARP VIP '{carp_subnet}' with VHID {carp_vhid} to exist, got: {ifconfig_out}"
+                f"Expected CARP VIP '{carp_subnet}' with VHID {carp_vhid} to exist, got {ifconfig.ifconfig_out}"
             )
 
         # Check that the CARP advbase and advskew are correctly represented in ifconfig
-        if ifconfig_carp_line not in ifconfig_out:
+        if (carp_vhid, carp_advbase, carp_advskew) not in ifconfig.carp.get(carp_interface, set()):
             raise AssertionError(
-                f"Expected '{ifconfig_carp_line}' in ifconfig for interface {carp_interface}, got {ifconfig_out}"
+                f"Expected 'vhid {carp_vhid} advbase {carp_advbase} advskew {carp_advskew}' in ifconfig for "
+                f"interface {carp_interface}, got {ifconfig.ifconfig_out}"
             )
 
     def is_carp_updated(self):
@@ -451,25 +458,26 @@ class APIE2ETestFirewallVirtualIP(e2e_test_framework.APIE2ETest):
         carp_vhid = CARP_VHID_UPDATE
         carp_advbase = CARP_ADVBASE_UPDATE
         carp_advskew = CARP_ADVSKEW_UPDATE
-        ifconfig_carp_line = f"vhid {carp_vhid} advbase {carp_advbase} advskew {carp_advskew}"
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
         # Check that the CARP VIP created in the test is correctly represented in ifconfig
-        if not is_if_in_ifconfig(ifconfig_out, carp_interface, carp_ip, carp_bitmask, carp_vhid):
+        if not is_if_in_ifconfig(ifconfig, carp_interface, carp_ip, carp_bitmask, carp_vhid):
             raise AssertionError(
-                f"Expected CARP VIP '{carp_subnet}' with VHID {carp_vhid} to exist, got {ifconfig_out}"
+                f"Expected CARP VIP '{carp_subnet}' with VHID {carp_vhid} to exist, got {ifconfig.ifconfig_out}"
             )
 
         # Check that the CARP advbase and advskew are correctly represented in ifconfig
-        if ifconfig_carp_line not in ifconfig_out:
+        if (carp_vhid, carp_advbase, carp_advskew) not in ifconfig.carp.get(carp_interface, set()):
             raise AssertionError(
-                f"Expected '{ifconfig_carp_line}' in ifconfig for interface {carp_interface}, got {ifconfig_out}"
+                f"Expected 'vhid {carp_vhid} advbase {carp_advbase} advskew {carp_advskew}' in ifconfig for "
+                f"interface {carp_interface}, got {ifconfig.ifconfig_out}"
             )
 
         # Check that the previous CARP IP is no longer present
-        if carp_ip_prev in ifconfig_out:
+        if ifconfig.has_ip(carp_ip_prev):
             raise AssertionError(
-                f"Expected previous CARP IP '{carp_ip_prev}' to no longer exist in ifconfig, got {ifconfig_out}"
+                f"Expected previous CARP IP '{carp_ip_prev}' to no longer exist in ifconfig, "
+                f"got {ifconfig.ifconfig_out}"
             )
 
     def is_carp_deleted(self):
@@ -477,11 +485,12 @@ class APIE2ETestFirewallVirtualIP(e2e_test_framework.APIE2ETest):
         # Local variables
         carp_ip = CARP_SUBNET_UPDATE.split("/", maxsplit=1)[0]
         carp_vhid = CARP_VHID_UPDATE
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
-        if carp_ip in ifconfig_out or f"vhid {carp_vhid}" in ifconfig_out:
+        if ifconfig.has_ip(carp_ip) or ifconfig.has_vhid(carp_vhid):
             raise AssertionError(
-                f"Expected CARP VIP '{carp_ip}' with VHID {carp_vhid} to be deleted in ifconfig, got {ifconfig_out}"
+                f"Expected CARP VIP '{carp_ip}' with VHID {carp_vhid} to be deleted in ifconfig, "
+                f"got {ifconfig.ifconfig_out}"
             )
 
     def is_ipalias_created(self):
@@ -491,11 +500,14 @@ class APIE2ETestFirewallVirtualIP(e2e_test_framework.APIE2ETest):
         ipalias_ip = ipalias_subnet.split("/")[0]
         ipalias_bitmask = int(ipalias_subnet.split("/")[1])
         ipalias_interface = IPALIAS_INTERFACE_CREATE
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
-        # Check that the IPALIAS VIP created in the test is correctly represented in ifconfig
-        if not is_if_in_ifconfig(ifconfig_out, ipalias_interface, ipalias_ip, ipalias_bitmask):
-            raise AssertionError(f"Expected IPALIAS VIP '{ipalias_subnet}' to exist, got {ifconfig_out}")
+        # Check that the IPALIAS VIP created in the test is the only address added to ifconfig
+        added, removed = self.saved_ifconfig.diff(ifconfig)
+        if added != {(ipalias_interface, "inet", ipalias_ip, ipalias_bitmask, None)} or removed:
+            raise AssertionError(
+                f"Expected only IPALIAS VIP '{ipalias_subnet}' to be added, added {added} and removed {removed}"
+            )
 
     def is_ipalias_updated(self):
         """Checks if our IPALIAS is present after creating an IPALIAS VIP"""
@@ -505,26 +517,29 @@ class APIE2ETestFirewallVirtualIP(e2e_test_framework.APIE2ETest):
         ipalias_ip_prev = IPALIAS_SUBNET_CREATE.split("/")[0]
         ipalias_bitmask = int(ipalias_subnet.split("/")[1])
         ipalias_interface = IPALIAS_INTERFACE_UPDATE
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
         # Check that the IPALIAS VIP created in the test is correctly represented in ifconfig
-        if not is_if_in_ifconfig(ifconfig_out, ipalias_interface, ipalias_ip, ipalias_bitmask):
-            raise AssertionError(f"Expected IPALIAS VIP '{ipalias_subnet}' to exist, got {ifconfig_out}")
+        if not is_if_in_ifconfig(ifconfig, ipalias_interface, ipalias_ip, ipalias_bitmask):
+            raise AssertionError(f"Expected IPALIAS VIP '{ipalias_subnet}' to exist, got {ifconfig.ifconfig_out}")
 
         # Check that the previous IPALIAS IP is no longer present
-        if ipalias_ip_prev in ifconfig_out:
+        if ifconfig.has_ip(ipalias_ip_prev):
             raise AssertionError(
-                f"Expected previous IPALIAS IP '{ipalias_ip_prev}' to no longer exist in ifconfig, got {ifconfig_out}"
+                f"Expected previous IPALIAS IP '{ipalias_ip_prev}' to no longer exist in ifconfig, "
+                f"got {ifconfig.ifconfig_out}"
             )
 
     def is_ipalias_deleted(self):
         """Checks if our IPALIAS is no longer present after deleting an IPALIAS VIP"""
         # Local variables
         ipalias_ip = IPALIAS_SUBNET_UPDATE.split("/", maxsplit=1)[0]
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
-        if ipalias_ip in ifconfig_out:
-            raise AssertionError(f"Expected IPALIAS VIP '{ipalias_ip}' to be deleted in ifconfig, got {ifconfig_out}")
+        if ifconfig.has_ip(ipalias_ip):
+            raise AssertionError(
+                f"Expected IPALIAS VIP '{ipalias_ip}' to be deleted in ifconfig, got {ifconfig.ifconfig_out}"
+            )
 
     def is_proxyarp_created(self):
         """Checks if our proxyarp IP is present after creating a proxyarp VIP"""
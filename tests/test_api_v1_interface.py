@@ -44,6 +44,7 @@ VLAN_STATICV4_SUBNET_UPDATE = random.randint(24, 30)
 class APIE2ETestInterface(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/interface endpoint."""
     uri = "/api/v1/interface"
+    resources = ["config", "interfaces"]
 
     get_privileges = ["page-all", "page-interfaces-assignnetworkports"]
     post_privileges = ["page-all", "page-interfaces-assignnetworkports"]
@@ -598,9 +599,10 @@ class APIE2ETestInterface(e2e_test_framework.APIE2ETest):
             "name": "Apply interfaces",
             "method": "POST",
             "uri": "/api/v1/interface/apply",
-            "req_data": {"aysnc": False},
-            "resp_time": 30,
-            "resp_data_empty": True,
+            "status": 202,
+            "return": 14,
+            "req_data": {"async": True},
+            "wait_for_job": True,
             "post_test_callable": "are_ifs_created"
         }
     ]
@@ -656,9 +658,10 @@ class APIE2ETestInterface(e2e_test_framework.APIE2ETest):
             "name": "Apply interfaces",
             "method": "POST",
             "uri": "/api/v1/interface/apply",
-            "req_data": {"aysnc": False},
-            "resp_time": 30,
-            "resp_data_empty": True,
+            "status": 202,
+            "return": 14,
+            "req_data": {"async": True},
+            "wait_for_job": True,
             "post_test_callable": "are_ifs_updated"
         }
     ]
@@ -718,22 +721,22 @@ class APIE2ETestInterface(e2e_test_framework.APIE2ETest):
     def are_ifs_created(self):
         """Checks if the interfaces created in the POST tests are present after being applied."""
         # Local variables
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
         # Ensure static interface exists with IPv4 address
-        if not is_if_in_ifconfig(ifconfig_out, IF_ID, IF_STATICV4_IPADDR_CREATE, IF_STATICV4_SUBNET_CREATE):
+        if not is_if_in_ifconfig(ifconfig, IF_ID, IF_STATICV4_IPADDR_CREATE, IF_STATICV4_SUBNET_CREATE):
             raise AssertionError(f"Expected interface with static IPv4 '{IF_STATICV4_IPADDR_CREATE}'")
 
         # Ensure static interface exists with IPv6 address
-        if not is_if_in_ifconfig(ifconfig_out, IF_ID, IF_STATICV6_IPADDR_CREATE, IF_STATICV6_SUBNET_CREATE):
+        if not is_if_in_ifconfig(ifconfig, IF_ID, IF_STATICV6_IPADDR_CREATE, IF_STATICV6_SUBNET_CREATE):
             raise AssertionError(f"Expected interface with static IPv6 '{IF_STATICV6_IPADDR_CREATE}'")
 
         # Ensure bridged interface exists with IPv4 address
-        if not is_if_in_ifconfig(ifconfig_out, "bridge0", BR_STATICV4_IPADDR_CREATE, BR_STATICV4_SUBNET_CREATE):
+        if not is_if_in_ifconfig(ifconfig, "bridge0", BR_STATICV4_IPADDR_CREATE, BR_STATICV4_SUBNET_CREATE):
             raise AssertionError(f"Expected bridge interface with static IPv4 '{BR_STATICV4_IPADDR_CREATE}'")
 
         # Ensure VLAN interface exists with IPv4 address
-        if not is_if_in_ifconfig(ifconfig_out, VLAN_IF, VLAN_STATICV4_IPADDR_CREATE, VLAN_STATICV4_SUBNET_CREATE):
+        if not is_if_in_ifconfig(ifconfig, VLAN_IF, VLAN_STATICV4_IPADDR_CREATE, VLAN_STATICV4_SUBNET_CREATE):
             raise AssertionError(f"Expected VLAN interface with static IPv4 '{VLAN_STATICV4_IPADDR_CREATE}'")
 
     def are_ifs_updated(self):
@@ -742,70 +745,66 @@ class APIE2ETestInterface(e2e_test_framework.APIE2ETest):
         no longer used.
         """
         # Local variables
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
         # Ensure static interface exists with updated IPv4 address
-        if not is_if_in_ifconfig(ifconfig_out, IF_ID, IF_STATICV4_IPADDR_UPDATE, IF_STATICV4_SUBNET_UPDATE):
+        if not is_if_in_ifconfig(ifconfig, IF_ID, IF_STATICV4_IPADDR_UPDATE, IF_STATICV4_SUBNET_UPDATE):
             raise AssertionError(f"Expected interface with static IPv4 '{IF_STATICV4_IPADDR_UPDATE}'")
 
         # Ensure old IP is no longer present
-        if is_if_in_ifconfig(ifconfig_out, IF_ID, IF_STATICV4_IPADDR_CREATE, IF_STATICV4_SUBNET_CREATE):
+        if is_if_in_ifconfig(ifconfig, IF_ID, IF_STATICV4_IPADDR_CREATE, IF_STATICV4_SUBNET_CREATE):
             raise AssertionError(f"Interface is still using old static IPv4 '{IF_STATICV4_IPADDR_CREATE}'")
 
         # Ensure static interface exists with updated IPv6 address
-        if not is_if_in_ifconfig(ifconfig_out, IF_ID, IF_STATICV6_IPADDR_UPDATE, IF_STATICV6_SUBNET_UPDATE):
+        if not is_if_in_ifconfig(ifconfig, IF_ID, IF_STATICV6_IPADDR_UPDATE, IF_STATICV6_SUBNET_UPDATE):
             raise AssertionError(f"Expected interface with static IPv6 '{IF_STATICV6_IPADDR_UPDATE}'")
 
         # Ensure old IPv6 is no longer present
-        if is_if_in_ifconfig(ifconfig_out, IF_ID, IF_STATICV6_IPADDR_CREATE, IF_STATICV6_SUBNET_CREATE):
+        if is_if_in_ifconfig(ifconfig, IF_ID, IF_STATICV6_IPADDR_CREATE, IF_STATICV6_SUBNET_CREATE):
             raise AssertionError(f"Interface is still using old static IPv6 '{IF_STATICV6_IPADDR_CREATE}'")
 
         # Ensure bridged interface exists with IPv4 address
-        if not is_if_in_ifconfig(ifconfig_out, "bridge0", BR_STATICV4_IPADDR_UPDATE, BR_STATICV4_SUBNET_UPDATE):
+        if not is_if_in_ifconfig(ifconfig, "bridge0", BR_STATICV4_IPADDR_UPDATE, BR_STATICV4_SUBNET_UPDATE):
             raise AssertionError(f"Expected bridge interface with static IPv4 '{BR_STATICV4_IPADDR_UPDATE}'")
 
         # Ensure old bridge IP is no longer present
-        if is_if_in_ifconfig(ifconfig_out, "bridge0", BR_STATICV4_IPADDR_CREATE, BR_STATICV4_SUBNET_CREATE):
+        if is_if_in_ifconfig(ifconfig, "bridge0", BR_STATICV4_IPADDR_CREATE, BR_STATICV4_SUBNET_CREATE):
             raise AssertionError(f"Bridge is still using old static IPv4 '{BR_STATICV4_IPADDR_CREATE}'")
 
         # Ensure VLAN interface exists with IPv4 address
-        if not is_if_in_ifconfig(ifconfig_out, VLAN_IF, VLAN_STATICV4_IPADDR_UPDATE, VLAN_STATICV4_SUBNET_UPDATE):
+        if not is_if_in_ifconfig(ifconfig, VLAN_IF, VLAN_STATICV4_IPADDR_UPDATE, VLAN_STATICV4_SUBNET_UPDATE):
             raise AssertionError(f"Expected VLAN interface with static IPv4 '{VLAN_STATICV4_IPADDR_UPDATE}'")
 
         # Ensure old VLAN IP is no longer present
-        if is_if_in_ifconfig(ifconfig_out, VLAN_IF, VLAN_STATICV4_IPADDR_CREATE, VLAN_STATICV4_SUBNET_CREATE):
+        if is_if_in_ifconfig(ifconfig, VLAN_IF, VLAN_STATICV4_IPADDR_CREATE, VLAN_STATICV4_SUBNET_CREATE):
             raise AssertionError(f"VLAN is still using old static IPv4 '{VLAN_STATICV4_IPADDR_CREATE}'")
 
     def are_ifs_deleted(self):
         """Checks if the interfaces deleted in the DELETE tests are no longer present"""
         # Local variables
-        ifconfig_out = self.pfsense_shell("ifconfig")
+        ifconfig = self.ifconfig()
 
         # Ensure staticv4 interface no longer exists
-        if is_if_in_ifconfig(ifconfig_out, IF_ID, IF_STATICV4_IPADDR_UPDATE, IF_STATICV4_SUBNET_UPDATE):
+        if is_if_in_ifconfig(ifconfig, IF_ID, IF_STATICV4_IPADDR_UPDATE, IF_STATICV4_SUBNET_UPDATE):
             raise AssertionError(f"Expected interface with IP '{IF_STATICV4_IPADDR_UPDATE}' to be deleted")
 
         # Ensure staticv6 interface no longer exists
-        if is_if_in_ifconfig(ifconfig_out, IF_ID, IF_STATICV6_IPADDR_UPDATE, IF_STATICV6_SUBNET_UPDATE):
+        if is_if_in_ifconfig(ifconfig, IF_ID, IF_STATICV6_IPADDR_UPDATE, IF_STATICV6_SUBNET_UPDATE):
             raise AssertionError(f"Expected interface with IP '{IF_STATICV6_IPADDR_UPDATE}' to be deleted")
 
         # Ensure bridge interface no longer exists
-        if is_if_in_ifconfig(ifconfig_out, "bridge0", BR_STATICV4_IPADDR_UPDATE, BR_STATICV4_SUBNET_UPDATE):
+        if is_if_in_ifconfig(ifconfig, "bridge0", BR_STATICV4_IPADDR_UPDATE, BR_STATICV4_SUBNET_UPDATE):
             raise AssertionError(f"Expected bridge with IP '{BR_STATICV4_IPADDR_UPDATE}' to be deleted")
 
         # Ensure vlan interface no longer exists
-        if is_if_in_ifconfig(ifconfig_out, VLAN_IF, VLAN_STATICV4_IPADDR_UPDATE, VLAN_STATICV4_SUBNET_UPDATE):
+        if is_if_in_ifconfig(ifconfig, VLAN_IF, VLAN_STATICV4_IPADDR_UPDATE, VLAN_STATICV4_SUBNET_UPDATE):
             raise AssertionError(f"Expected VLAN IP '{VLAN_STATICV4_IPADDR_UPDATE}' to be deleted")
 
     def is_if_disabled(self):
         """Checks if the interface updated to be disabled is no longer up."""
-        # Local variables
-        ifconfig_lines = self.pfsense_shell("ifconfig").split("\n")
-
-        # Loop through each line and check if em2.2 is now disabled
-        for line in ifconfig_lines:
-            if line.startswith(f"{VLAN_IF}:") and "UP" in line:
-                raise AssertionError(f"Expected {VLAN_IF} to be disabled and not UP")
+        # Check if em2.2 is now disabled
+        if "UP" in self.ifconfig().flags.get(VLAN_IF, set()):
+            raise AssertionError(f"Expected {VLAN_IF} to be disabled and not UP")
 
 
 APIE2ETestInterface()
@@ -23,6 +23,7 @@ BR_MEMBER_IF_UPDATE = "em2"
 class APIE2ETestInterfaceBridge(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/interface/bridge endpoint."""
     uri = "/api/v1/interface/bridge"
+    resources = ["config", "interfaces"]
 
     get_privileges = ["page-all", "page-interfaces-bridge", "page-interfaces-bridge-edit"]
     post_privileges = ["page-all", "page-interfaces-bridge-edit"]
@@ -36,6 +36,7 @@ VLAN_IF_DUP = f"{PARENT_IF_DUP}.{VLAN_TAG_DUP}"
 class APIE2ETestInterfaceVLAN(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/interface/vlan endpoint."""
     uri = "/api/v1/interface/vlan"
+    resources = ["config", "interfaces"]
 
     get_privileges = ["page-all", "page-interfaces-vlan", "page-interfaces-vlan-edit"]
     post_privileges = ["page-all", "page-interfaces-vlan-edit"]
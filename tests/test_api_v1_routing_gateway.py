@@ -26,6 +26,7 @@ EXTRA_IF_SUBNETV6 = 64
 class APIE2ETestRoutingGateway(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/routing/gateway endpoint."""
     uri = "/api/v1/routing/gateway"
+    resources = ["config", "interfaces"]
 
     get_privileges = ["page-all", "page-system-gateways"]
     post_privileges = ["page-all", "page-system-gateways-editgateway"]
@@ -0,0 +1,36 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Script used to test bulk requests to the /api/v1/services/dhcpd/static_mapping endpoint."""
+import e2e_test_framework
+
+
+class APIE2ETestServicesDHCPdStaticMappingBulk(e2e_test_framework.APIE2EBulkTest):
+    """Class used to test bulk requests to the /api/v1/services/dhcpd/static_mapping endpoint."""
+    uri = "/api/v1/services/dhcpd/static_mapping"
+    post_privileges = ["page-all", "page-services-dhcpserver-editstaticmapping"]
+    put_privileges = ["page-all", "page-services-dhcpserver-editstaticmapping"]
+    delete_privileges = ["page-all", "page-services-dhcpserver-editstaticmapping"]
+    bulk_name = "DHCPd static mappings"
+    bulk_fields = {"interface": "lan"}
+    bulk_payloads = [
+        {"mac": "ac:de:48:00:22:00", "ipaddr": "192.168.1.240"},
+        {"mac": "ac:de:48:00:22:01", "ipaddr": "192.168.1.241"},
+        {"mac": "ac:de:48:00:22:02", "ipaddr": "192.168.1.242"}
+    ]
+    bulk_invalid_payload = {"interface": "INVALID", "mac": "ac:de:48:00:22:01"}
+    bulk_invalid_return = 2018
+    bulk_resp_time = 12    # Allow a few seconds to reload the DHCP service
+
+
+APIE2ETestServicesDHCPdStaticMappingBulk()
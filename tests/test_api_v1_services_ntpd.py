@@ -94,8 +94,9 @@ class APIE2ETestServicesNTPd(e2e_test_framework.APIE2ETest):
         # pylint: disable=too-many-branches
 
         # Local variables
-        ntp_conf = self.pfsense_shell("cat /var/etc/ntpd.conf")
-        leap_conf = self.pfsense_shell("cat /var/db/leap-seconds")
+        cmd_outputs = self.pfsense_shell_batch(["cat /var/etc/ntpd.conf", "cat /var/db/leap-seconds"])
+        ntp_conf = cmd_outputs["cat /var/etc/ntpd.conf"]
+        leap_conf = cmd_outputs["cat /var/db/leap-seconds"]
         req_data = self.last_request.get("req_data", {})
 
         # Ensure each interface is present in the NTP configuration
@@ -26,6 +26,7 @@ a28e7bdbf1743527346bda359bc92fc9 \
 class APIE2ETestOpenVPNClient(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/services/openvpn/client endpoint."""
     uri = "/api/v1/services/openvpn/client"
+    resources = ["config", "interfaces"]
 
     get_privileges = ["page-all", "page-openvpn-client"]
     post_privileges = ["page-all", "page-openvpn-client"]
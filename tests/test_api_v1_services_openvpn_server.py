@@ -26,6 +26,7 @@ a28e7bdbf1743527346bda359bc92fc9 \
 class APIE2ETestOpenVPNServer(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/services/openvpn/server endpoint."""
     uri = "/api/v1/services/openvpn/server"
+    resources = ["config", "interfaces"]
 
     get_tests = [{"name": "Read all OpenVPN Server instances"}]
     post_tests = [
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Class used to test the /api/v1/services/service_watchdog endpoint."""
-import time
-
 import e2e_test_framework
 
 
@@ -81,28 +79,17 @@ class APIE2ETestServicesServiceWatchdog(e2e_test_framework.APIE2ETest):
 
     def is_unbound_restarted(self):
         """Checks if the unbound service was restarted by service watchdog"""
-        # Local variables
-        unbound_running = False
-
         # First, kill the unbound process
         self.pfsense_shell("pkill unbound")
 
-        # Check up to 90 times, service watchdog only runs every minute by default
-        for _ in range(0, 90):
-            # Check active processes
-            unbound_processes = self.pfsense_shell("ps aux | grep /usr/local/sbin/unbound")
-
-            # Check if the main unbound process is running
-            if "/usr/local/sbin/unbound -c /var/unbound/unbound.conf" in unbound_processes:
-                unbound_running = True
-                break
-
-            # Wait 1 second before retrying
-            time.sleep(1)
-
-        # Raise an error if unbound wasn't running by the end of the loop
-        if not unbound_running:
+        # Check for up to 90 seconds, service watchdog only runs every minute by default
+        if not self.wait_until(self.is_unbound_running, 90):
             raise AssertionError("Expected Service Watchdog to restart Unbound service")
 
+    def is_unbound_running(self):
+        """Checks if the main unbound process is running"""
+        unbound_processes = self.pfsense_shell("ps aux | grep /usr/local/sbin/unbound")
+        return "/usr/local/sbin/unbound -c /var/unbound/unbound.conf" in unbound_processes
+
 
 APIE2ETestServicesServiceWatchdog()
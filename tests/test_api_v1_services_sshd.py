@@ -37,7 +37,8 @@ class APIE2ETestServicesSSHd(e2e_test_framework.APIE2ETest):
         {
             "name": "Update SSHD",
             "post_test_callable": "is_sshd_set_test_1",
-            "pause": 3,    # Wait a bit for ssh to restart
+            "pause": 15,    # Wait up to 15 seconds for ssh to restart
+            "pause_until": "is_sshd_set_test_1",
             "req_data": {
                 "enable": True,
                 "sshdkeyonly": SSH_KEYONLY_TEST_1,
@@ -48,7 +49,8 @@ class APIE2ETestServicesSSHd(e2e_test_framework.APIE2ETest):
         {
             "name": "Disable SSHd",
             "post_test_callable": "is_ssh_disabled",
-            "pause": 3,  # Wait a bit for ssh to restart
+            "pause": 15,    # Wait up to 15 seconds for ssh to stop
+            "pause_until": "is_ssh_disabled",
             "req_data": {
                 "enable": False
             }
@@ -56,7 +58,8 @@ class APIE2ETestServicesSSHd(e2e_test_framework.APIE2ETest):
         {
             "name": "Update and re-enable SSHD",
             "post_test_callable": "is_sshd_set_test_2",
-            "pause": 3,  # Wait a bit for ssh to restart
+            "pause": 15,    # Wait up to 15 seconds for ssh to restart
+            "pause_until": "is_sshd_set_test_2",
             "req_data": {
                 "enable": True,
                 "sshdkeyonly": SSH_KEYONLY_TEST_2,
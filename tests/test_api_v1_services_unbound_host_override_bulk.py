@@ -0,0 +1,36 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Script used to test bulk requests to the /api/v1/services/unbound/host_override endpoint."""
+import e2e_test_framework
+
+
+class APIE2ETestServicesUnboundHostOverrideBulk(e2e_test_framework.APIE2EBulkTest):
+    """Class used to test bulk requests to the /api/v1/services/unbound/host_override endpoint."""
+    uri = "/api/v1/services/unbound/host_override"
+    post_privileges = ["page-all", "page-services-dnsresolver-edithost"]
+    put_privileges = ["page-all", "page-services-dnsresolver-edithost"]
+    delete_privileges = ["page-all", "page-services-dnsresolver-edithost"]
+    bulk_name = "host overrides"
+    bulk_payloads = [
+        {"host": "e2e-bulk-0", "domain": "example.com", "ip": ["127.0.0.1"]},
+        {"host": "e2e-bulk-1", "domain": "example.com", "ip": ["127.0.0.2"]},
+        {"host": "e2e-bulk-2", "domain": "example.com", "ip": ["127.0.0.3"]}
+    ]
+    bulk_invalid_payload = {"domain": "example.com", "ip": ["127.0.0.1"]}
+    bulk_invalid_return = 2004
+    bulk_apply = True
+    bulk_resp_time = 5    # Allow a few seconds for Unbound to reload
+
+
+APIE2ETestServicesUnboundHostOverrideBulk()
@@ -18,6 +18,7 @@ import e2e_test_framework
 class APIE2ETestStatusGateway(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/status/gateway endpoint."""
     uri = "/api/v1/status/gateway"
+    resources = ["read-only"]
     get_privileges = ["page-all", "page-status-gateways"]
     get_tests = [{"name": "Read routing gateway statuses"}]
 
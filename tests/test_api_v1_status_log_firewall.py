@@ -18,8 +18,86 @@ import e2e_test_framework
 class APIE2ETestStatusLogFirewall(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/status/log/firewall endpoint."""
     uri = "/api/v1/status/log/firewall"
+    resources = ["read-only"]
     get_privileges = ["page-all", "page-diagnostics-logs-firewall"]
-    get_tests = [{"name": "Read the firewall log"}]
+    get_tests = [
+        {
+            "name": "Read the firewall log",
+            "post_test_callable": "is_log_default_bounded"
+        },
+        {
+            "name": "Read the last 10 firewall log entries",
+            "req_data": {"tail": 10},
+            "post_test_callable": "is_log_bounded"
+        },
+        {
+            "name": "Read a page of firewall log entries",
+            "req_data": {"offset": 5, "limit": 10},
+            "post_test_callable": "is_log_bounded"
+        },
+        {
+            "name": "Read new firewall log entries using the previous cursor",
+            "req_data_callable": "get_cursor_req_data",
+            "post_test_callable": "is_log_bounded"
+        },
+        {
+            "name": "Check offset minimum constraint",
+            "status": 400,
+            "return": 8009,
+            "req_data": {"offset": -1}
+        },
+        {
+            "name": "Check limit minimum constraint",
+            "status": 400,
+            "return": 8010,
+            "req_data": {"limit": 0}
+        },
+        {
+            "name": "Check tail numeric constraint",
+            "status": 400,
+            "return": 8011,
+            "req_data": {"tail": "INVALID"}
+        },
+        {
+            "name": "Check cursor minimum constraint",
+            "status": 400,
+            "return": 8012,
+            "req_data": {"cursor": -1}
+        },
+        {
+            "name": "Check tail cannot be combined with offset",
+            "status": 400,
+            "return": 8013,
+            "req_data": {"tail": 10, "offset": 5}
+        }
+    ]
+
+    def get_cursor_req_data(self):
+        """Builds request data that continues reading from the cursor of the previous response."""
+        return {"cursor": int(self.last_response_headers.get("X-API-Cursor", 0)), "limit": 10}
+
+    def check_log_bounds(self, limit):
+        """
+        Checks that a read returned a list of no more than a number of entries and a cursor to continue reading from.
+        :param limit: (int) the maximum number of entries the read may return
+        """
+        # Ensure the entries are returned as a list and no more than the limit were returned
+        if not isinstance(self.last_response.get("data"), list):
+            raise AssertionError("expected response data to be a list of log entries")
+        received = len(self.last_response["data"])
+        if received > limit:
+            raise AssertionError(f"expected no more than {limit} log entries, received {received}")
+        # Ensure a cursor was returned in the X-API-Cursor header
+        if not self.last_response_headers.get("X-API-Cursor", "").isdigit():
+            raise AssertionError("expected response to include an integer X-API-Cursor header")
+
+    def is_log_bounded(self):
+        """Checks that a paginated read returned no more than 10 entries and a cursor to continue reading from."""
+        self.check_log_bounds(10)
+
+    def is_log_default_bounded(self):
+        """Checks that a read without a limit returned no more than the default page size of 500 entries."""
+        self.check_log_bounds(500)
 
 
 APIE2ETestStatusLogFirewall()
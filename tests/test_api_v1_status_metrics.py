@@ -0,0 +1,230 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Script used to test the /api/v1/status/metrics endpoint."""
+import math
+import re
+import urllib.parse
+
+import e2e_test_framework
+
+# Constants
+METRIC_TYPES = ["counter", "gauge", "histogram", "summary", "untyped"]
+METRIC_SUFFIXES = ["_bucket", "_count", "_sum"]    # Samples histogram and summary families expose besides their own
+SAMPLE_REGEX = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?[ \t]+(\S+)(?:[ \t]+(-?[0-9]+))?$")
+LABEL_REGEX = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\\n]|\\[\\"n])*)"\s*(?:,|$)')
+COLLECTOR_FAMILIES = {
+    "system": ["pfsense_system_info", "pfsense_system_cpu_count", "pfsense_system_load_average"],
+    "gateway": [],    # Gateway, interface, CARP and OpenVPN families depend on the configuration
+    "interface": ["pfsense_interface_up", "pfsense_interface_receive_bytes_total"],
+    "carp": ["pfsense_carp_enabled", "pfsense_carp_maintenance_mode"],
+    "openvpn": []
+}
+
+
+def unescape_label(escape):
+    """
+    Unescapes an escape sequence in a label value.
+    :param escape: (re.Match) the matched escape sequence
+    :return: (str) the escaped character
+    """
+    return "\n" if escape.group(1) == "n" else escape.group(1)
+
+
+def parse_labels(labels):
+    """
+    Parses the label set of a sample in the Prometheus text exposition format.
+    :param labels: (str) the labels between the sample's curly braces
+    :return: (dict) the label names mapped to their unescaped values
+    """
+    # Local variables
+    parsed = {}
+    position = 0
+
+    # Parse each label in order, every character must belong to a label
+    while position < len(labels):
+        match = LABEL_REGEX.match(labels, position)
+        if not match or match.group(1) in parsed:
+            raise AssertionError(f"Invalid or duplicate label at '{labels[position:]}'")
+        parsed[match.group(1)] = re.sub(r"\\(.)", unescape_label, match.group(2))
+        position = match.end()
+
+    return parsed
+
+
+def parse_exposition(text):
+    """
+    Parses and validates metrics in the Prometheus text exposition format (version 0.0.4).
+    :param text: (str) the metrics to parse
+    :return: (dict) each metric family's name mapped to its type, help text and samples
+    """
+    # Local variables
+    families = {}
+    series = set()
+
+    for line in text.splitlines():
+        # Blank lines are ignored
+        if not line.strip():
+            continue
+
+        # Metadata lines must precede the family's samples and may only appear once per family
+        if line.startswith("#"):
+            fields = line.split(None, 3)
+            if len(fields) >= 3 and fields[1] in ["HELP", "TYPE"]:
+                family = families.setdefault(fields[2], {"type": None, "help": None, "samples": []})
+                key = fields[1].lower()
+                if family[key] is not None or family["samples"]:
+                    raise AssertionError(f"Unexpected {fields[1]} line for metric family '{fields[2]}'")
+                family[key] = fields[3] if len(fields) == 4 else ""
+                if key == "type" and family["type"] not in METRIC_TYPES:
+                    raise AssertionError(f"Unknown type '{family['type']}' for metric family '{fields[2]}'")
+            continue
+
+        # Samples must be well-formed and belong to a family with a declared type
+        match = SAMPLE_REGEX.match(line)
+        if not match:
+            raise AssertionError(f"Invalid sample line '{line}'")
+        name, labels, value = match.group(1), parse_labels(match.group(2) or ""), float(match.group(3))
+        family_name = next(
+            (name[:-len(sfx)] for sfx in METRIC_SUFFIXES if name.endswith(sfx) and name[:-len(sfx)] in families), name
+        )
+        if families.get(family_name, {}).get("type") is None:
+            raise AssertionError(f"Sample '{name}' does not belong to a metric family with a TYPE line")
+
+        # Each series must only be exposed once and counters can never be negative
+        series_id = (name, tuple(sorted(labels.items())))
+        if series_id in series:
+            raise AssertionError(f"Duplicate series {series_id}")
+        if families[family_name]["type"] == "counter" and (value < 0 or math.isnan(value)):
+            raise AssertionError(f"Counter '{name}' has invalid value {value}")
+        series.add(series_id)
+        families[family_name]["samples"].append({"name": name, "labels": labels, "value": value})
+
+    return families
+
+
+class APIE2ETestStatusMetrics(e2e_test_framework.APIE2ETest):
+    """Class used to test the /api/v1/status/metrics endpoint."""
+    uri = "/api/v1/status/metrics"
+    resources = ["read-only"]
+    get_privileges = [
+        "page-all", "page-dashboard-widgets", "page-dashboard-all", "page-status-gateways", "page-status-interfaces",
+        "page-status-carp", "page-status-openvpn"
+    ]
+    get_tests = [
+        {
+            "name": "Check collectors known collector constraint",
+            "status": 400,
+            "return": 8015,
+            "req_data": {"collectors": "system,INVALID"}
+        },
+        {
+            "name": "Check max age minimum constraint",
+            "status": 400,
+            "return": 8016,
+            "req_data": {"max_age": -1}
+        },
+        {
+            "name": "Check max age maximum constraint",
+            "status": 400,
+            "return": 8016,
+            "req_data": {"max_age": 301}
+        }
+    ]
+
+    def custom_tests(self):
+        """Scrapes the metrics the way Prometheus does and validates the exposition output"""
+        self.run_scrape_test("Scrape every collector", {}, self.check_all_collectors)
+        self.run_scrape_test(
+            "Scrape only the allowed collectors", {"collectors": "system,carp"}, self.check_allowed_collectors
+        )
+        self.run_scrape_test(
+            "Scrape cached collector metrics", {"collectors": "system", "max_age": 300}, self.check_cached_collectors
+        )
+
+    def scrape(self, params):
+        """
+        Requests the metrics using query parameters, the same way Prometheus scrapes targets.
+        :param params: (dict) the query parameters to scrape with
+        :return: (dict) the metric families parsed from the response
+        """
+        # Use the test's authentication but send the parameters as a query string instead of a JSON body
+        request = self.__prepare_request__("GET", {})
+        request["url"] += f"?{urllib.parse.urlencode(params)}" if params else ""
+        request["data"] = None
+        resp = self.__send_request__(request)
+
+        # Ensure the metrics were returned in the Prometheus text exposition format
+        if resp is None or resp.status_code != 200:
+            raise AssertionError(f"Expected the metrics to be scraped, received {getattr(resp, 'content', None)}")
+        if not resp.headers.get("Content-Type", "").startswith("text/plain; version=0.0.4"):
+            raise AssertionError(f"Expected a Prometheus text response, received {resp.headers.get('Content-Type')}")
+        if resp.text and not resp.text.endswith("\n"):
+            raise AssertionError("Expected every line of the metrics, including the last, to end with a line feed")
+
+        return parse_exposition(resp.text)
+
+    def run_scrape_test(self, name, params, check):
+        """
+        Scrapes the metrics and checks the parsed metric families, printing the result like other tests.
+        :param name: (str) the name of the test
+        :param params: (dict) the query parameters to scrape with
+        :param check: (callable) the method that checks the parsed metric families
+        """
+        # pylint: disable=broad-except    # We don't want tests to exit and prevent later tests
+        test_params = {"name": name}
+        try:
+            check(self.scrape(params))
+            print(self.__format_msg__("GET", test_params, "Response is valid", mode="ok"))
+        except Exception as exc:
+            print(self.__format_msg__("GET", test_params, f"Invalid metrics exposition: {exc}"))
+            self.exit_code = 1
+
+    @staticmethod
+    def check_families(families, collectors):
+        """
+        Checks that every metric family belongs to one of the collectors and that the collectors' families are present.
+        :param families: (dict) the parsed metric families
+        :param collectors: (list) the collectors that were scraped
+        """
+        # Ensure only families of the scraped collectors were returned
+        prefixes = tuple(f"pfsense_{collector}_" for collector in collectors)
+        unexpected = [name for name in families if not name.startswith(prefixes)]
+        if unexpected:
+            raise AssertionError(f"Expected only metrics from collectors {collectors}, received {unexpected}")
+
+        # Ensure the families each collector always exposes were returned with samples
+        for collector in collectors:
+            for name in COLLECTOR_FAMILIES[collector]:
+                if not families.get(name, {}).get("samples"):
+                    raise AssertionError(f"Expected metric family '{name}' from collector '{collector}'")
+
+    def check_all_collectors(self, families):
+        """Checks that a scrape without parameters includes every collector"""
+        self.check_families(families, list(COLLECTOR_FAMILIES))
+        if len(families["pfsense_system_info"]["samples"]) != 1:
+            raise AssertionError("Expected a single pfsense_system_info sample")
+
+    def check_allowed_collectors(self, families):
+        """Checks that a scrape with a collector allowlist only includes the allowed collectors"""
+        self.check_families(families, ["system", "carp"])
+
+    def check_cached_collectors(self, families):
+        """Checks that a scrape accepting cached metrics returns the same metrics as the scrape that cached them"""
+        self.check_families(families, ["system"])
+        cached = self.scrape({"collectors": "system", "max_age": 300})
+        if cached["pfsense_system_load_average"] != families["pfsense_system_load_average"]:
+            raise AssertionError("Expected the cached system metrics to be returned")
+
+
+APIE2ETestStatusMetrics()
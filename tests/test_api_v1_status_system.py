@@ -15,16 +15,83 @@
 import e2e_test_framework
 
 
+# The metrics returned by the system status and the types each metric may have
+METRICS = {
+    "system_platform": (str,),
+    "system_serial": (str,),
+    "system_netgate_id": (str,),
+    "bios_vendor": (str,),
+    "bios_version": (str,),
+    "bios_date": (str,),
+    "cpu_model": (str,),
+    "kernel_pti": (bool,),
+    "mds_mitigation": (str,),
+    "temp_c": (float, int, type(None)),
+    "temp_f": (float, int, type(None)),
+    "load_avg": (list,),
+    "cpu_count": (int,),
+    "mbuf_usage": (float, int, type(None)),
+    "mem_usage": (float, int, type(None)),
+    "swap_usage": (float, int, type(None)),
+    "disk_usage": (float, int, type(None))
+}
+POLL_FIELDS = ["cpu_count", "load_avg", "mem_usage", "temp_c"]
+
+
 class APIE2ETestStatusSystem(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/status/system endpoint."""
     uri = "/api/v1/status/system"
+    resources = ["read-only"]
     get_privileges = ["page-all", "page-dashboard-widgets", "page-dashboard-all"]
     get_tests = [
         {
             "name": "Read the system status",
+            "post_test_callable": "is_status_complete",
             "resp_time": 8
+        },
+        {
+            "name": "Read the system status using cached static metrics",
+            "post_test_callable": "is_status_complete",
+            "resp_time": 3    # BIOS, serial, platform and CPU model are cached by the previous read
+        },
+        {
+            "name": "Read selected system status fields",
+            "req_data": {"fields": ",".join(POLL_FIELDS)},
+            "post_test_callable": "is_status_selected",
+            "resp_time": 2    # Only the selected metrics are gathered
+        },
+        {
+            "name": "Check fields known metric constraint",
+            "status": 400,
+            "return": 8014,
+            "req_data": {"fields": "cpu_count,INVALID"}
         }
     ]
 
+    def check_status_shape(self, fields):
+        """
+        Checks that the system status contains exactly the expected metrics and that each metric has a valid type.
+        :param fields: (list) the metrics the system status is expected to contain
+        """
+        # Local variables
+        status = self.last_response.get("data")
+
+        # Ensure exactly the expected metrics were returned
+        if not isinstance(status, dict) or sorted(status) != sorted(fields):
+            raise AssertionError(f"Expected system status metrics {sorted(fields)}, received {status}")
+
+        # Ensure each metric has a valid type
+        for field in fields:
+            if not isinstance(status[field], METRICS[field]):
+                raise AssertionError(f"Expected '{field}' to be of type {METRICS[field]}, received {status[field]}")
+
+    def is_status_complete(self):
+        """Checks that the system status contains every metric"""
+        self.check_status_shape(list(METRICS))
+
+    def is_status_selected(self):
+        """Checks that the system status only contains the selected metrics"""
+        self.check_status_shape(POLL_FIELDS)
+
 
 APIE2ETestStatusSystem()
@@ -0,0 +1,164 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Script used to test the /api/v1/system/api/sync endpoint."""
+import ipaddress
+import pathlib
+import socket
+import subprocess
+import tempfile
+import threading
+
+import e2e_test_framework
+from mock_server import MockAPI, create_server
+
+# Constants
+SYNC_TIMEOUT = 10
+SYNC_URI = "/api/v1/system/api/sync"
+PEER_USERNAME = "admin"
+PEER_PASSWORD = "pfsense"
+# The injected latency of each stand-in HA peer and the password its admin user accepts
+PEERS = {
+    "fast": {"latency": 0, "password": PEER_PASSWORD},
+    "slow": {"latency": 3, "password": PEER_PASSWORD},
+    "unresponsive": {"latency": SYNC_TIMEOUT + 5, "password": PEER_PASSWORD},
+    "unauthenticated": {"latency": 0, "password": "INVALID"}
+}
+
+
+class APIE2ETestSystemAPISync(e2e_test_framework.APIE2ETest):
+    """Class used to test the /api/v1/system/api/sync endpoint."""
+    uri = SYNC_URI
+    peers = {}
+    cert_dir = None
+
+    post_privileges = ["page-all", "page-system-api"]
+
+    post_tests = [
+        {
+            "name": "Enable HA sync to local stand-in peers",
+            "method": "PUT",
+            "uri": "/api/v1/system/api",
+            "req_data_callable": "start_peers",
+            "resp_time": SYNC_TIMEOUT + 1    # Saving the API settings also syncs them to every peer
+        },
+        {
+            "name": "Sync the API configuration to stand-in peers with injected delays",
+            "post_test_callable": "check_sync_report",
+            "resp_time": SYNC_TIMEOUT + 1    # Every peer must respond within the sync timeout
+        },
+        {
+            "name": "Disable HA sync",
+            "method": "PUT",
+            "uri": "/api/v1/system/api",
+            "req_data": {"hasync": False}
+        },
+        {
+            "name": "Check the sync report when HA sync is disabled",
+            "post_test_callable": "check_sync_disabled"
+        }
+    ]
+
+    def custom_tests(self):
+        """Stops the stand-in peers once every test has finished"""
+        self.stop_peers()
+
+    def get_local_address(self):
+        """Finds the address of this host that pfSense can reach it on"""
+        family = socket.AF_INET6 if ":" in self.args.host else socket.AF_INET
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.connect((self.args.host, self.args.port))
+            return sock.getsockname()[0]
+
+    def create_cert(self):
+        """Creates a self-signed certificate for the stand-in peers, pfSense syncs over HTTPS when it is served on it"""
+        self.cert_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        cert = pathlib.Path(self.cert_dir.name).joinpath("peer.crt")
+        key = pathlib.Path(self.cert_dir.name).joinpath("peer.key")
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                "-subj", "/CN=e2e-hasync-peer", "-keyout", str(key), "-out", str(cert)
+            ],
+            check=True,
+            capture_output=True
+        )
+        return str(cert), str(key)
+
+    def start_peers(self):
+        """Starts a stand-in HA peer for each peer in PEERS and provides the API settings that sync to them"""
+        # Local variables
+        address = self.get_local_address()
+        cert, key = self.create_cert() if self.args.scheme == "https" else (None, None)
+
+        # Start each peer on a free port, peers answer sync requests like a pfSense-API node would
+        for name, peer in PEERS.items():
+            mock_api = MockAPI(latency=peer["latency"])
+            mock_api.users[PEER_USERNAME]["password"] = peer["password"]
+            server = create_server(mock_api, address, 0, cert, key)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host = f"[{address}]" if ipaddress.ip_address(address).version == 6 else address
+            self.peers[f"{host}:{server.server_address[1]}"] = {"name": name, "server": server, "mock_api": mock_api}
+
+        return {
+            "hasync": True,
+            "hasync_hosts": list(self.peers),
+            "hasync_username": PEER_USERNAME,
+            "hasync_password": PEER_PASSWORD
+        }
+
+    def stop_peers(self):
+        """Stops each stand-in HA peer and removes their certificate"""
+        for peer in self.peers.values():
+            peer["server"].shutdown()
+            peer["server"].server_close()
+        if self.cert_dir:
+            self.cert_dir.cleanup()
+
+    def check_sync_report(self):
+        """Checks that each peer's outcome and latency is reported and that the peers were synced concurrently"""
+        # Local variables
+        report = self.last_response["data"]
+        nodes = {self.peers[node["node"]]["name"]: node for node in report["nodes"] if node["node"] in self.peers}
+
+        # Ensure every peer was reported
+        if not report["enabled"] or sorted(nodes) != sorted(PEERS):
+            raise AssertionError(f"Expected a sync report for peers {sorted(PEERS)}, received {report}")
+
+        # Ensure the responsive peers were synced and the others failed for the expected reason
+        if not nodes["fast"]["synced"] or not nodes["slow"]["synced"]:
+            raise AssertionError(f"Expected the fast and slow peers to be synced, received {nodes}")
+        if nodes["unresponsive"]["synced"] or nodes["unresponsive"]["return"] is not None:
+            raise AssertionError(f"Expected the unresponsive peer to time out, received {nodes['unresponsive']}")
+        if nodes["unauthenticated"]["synced"] or nodes["unauthenticated"]["return"] != 3:
+            raise AssertionError(f"Expected the peer to fail authentication, received {nodes['unauthenticated']}")
+
+        # Ensure the latency of each peer is its own and the slow peers did not delay each other
+        if not nodes["fast"]["latency"] < PEERS["slow"]["latency"] <= nodes["slow"]["latency"]:
+            raise AssertionError(f"Expected each peer's latency to reflect its injected delay, received {nodes}")
+        if report["elapsed"] > SYNC_TIMEOUT + 1:
+            raise AssertionError(f"Expected every peer to be synced at once within {SYNC_TIMEOUT}s, received {report}")
+
+        # Ensure the peers received this system's API configuration
+        received = (self.peers[nodes["fast"]["node"]]["mock_api"].config.get(SYNC_URI) or [{}])[0]
+        if received.get("hasync_username") != PEER_USERNAME:
+            raise AssertionError("Expected the fast peer to receive the API configuration")
+
+    def check_sync_disabled(self):
+        """Checks that nothing is synced when HA sync is disabled"""
+        report = self.last_response["data"]
+        if report["enabled"] or report["nodes"]:
+            raise AssertionError(f"Expected no nodes to be synced when HA sync is disabled, received {report}")
+
+
+APIE2ETestSystemAPISync()
@@ -1,12 +1,53 @@
 """Class used to test the /api/v1/system/config endpoint."""
+import re
+
 import e2e_test_framework
 
 
 class APIE2ETestSystemConfig(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/system/config endpoint."""
     uri = "/api/v1/system/config"
+    resources = ["config"]
+    config_hash = None
     get_privileges = ["page-all", "page-diagnostics-backup-restore", "page-diagnostics-command"]
-    get_tests = [{"name": "Read the entire pfSense configuration"}]
+    get_tests = [
+        {"name": "Read the entire pfSense configuration"},
+        {
+            "name": "Read the pfSense configuration's hash",
+            "req_data": {"hash": True},
+            "post_test_callable": "is_hash_valid"
+        },
+        {
+            "name": "Check configuration hash type constraint",
+            "status": 400,
+            "return": 1106,
+            "req_data": {"hash": "INVALID"}
+        }
+    ]
+    put_tests = [
+        {
+            "name": "Restore the pfSense configuration that was read",
+            "req_data_callable": "get_config_read",
+            "post_test_callable": "is_hash_unchanged",
+            "resp_time": 10    # Allow time to write large configurations
+        }
+    ]
+
+    def get_config_read(self):
+        """Provides the configuration read by the first GET test as request data"""
+        return self.get_responses[0]["data"]
+
+    def is_hash_valid(self):
+        """Checks that the last response contains a SHA-256 hash and saves it for later tests"""
+        self.config_hash = self.last_response.get("data", {}).get("hash")
+        if not re.fullmatch(r"[a-f0-9]{64}", str(self.config_hash)):
+            raise AssertionError(f"Expected a SHA-256 configuration hash, received {self.config_hash}")
+
+    def is_hash_unchanged(self):
+        """Checks that restoring the configuration that was read does not change the configuration's hash"""
+        config_hash = self.read_config_hash()
+        if config_hash != self.config_hash:
+            raise AssertionError(f"Expected restored configuration hash {self.config_hash}, received {config_hash}")
 
 
 APIE2ETestSystemConfig()
@@ -5,6 +5,7 @@ import e2e_test_framework
 class APIE2ETestSystemHalt(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/system/halt endpoint."""
     uri = "/api/v1/system/halt"
+    resources = ["reboots"]
     post_privileges = ["page-all", "page-diagnostics-haltsystem"]
     post_tests = [
         {
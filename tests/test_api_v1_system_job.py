@@ -0,0 +1,156 @@
+# Copyright 2023 Jared Hendrickson
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Script used to test the /api/v1/system/job endpoint."""
+import e2e_test_framework
+
+# Constants
+STATES_URI = "/api/v1/firewall/states"
+STATES_SOURCE = "1.2.3.4"
+
+
+class APIE2ETestSystemJob(e2e_test_framework.APIE2ETest):
+    """Class used to test the /api/v1/system/job endpoint."""
+    uri = "/api/v1/system/job"
+    get_privileges = [
+        "page-all",
+        "page-interfaces-assignnetworkports",
+        "page-services-dnsresolver",
+        "page-services-dnsresolver-edithost",
+        "page-diagnostics-showstates"
+    ]
+    get_tests = [
+        {"name": "Read all jobs"},
+        {
+            "name": "Check job ID exists constraint",
+            "concurrent": True,
+            "status": 400,
+            "return": 1104,
+            "req_data": {"id": "0000000000000000"}
+        },
+        {
+            "name": "Check job ID cannot be a file path",
+            "concurrent": True,
+            "status": 400,
+            "return": 1104,
+            "req_data": {"id": "../api_auth.cache"}
+        },
+        {
+            "name": "Check wait numeric constraint",
+            "concurrent": True,
+            "status": 400,
+            "return": 1105,
+            "req_data": {"wait": "INVALID"}
+        },
+        {
+            "name": "Check wait minimum constraint",
+            "concurrent": True,
+            "status": 400,
+            "return": 1105,
+            "req_data": {"wait": -1}
+        },
+        {
+            "name": "Check wait maximum constraint",
+            "concurrent": True,
+            "status": 400,
+            "return": 1105,
+            "req_data": {"wait": 31}
+        },
+        {
+            "name": "Start a job that kills states after a few seconds",
+            "method": "DELETE",
+            "uri": STATES_URI,
+            "req_data": {"source": STATES_SOURCE, "sleep": 5},
+            "post_test_callable": "save_job_id"
+        },
+        {
+            "name": "Start an identical job while the first job is running",
+            "method": "DELETE",
+            "uri": STATES_URI,
+            "delay": 5,    # Wait up to 5 seconds for the first job to start running
+            "delay_until": "is_first_job_running",
+            "req_data": {"source": STATES_SOURCE, "sleep": 5},
+            "post_test_callable": "save_job_id"
+        },
+        {
+            "name": "Ensure an identical job is coalesced with the queued job",
+            "method": "DELETE",
+            "uri": STATES_URI,
+            "req_data": {"source": STATES_SOURCE, "sleep": 5},
+            "post_test_callable": "is_job_coalesced"
+        },
+        {
+            "name": "Ensure the queued job waits for the running job",
+            "req_data_callable": "get_queued_job",
+            "post_test_callable": "is_job_queued"
+        },
+        {
+            "name": "Wait for the running job to finish",
+            "req_data_callable": "wait_for_running_job",
+            "resp_time": 10,
+            "post_test_callable": "is_job_succeeded"
+        },
+        {
+            "name": "Ensure each job finishes and is listed",
+            "method": "DELETE",
+            "uri": STATES_URI,
+            "req_data": {"source": STATES_SOURCE, "sleep": 0},
+            "wait_for_job": True,
+            "post_test_callable": "is_each_job_listed"
+        }
+    ]
+    job_ids = []
+
+    def save_job_id(self):
+        """Saves the ID of the job started by the last request"""
+        self.job_ids.append(self.last_response["data"]["job_ids"][0])
+
+    def is_first_job_running(self):
+        """Checks if the first job started has started running"""
+        resp = self.make_request("GET", {"uri": self.uri, "req_data": {"id": self.job_ids[0]}}, req_only=True)
+        return resp.json()["data"]["status"] == "running"
+
+    def is_job_coalesced(self):
+        """Checks that the last request returned the queued job instead of starting another job"""
+        job_id = self.last_response["data"]["job_ids"][0]
+        if job_id != self.job_ids[1] or job_id == self.job_ids[0]:
+            raise AssertionError(f"Expected job '{job_id}' to be the queued job '{self.job_ids[1]}'")
+
+    def get_queued_job(self):
+        """Reads the queued job without waiting"""
+        return {"id": self.job_ids[1]}
+
+    def wait_for_running_job(self):
+        """Waits for the running job to finish"""
+        return {"id": self.job_ids[0], "wait": 10}
+
+    def is_job_queued(self):
+        """Checks that the last job read is still queued"""
+        if self.last_response["data"]["status"] != "queued":
+            raise AssertionError(f"Expected job to be queued, received {self.last_response['data']}")
+
+    def is_job_succeeded(self):
+        """Checks that the last job read has succeeded"""
+        if self.last_response["data"]["status"] != "succeeded":
+            raise AssertionError(f"Expected job to succeed, received {self.last_response['data']}")
+
+    def is_each_job_listed(self):
+        """Checks that each job has finished and is listed by a read of all jobs"""
+        self.wait_for_job(self.job_ids[1])
+        jobs = self.make_request("GET", {"uri": self.uri}, req_only=True).json().get("data", [])
+        statuses = {job["id"]: job["status"] for job in jobs if job["id"] in self.job_ids}
+        if statuses != {job_id: "succeeded" for job_id in self.job_ids}:
+            raise AssertionError(f"Expected each job to succeed, received {statuses}")
+
+
+APIE2ETestSystemJob()
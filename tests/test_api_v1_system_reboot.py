@@ -5,6 +5,7 @@ import e2e_test_framework
 class APIE2ETestSystemReboot(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/system/reboot endpoint."""
     uri = "/api/v1/system/reboot"
+    resources = ["reboots"]
     post_privileges = ["page-all", "page-diagnostics-rebootsystem"]
     post_tests = [
         {
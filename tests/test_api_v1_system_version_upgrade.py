@@ -5,6 +5,7 @@ import e2e_test_framework
 class APIE2ETestSystemVersion(e2e_test_framework.APIE2ETest):
     """Class used to test the /api/v1/system/version/upgrade endpoint."""
     uri = "/api/v1/system/version/upgrade"
+    resources = ["read-only"]
 
     get_privileges = ["page-all", "page-dashboard-widgets", "page-diagnostics-command", "page-system-update-settings"]
 
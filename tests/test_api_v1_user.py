@@ -20,6 +20,7 @@ LOCAL_USER_EXP_UPDATE = generate_random_future_date()
 DISABLED_USER_USERNAME = f"disableduser{random.randint(1,9)}"
 DISABLED_USER_DESCR = "Example User"
 DISABED_USER_PASSWD = secrets.token_urlsafe(12)
+BULK_USER_USERNAMES = [f"bulkuser{num}_{random.randint(1, 9)}" for num in range(2)]
 
 
 class APIE2ETestUser(e2e_test_framework.APIE2ETest):
@@ -107,6 +108,14 @@ class APIE2ETestUser(e2e_test_framework.APIE2ETest):
                 "password": DISABED_USER_PASSWD,
             },
         },
+        {
+            "name": "Create the first user to delete in a single request",
+            "req_data": {"username": BULK_USER_USERNAMES[0], "password": DISABED_USER_PASSWD}
+        },
+        {
+            "name": "Create the second user to delete in a single request",
+            "req_data": {"username": BULK_USER_USERNAMES[1], "password": DISABED_USER_PASSWD}
+        },
         {
             "name": "Disable API login protection for failed authentication checks",
             "method": "PUT",
@@ -304,6 +313,17 @@ class APIE2ETestUser(e2e_test_framework.APIE2ETest):
             "return": 5005,
             "req_data": {"username": "admin"}
         },
+        {
+            "name": "Check deletion of many users including a non-existing user",
+            "status": 400,
+            "return": 5001,
+            "req_data": {"username": [BULK_USER_USERNAMES[0], "INVALID"]}
+        },
+        {
+            "name": "Delete many users in a single request, naming one user twice",
+            "post_test_callable": "are_bulk_users_deleted",
+            "req_data": {"username": [BULK_USER_USERNAMES[0], BULK_USER_USERNAMES[1], BULK_USER_USERNAMES[0]]}
+        },
         {
             "name": "Check ability to delete user certificate after user was deleted",
             "uri": "/api/v1/system/certificate",
@@ -397,6 +417,18 @@ class APIE2ETestUser(e2e_test_framework.APIE2ETest):
         if not user_not_in_etc_passwd_out:
             raise AssertionError(f"Expected '{LOCAL_USER_USERNAME}' to be removed from /etc/passwd")
 
+    def are_bulk_users_deleted(self):
+        """Checks that each user deleted in a single request was deleted once and removed from /etc/passwd"""
+        # Ensure each user is only included in the response once
+        deleted = [user.get("name") for user in self.last_response.get("data", [])]
+        if sorted(deleted) != sorted(BULK_USER_USERNAMES):
+            raise AssertionError(f"Expected users {BULK_USER_USERNAMES} to each be deleted once, received {deleted}")
+
+        # Ensure each user's username is no longer present in /etc/passwd
+        for username in BULK_USER_USERNAMES:
+            if not self.user_not_in_etc_passwd(username, username_only=True):
+                raise AssertionError(f"Expected '{username}' to be removed from /etc/passwd")
+
     def user_not_in_etc_passwd(self, username: str, uid="", full_name="", username_only=False):
         """
         Checks if a specified user is not present in /etc/passwd
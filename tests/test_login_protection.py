@@ -6,6 +6,8 @@ import e2e_test_framework
 
 class APIE2ETestLoginProtection(e2e_test_framework.APIE2ETest):
     """Class used to test the login protection API integration."""
+    resources = ["lockout"]
+
     def custom_tests(self):
         self.test_login_protection()
 
@@ -17,9 +19,11 @@ class APIE2ETestLoginProtection(e2e_test_framework.APIE2ETest):
         # Fail authentication many times to initiate the lockout
         for _ in range(0, 5):
             try:
-                requests.get(
+                # Use a new connection for each attempt, the lockout only blocks connections made after it starts
+                self.session.get(
                     self.format_url("/api/v1/system/api"),
                     auth=("bad_username", "bad_password"),
+                    headers={"Connection": "close"},
                     verify=False,
                     timeout=(5, 5)
                 )